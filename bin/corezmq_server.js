@@ -8,12 +8,282 @@
 const webgme = require('webgme-engine');
 const Q = require('q');
 const Command = require('commander').Command;
+const cp = require('child_process');
 const CoreZMQ = require('../src/corezmq');
+const Broker = require('../src/broker');
 const STORAGE_CONSTANTS = webgme.CONSTANTS.STORAGE;
 const getPluginMock = require('./getPluginMock');
 const getPlugin = require('./getRealPlugin');
 const Core = webgme.Core;
 
+/**
+ * The command line arguments starting a worker with the same parameters (listening with a router socket at an
+ * available address).
+ * @param {object} parameters
+ * @returns {string[]}
+ */
+function getWorkerArgs(parameters) {
+    const args = [parameters.projectName, '--router'];
+    const options = {
+        pluginId: '--pluginId',
+        user: '--user',
+        owner: '--owner',
+        serverUrl: '--serverUrl',
+        pluginMetadataPath: '--pluginMetadataPath',
+        pluginConfigPath: '--pluginConfigPath',
+        maxInFlight: '--maxInFlight',
+        maxProjects: '--maxProjects',
+        maxRoots: '--maxRoots',
+        maxHeapUsed: '--maxHeapUsed',
+        cacheSize: '--cacheSize',
+        responseCacheSize: '--responseCacheSize',
+    };
+
+    if (process.platform === 'win32') {
+        args.push('--port', '0');
+    } else {
+        args.push('--ipc');
+    }
+
+    Object.keys(options)
+        .forEach((name) => {
+            if (parameters[name] !== undefined) {
+                args.push(options[name], String(parameters[name]));
+            }
+        });
+
+    if (parameters.readOnly) {
+        args.push('--read-only');
+    }
+
+    (parameters.preload || [])
+        .forEach((preload) => {
+            args.push('--preload', preload);
+        });
+
+    if (parameters.prefetch) {
+        args.push('--prefetch');
+        if (parameters.prefetch !== true) {
+            args.push(String(parameters.prefetch));
+        }
+    }
+
+    return args;
+}
+
+/**
+ * The options of the CoreZMQ server given by the parameters (numbers may be given as strings from the command line).
+ * @param {object} parameters - See main.
+ * @returns {object}
+ */
+function getServerOptions(parameters) {
+    return {
+        port: parseInt(parameters.port === undefined ? 5555 : parameters.port, 10),
+        address: parameters.address,
+        ipc: parameters.ipc,
+        socketType: parameters.router ? 'router' : 'rep',
+        prefetchOnLoadRoot: typeof parameters.prefetch === 'string' ?
+            parseInt(parameters.prefetch, 10) : parameters.prefetch || false,
+        maxInFlight: parameters.maxInFlight ? parseInt(parameters.maxInFlight, 10) : undefined,
+        maxProjects: parameters.maxProjects ? parseInt(parameters.maxProjects, 10) : undefined,
+        maxRoots: parameters.maxRoots !== undefined ? parseInt(parameters.maxRoots, 10) : undefined,
+        maxHeapUsed: parameters.maxHeapUsed ? parseInt(parameters.maxHeapUsed, 10) * 1024 * 1024 : undefined,
+        readOnly: parameters.readOnly === true,
+        responseCacheSize: parameters.responseCacheSize !== undefined ?
+            parseInt(parameters.responseCacheSize, 10) * 1024 * 1024 : undefined,
+    };
+}
+
+/**
+ * Starts the given number of worker processes and a broker listening at the port (or address) of the parameters. If a
+ * worker exits the broker and the other workers are shut down.
+ * @param {object} parameters - See main.
+ * @param {number} numWorkers
+ * @returns {Promise} Resolves with shutdown, port, broker and the worker processes.
+ */
+function startWorkers(parameters, numWorkers) {
+    const logger = parameters.logger;
+    const broker = new Broker(logger);
+    const workers = [];
+    let shuttingDown = false;
+
+    function shutdown() {
+        shuttingDown = true;
+
+        return Q.allSettled([broker.stop()].concat(workers.map((worker) => {
+            const deferred = Q.defer();
+            if (worker.exitCode !== null || worker.signalCode !== null) {
+                deferred.resolve();
+            } else {
+                worker.once('exit', () => deferred.resolve());
+                worker.kill('SIGTERM');
+            }
+
+            return deferred.promise;
+        })));
+    }
+
+    const readyPromises = [];
+    for (let i = 0; i < numWorkers; i += 1) {
+        const deferred = Q.defer();
+        const worker = cp.fork(__filename, getWorkerArgs(parameters), {env: process.env});
+
+        worker.once('message', (msg) => {
+            deferred.resolve(typeof msg.port === 'number' ? `tcp://127.0.0.1:${msg.port}` : msg.port);
+        });
+
+        worker.once('exit', (code) => {
+            deferred.reject(new Error(`Worker ${i} exited with code ${code} before listening!`));
+            if (!shuttingDown && code !== 0) {
+                // The sessions (loaded roots) at the worker are lost, so don't try to carry on without it.
+                logger.error(`Worker ${i} exited with code ${code}, shutting down.`);
+                shutdown().then(() => {
+                    if (require.main === module) {
+                        process.exit(1);
+                    }
+                });
+            }
+        });
+
+        workers.push(worker);
+        readyPromises.push(deferred.promise);
+    }
+
+    const port = parseInt(parameters.port === undefined ? 5555 : parameters.port, 10);
+
+    return Q.all(readyPromises)
+        .then((workerAddresses) => {
+            return broker.start(parameters.address || `tcp://127.0.0.1:${port === 0 ? '*' : port}`,
+                workerAddresses);
+        })
+        .then((endpoint) => {
+            return {
+                shutdown: shutdown,
+                port: parameters.address || parseInt(endpoint.substring(endpoint.lastIndexOf(':') + 1), 10),
+                broker: broker,
+                workers: workers,
+            };
+        })
+        .catch((err) => {
+            return shutdown()
+                .then(() => {
+                    throw err;
+                });
+        });
+}
+
+/**
+ * Loads the trees at the heads of the branches (or tags) into the server, one after the other, logging the time it
+ * took for each.
+ * @param {ProjectInterface} project
+ * @param {CoreZMQ} zmqServer
+ * @param {string[]} preloads - Names of branches or tags, optionally followed by :<depth>.
+ * @param {GmeLogger} logger
+ * @returns {Promise}
+ */
+function preloadRoots(project, zmqServer, preloads, logger) {
+    const startTime = Date.now();
+
+    return preloads
+        .reduce((prevPromise, preload) => {
+            const depthMatch = /^(.+):(\d+)$/.exec(preload);
+            const name = depthMatch ? depthMatch[1] : preload;
+            const depth = depthMatch ? parseInt(depthMatch[2], 10) : null;
+            let preloadStartTime;
+
+            return prevPromise
+                .then(() => {
+                    preloadStartTime = Date.now();
+                    return project.getBranchHash(name);
+                })
+                .then(commitHash => commitHash || project.getTags().then(tags => tags[name]))
+                .then((commitHash) => {
+                    if (!commitHash) {
+                        throw new Error(`No branch or tag [${name}] to preload!`);
+                    }
+
+                    return project.loadObject(commitHash);
+                })
+                .then(commitObject => zmqServer.preload(commitObject.root, depth))
+                .then((loaded) => {
+                    logger.info(`Preloaded ${preload} (${loaded} nodes) in ${Date.now() - preloadStartTime} ms`);
+                });
+        }, Q())
+        .then(() => {
+            const heapUsed = Math.round(process.memoryUsage().heapUsed / (1024 * 1024));
+            logger.info(`Preloaded ${preloads.length} roots in ${Date.now() - startTime} ms, heap used ${heapUsed} MB`);
+        });
+}
+
+/**
+ * The command line of the server, the options are given (by name) as the parameters of main.
+ * @param {GmeConfig} gmeConfig
+ * @returns {Command}
+ */
+function createProgram(gmeConfig) {
+    const program = new Command();
+
+    program
+        .version('1.0.0')
+        .arguments('<projectName>')
+        .description('Starts a zero-mq server exposing the core and project API at the provided project.')
+        .option('-i, --pluginId [string]', 'The pluginId you wish to debug, if not given mock js wrapper will be used')
+        .option('-p, --port [number]', 'Port the server should listen at [5555], 0 picks an available port', 5555)
+        .option('-a, --address [string]', 'If given the port is not used and the server will listen at the ' +
+            'given address.', '')
+        .option('--ipc', 'Listen at a unique ipc:// address in the tmp directory (faster than tcp on loopback, ' +
+            'not supported on windows).')
+        .option('-r, --router', 'Listen with a ROUTER socket so that asynchronous (DEALER) clients, e.g. ' +
+            'AsyncWebGME, can have multiple requests in flight.')
+        .option('-w, --workers [number]', 'Start the given number of worker processes behind a load-balancing ' +
+            'broker listening at the port (or address). The requests of a client are handled by the same worker.')
+        .option('--maxInFlight [number]', 'Maximum number of requests handled at the same time by the ROUTER ' +
+            'socket [64], requests mutating a root are always handled in order with the others at it.')
+        .option('--prefetch [depth]', 'Load the tree of every loaded root in the background (optionally only ' +
+            'down to the given depth) so that later calls hit warm data.')
+        .option('--maxProjects [number]', 'Maximum number of other projects (opened by clients in addition to ' +
+            'the given one) kept open at the same time [16].')
+        .option('--maxRoots [number]', 'Maximum number of loaded roots [no limit], the least recently used roots ' +
+            'without modifications are evicted beyond it and reloaded from their hash when accessed again.')
+        .option('--read-only', 'Reject all requests modifying the model (core mutations, commits, branches and ' +
+            'tags) and cache the results of the core calls, which cannot change.')
+        .option('--responseCacheSize [MB]', 'Maximum size of the cached results in read-only mode [64].')
+        .option('--cacheSize [number]', 'Number of objects cached by the storage of each opened project ' +
+            '[gmeConfig.storage.cache], a cache holding the preloaded trees makes the first requests fast.')
+        .option('--preload <branch[:depth]>', 'Load the tree at the head of the branch (or tag) before listening ' +
+            '(optionally only down to the given depth), can be given multiple times.',
+        (value, previous) => previous.concat([value]), [])
+        .option('--maxHeapUsed [MB]', 'Evict roots without modifications as new roots are loaded while the heap ' +
+            'used exceeds the given size.')
+        .option('-u, --user [string]', 'the user of the command [if not given we use the default user]. Note that if ' +
+            'this is used together with the --serverUrl option the password can be provided by adding ' +
+            'a semicolon.', gmeConfig.authentication.guestAccount)
+        .option('-o, --owner [string]', 'the owner of the project [by default, the user is the owner]')
+        .option('-s, --serverUrl [string]', 'If specified the project will connect to the database via ' +
+            'a running webgme server, example "http://localhost:8888". Note that if a different user than the ' +
+            'guest is used the password needs to be added after a semicolon, e.g. "-u someUser:pass".')
+        .option('-m, --pluginMetadataPath [string]', 'Optional file-path to the metadata of a plugin.')
+        .option('-j, --pluginConfigPath [string]',
+            'Path to json file with plugin options that should be overwritten.', '')
+        .on('--help', function () {
+            console.log('  Examples:');
+            console.log();
+            console.log('    $ node coremq_server.js MyProject');
+            console.log('    $ node coremq_server.js MyProject -i MyPluginId');
+            console.log('    $ node coremq_server.js MyProject -m ./src/plugins/MyPythonPlugin/metadata.json');
+            console.log('    $ node coremq_server.js MyProject -p 5656 -s http://127.0.0.1:8888');
+            console.log('    $ node coremq_server.js MyProject --router');
+            console.log('    $ node coremq_server.js MyProject --ipc');
+            console.log('    $ node coremq_server.js MyProject -p 0');
+            console.log('    $ node coremq_server.js MyProject --workers 4');
+            console.log('    $ node coremq_server.js MyProject --preload master --preload v1.0:3');
+            console.log('    $ node coremq_server.js MyProject --read-only --router');
+            console.log();
+        });
+
+    return program;
+}
+
 /**
  *
  * @param {object} parameters
@@ -23,8 +293,26 @@ const Core = webgme.Core;
  * @param {GmeLogger} parameters.logger
  * @param {string} [parameters.user='guest']
  * @param {string} [parameters.owner=parameters.user]
- * @param {int|string} [parameters.port=5555]
+ * @param {int|string} [parameters.port=5555] - 0 binds to an available port.
  * @param {string} [parameters.address]
+ * @param {boolean} [parameters.ipc=false] - Listen at a unique ipc:// address (ignored if address is given).
+ * @param {boolean|number|string} [parameters.prefetch=false] - Prefetch the tree of loaded roots in the background, a
+ * number limits the depth.
+ * @param {number|string} [parameters.maxProjects=16] - Maximum number of other projects kept open for project sessions.
+ * @param {number|string} [parameters.maxRoots=0] - Maximum number of loaded roots, unmodified roots are evicted
+ * (and reloaded when accessed again) beyond it, 0 for no limit.
+ * @param {number|string} [parameters.maxHeapUsed] - Heap used (MB) above which unmodified roots are evicted.
+ * @param {number|string} [parameters.cacheSize] - Number of objects cached by the storage of each opened project
+ * (defaults to gmeConfig.storage.cache).
+ * @param {boolean} [parameters.readOnly=false] - Reject requests modifying the model and cache the results of the core
+ * functions.
+ * @param {number|string} [parameters.responseCacheSize=64] - Maximum size (MB) of the cached results in read-only mode.
+ * @param {string[]} [parameters.preload] - Branches (or tags) whose trees are loaded before the server starts
+ * listening, each optionally followed by :<depth> to only load the given number of levels.
+ * @param {boolean} [parameters.router=false] - Listen with a ROUTER socket (allows multiple requests in flight).
+ * @param {number|string} [parameters.workers] - Number of worker processes to start behind a load-balancing broker
+ * (each opening the project), sessions are kept at one worker.
+ * @param {number|string} [parameters.maxInFlight=64] - Maximum number of requests handled at the same time (router).
  * @param {string} [parameters.serverUrl]
  * @param {string} [parameters.pluginMetadataPath]
  * @param {string} [parameters.pluginConfigPath]
@@ -32,6 +320,11 @@ const Core = webgme.Core;
  * @returns {Promise}
  */
 const main = (parameters, callback) => {
+    const numWorkers = parseInt(parameters.workers, 10);
+    if (numWorkers > 1) {
+        return startWorkers(parameters, numWorkers).nodeify(callback);
+    }
+
     const deferred = Q.defer();
     const userName = parameters.user ? parameters.user.split(':')[0] : parameters.gmeConfig.authentication.guestAccount;
     const projectName = parameters.projectName;
@@ -42,6 +335,13 @@ const main = (parameters, callback) => {
 
     console.log(JSON.stringify(parameters, null, 2));
 
+    if (parameters.cacheSize) {
+        // Read by the object cache of the projects opened at the database (cache) or through a webgme server
+        // (clientCacheSize).
+        parameters.gmeConfig.storage.cache = parseInt(parameters.cacheSize, 10);
+        parameters.gmeConfig.storage.clientCacheSize = parameters.gmeConfig.storage.cache;
+    }
+
     function shutdown() {
         const promises = [];
 
@@ -108,6 +408,39 @@ const main = (parameters, callback) => {
             })
     }
 
+    /**
+     * Opens other projects at the same storage connection for clients opening project sessions.
+     * @param {string} otherProjectId
+     * @returns {Promise}
+     */
+    function openProject(otherProjectId) {
+        let otherProjectDeferred;
+
+        if (parameters.serverUrl) {
+            otherProjectDeferred = storage.openProject(otherProjectId)
+                .then(res => res[0]);
+        } else {
+            otherProjectDeferred = storage.openProject({projectId: otherProjectId, username: userName})
+                .then((otherProject) => {
+                    otherProject.setUser(userName);
+
+                    return otherProject;
+                });
+        }
+
+        return otherProjectDeferred
+            .then((otherProject) => {
+                return {
+                    project: otherProject,
+                    core: new Core(otherProject, {
+                        globConf: parameters.gmeConfig,
+                        logger: parameters.logger.fork('Core')
+                    }),
+                    close: parameters.serverUrl ? () => Q.ninvoke(storage, 'closeProject', otherProjectId) : null,
+                };
+            });
+    }
+
     let project = null;
     let core = null;
     projectDeferred
@@ -141,11 +474,15 @@ const main = (parameters, callback) => {
         })
         .then((plugin) => {
 
-            zmqServer = new CoreZMQ(project, core, parameters.logger, {
-                port: parseInt(parameters.port || 5555),
-                address: parameters.address,
+            zmqServer = new CoreZMQ(project, core, parameters.logger, Object.assign(getServerOptions(parameters), {
+                openProject: openProject,
                 plugin: plugin,
-            });
+            }));
+
+            if (parameters.preload && parameters.preload.length > 0) {
+                return preloadRoots(project, zmqServer, parameters.preload, parameters.logger)
+                    .then(() => zmqServer.startServer());
+            }
 
             return zmqServer.startServer();
         })
@@ -165,9 +502,9 @@ const main = (parameters, callback) => {
 };
 
 if (require.main === module) {
-    const program = new Command();
     const gmeConfig = webgme.getGmeConfig();
     const logger = webgme.Logger.create('gme:bin:coremq_server', gmeConfig.bin.log);
+    const program = createProgram(gmeConfig).parse(process.argv);
 
     const exit = (err) => {
         if (err) {
@@ -178,42 +515,16 @@ if (require.main === module) {
         }
     };
 
-    program
-        .version('1.0.0')
-        .arguments('<projectName>')
-        .description('Starts a zero-mq server exposing the core and project API at the provided project.')
-        .option('-i, --pluginId [string]', 'The pluginId you wish to debug, if not given mock js wrapper will be used')
-        .option('-p, --port [number]', 'Port the server should listen at [5555]', 5555)
-        .option('-a, --address [string]', 'If given the port is not used and the server will listen at the ' +
-            'given address.', '')
-        .option('-u, --user [string]', 'the user of the command [if not given we use the default user]. Note that if ' +
-            'this is used together with the --serverUrl option the password can be provided by adding ' +
-            'a semicolon.', gmeConfig.authentication.guestAccount)
-        .option('-o, --owner [string]', 'the owner of the project [by default, the user is the owner]')
-        .option('-s, --serverUrl [string]', 'If specified the project will connect to the database via ' +
-            'a running webgme server, example "http://localhost:8888". Note that if a different user than the ' +
-            'guest is used the password needs to be added after a semicolon, e.g. "-u someUser:pass".')
-        .option('-m, --pluginMetadataPath [string]', 'Optional file-path to the metadata of a plugin.')
-        .option('-j, --pluginConfigPath [string]',
-            'Path to json file with plugin options that should be overwritten.', '')
-        .on('--help', function () {
-            console.log('  Examples:');
-            console.log();
-            console.log('    $ node coremq_server.js MyProject');
-            console.log('    $ node coremq_server.js MyProject -i MyPluginId');
-            console.log('    $ node coremq_server.js MyProject -m ./src/plugins/MyPythonPlugin/metadata.json');
-            console.log('    $ node coremq_server.js MyProject -p 5656 -s http://127.0.0.1:8888');
-            console.log();
-        })
-        .parse(process.argv);
-
     if (program.args.length < 1) {
         program.help();
     } else {
-        program.projectName = program.args[0];
-        program.logger = logger;
-        program.gmeConfig = gmeConfig;
-        main(program)
+        const parameters = Object.assign({}, program.opts(), {
+            projectName: program.args[0],
+            logger,
+            gmeConfig,
+        });
+
+        main(parameters)
             .then((server) => {
                 function abort() {
                     server.shutdown()
@@ -222,7 +533,12 @@ if (require.main === module) {
                         });
                 }
 
-                logger.info(`corezmq server listening at ${program.address || server.port}`);
+                logger.info(`corezmq server listening at ${parameters.address || server.port}`);
+                if (process.send) {
+                    // Started as a worker, let the broker know where to connect.
+                    process.send({port: server.port});
+                }
+
                 process.on('SIGINT', abort);
                 process.on('SIGTERM', abort);
             })
@@ -231,4 +547,6 @@ if (require.main === module) {
 }
 
 module.exports = main;
-
+module.exports.createProgram = createProgram;
+module.exports.getWorkerArgs = getWorkerArgs;
+module.exports.getServerOptions = getServerOptions;
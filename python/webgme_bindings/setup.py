@@ -17,6 +17,11 @@ setuptools.setup(
     install_requires=[
         'pyzmq'
     ],
+    extras_require={
+        'orjson': ['orjson'],
+        'msgpack': ['msgpack'],
+        'zstd': ['zstandard'],
+    },
     classifiers=(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
@@ -1,5 +1,12 @@
 from .webgme import WebGME
+from .pool import WebGMEPool
+from .session import ProjectSession
 from .pluginbase import PluginBase
-from .exceptions import CoreIllegalArgumentError, CoreIllegalOperationError, CoreInternalError, JSError
+from .exceptions import CoreIllegalArgumentError, CoreIllegalOperationError, CoreInternalError, JSError, \
+    RequestTimeoutError
+import sys
+
+if sys.version_info >= (3, 5):
+    from .aio import AsyncWebGME
 
 name = "webgme_bindings"
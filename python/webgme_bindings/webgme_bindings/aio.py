@@ -0,0 +1,196 @@
+"""
+Asynchronous (asyncio) client for the webgme api. Requires python 3.5+ and a corezmq-server listening
+with a ROUTER socket (see the --router option of bin/corezmq_server.js).
+"""
+
+import asyncio
+import itertools
+import zmq
+import zmq.asyncio
+
+from .core import Core
+from .project import Project
+from .util import Util
+from .codec import JsonCodec, available_codecs, get_codec
+from .exceptions import JSError
+from .stats import RPCStats, clock
+from .webgme import get_default_logger, get_result
+
+_json_codec = JsonCodec()
+
+
+class AsyncWebGME(object):
+    """
+    Asynchronous counterpart of WebGME where all methods of core, project and util return awaitables.
+    Each request is tagged with an id which allows multiple requests to be in flight at the same time,
+    e.g. loading many nodes concurrently:
+
+    .. code-block:: python
+
+        async with AsyncWebGME(5555, logger) as webgme:
+            children = await webgme.core.load_children(root)
+            names = await asyncio.gather(*[webgme.core.get_attribute(c, 'name') for c in children])
+
+    Read-only requests in flight are handled concurrently, whereas a request mutating a root is handled in the
+    order it was sent relative to the other requests at the same root. Util.traverse is not available asynchronously.
+    """
+
+    def __init__(self, port=5555, logger=None, address=None, codec=None, context=None):
+        """
+        Creates an instance of AsyncWebGME and connects a DEALER socket to tcp://127.0.0.1:<port>.
+        Use it as an async context manager or call connect (which negotiates the codec) before sending
+        requests.
+
+        :param port: The port that the webgme zmq-server listens on (or its full address, e.g. ipc://..., as passed\
+        to python plugins by the plugin launcher).
+        :type port: int or str
+        :param logger: Optional logger (defaults to DEBUG console logger)
+        :param address: If given the port is not used and the zmq client will connect to the address.
+        :type address: str
+        :param codec: Name of codec to encode messages with, 'json', 'orjson' or 'msgpack'. If not given the\
+        fastest installed codec supported by the server is used.
+        :type codec: str
+        :param context: Optional zmq.asyncio.Context to create the socket from.
+        :type context: zmq.asyncio.Context
+        """
+        if logger:
+            self.logger = logger
+        else:
+            self.logger = get_default_logger()
+
+        if address is None and '://' in str(port):
+            self._address = port
+        elif address is None:
+            self._address = 'tcp://127.0.0.1:{0}'.format(port)
+        else:
+            self._address = address
+
+        self._socket = (context or zmq.asyncio.Context.instance()).socket(zmq.DEALER)
+        self._socket.connect(self._address)
+        self.logger.info('Connected to {0}'.format(self._address))
+        self._codec_name = codec
+        self._codec = None
+        self._header = None
+        self._request_ids = itertools.count(1)
+        self._pending = {}
+        self._last_future = None
+        self._receiver = None
+        self._stats = RPCStats()
+        self.core = Core(self)
+        self.util = Util(self)
+        self.project = Project(self)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.disconnect()
+
+    @property
+    def codec(self):
+        """
+        The codec negotiated with the server (None before connect or if the server does not support codec
+        negotiation).
+        """
+        return self._codec
+
+    async def connect(self):
+        """
+        Negotiates the codec with the server.
+        """
+        if self._codec_name is None:
+            codecs = [get_codec(name) for name in available_codecs()]
+        else:
+            codecs = [get_codec(self._codec_name)]
+
+        try:
+            self.send_request({'type': 'util', 'name': 'hello', 'args': [{
+                'codecs': [codec.wire_name for codec in codecs],
+            }]})
+            info = await self.handle_response()
+        except JSError:
+            self.logger.info('Server does not support codec negotiation - using plain json messages.')
+            return
+
+        for codec in codecs:
+            if codec.wire_name == info['codec']:
+                self._codec = codec
+                self._header = codec.wire_name.encode('ascii')
+                break
+
+    def disconnect(self):
+        """
+        Disconnects from the nodejs zmq-server and cancels all requests in flight.
+        """
+        if self._receiver is not None:
+            self._receiver.cancel()
+            self._receiver = None
+
+        for pending in self._pending.values():
+            pending[0].cancel()
+
+        self._pending = {}
+        self._socket.close(linger=0)
+        self.logger.info('Disconnected from {0}'.format(self._address))
+
+    def send_request(self, payload):
+        self.logger.debug('send_request: %s', payload)
+        loop = asyncio.get_event_loop()
+        if self._receiver is None:
+            self._receiver = loop.create_task(self._receive())
+
+        request_id = str(next(self._request_ids)).encode('ascii')
+        future = loop.create_future()
+        self._last_future = future
+
+        if self._codec is None:
+            frames = [request_id, _json_codec.encode(payload)]
+        else:
+            frames = [request_id, self._header, self._codec.encode(payload)]
+
+        method = '{0}.{1}'.format(payload.get('type'), payload.get('name'))
+        self._pending[request_id] = (future, method, sum(len(frame) for frame in frames[1:]), clock())
+
+        sent = self._socket.send_multipart(frames)
+        sent.add_done_callback(lambda f: self._on_sent(request_id, f))
+
+    def handle_response(self):
+        return self._last_future
+
+    def stats(self):
+        """
+        Statistics of the requests sent from this instance (see WebGME.stats).
+
+        :returns: The statistics recorded since the instance was created (or last reset).
+        :rtype: RPCStats
+        """
+        return self._stats
+
+    def _on_sent(self, request_id, sent):
+        if sent.cancelled() or sent.exception() is None:
+            return
+
+        pending = self._pending.pop(request_id, None)
+        if pending is not None and not pending[0].done():
+            pending[0].set_exception(sent.exception())
+
+    async def _receive(self):
+        while True:
+            frames = await self._socket.recv_multipart()
+            pending = self._pending.pop(frames[0], None)
+            if pending is None or pending[0].done():
+                continue
+
+            future, method, request_bytes, start = pending
+            try:
+                if len(frames) == 2:
+                    res = _json_codec.decode(frames[1])
+                else:
+                    res = self._codec.decode(frames[2])
+                self._stats.record(method, clock() - start, request_bytes, sum(len(frame) for frame in frames[1:]),
+                                   bool(res['err']))
+                self.logger.debug('handle_response: %s', res)
+                future.set_result(get_result(res, self.logger))
+            except Exception as e:
+                future.set_exception(e)
@@ -0,0 +1,140 @@
+"""
+Batching of Core, Project and Util calls into a single request to the zmq-server.
+"""
+
+from .core import Core
+from .project import Project
+from .util import Util
+from .exceptions import get_js_error
+
+
+class BatchFuture(object):
+    """
+    Placeholder for the result of a call queued in a batch. A future can be passed as (part of) an argument to
+    later calls within the same batch, e.g. a node returned by create_child can be passed to set_attribute.
+    """
+
+    def __init__(self, batch, index):
+        self._batch = batch
+        self._index = index
+        self._done = False
+        self._result = None
+        self._error = None
+
+    def done(self):
+        """
+        :returns: True if the batch has been sent and the outcome of the call is known.
+        :rtype: bool
+        """
+        return self._done
+
+    def result(self):
+        """
+        Returns the result of the call. If the batch has not been sent yet, it is sent first.
+
+        :returns: The same value as the corresponding non-batched call would have returned.
+        :raises CoreIllegalArgumentError: If some of the parameters don't match the input criteria.
+        :raises CoreIllegalOperationError: If the context of the operation is not allowed.
+        :raises CoreInternalError: If some internal error took place inside the core layers.
+        :raises JSError: The result of the execution.
+        """
+        if not self._done:
+            self._batch.flush()
+
+        if self._error is not None:
+            raise self._error
+
+        return self._result
+
+    def _set(self, err, res):
+        self._done = True
+        self._error = err
+        self._result = res
+
+
+class Batch(object):
+    """
+    Queues calls made through its core, project and util attributes and sends them as one request.
+    The calls are handled in order on the server and each returns a BatchFuture. Instances are created
+    from WebGME.batch().
+    """
+
+    def __init__(self, webgme):
+        self._webgme = webgme
+        self._calls = []
+        self._futures = []
+        self.logger = webgme.logger
+
+        #: An instance of webgme_bindings.Core queueing into this batch
+        self.core = Core(self)
+
+        #: An instance of webgme_bindings.Project queueing into this batch
+        self.project = Project(self)
+
+        #: An instance of webgme_bindings.Util queueing into this batch
+        self.util = Util(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        else:
+            self._calls = []
+            self._futures = []
+
+    def __len__(self):
+        return len(self._calls)
+
+    def _to_wire(self, value, call):
+        if isinstance(value, BatchFuture):
+            if value._done:
+                return value.result()
+            elif value._batch is not self:
+                raise ValueError('Futures from another pending batch cannot be referenced.')
+
+            call['refs'] = True
+            return {'$ref': value._index}
+        elif isinstance(value, (list, tuple)):
+            return [self._to_wire(item, call) for item in value]
+        elif isinstance(value, dict):
+            return dict((key, self._to_wire(item, call)) for key, item in value.items())
+
+        return value
+
+    def send_request(self, payload):
+        payload['args'] = self._to_wire(payload['args'], payload)
+        self._calls.append(payload)
+        self._futures.append(BatchFuture(self, len(self._futures)))
+
+    def handle_response(self):
+        return self._futures[-1]
+
+    def flush(self):
+        """
+        Sends all queued calls in one request and resolves their futures. Calls queued after a flush
+        make up a new batch (and can only reference futures of earlier flushes by their resolved values).
+
+        :returns: Nothing is returned by the function.
+        :rtype: None
+        :raises JSError: If the batch as a whole could not be handled.
+        """
+        if len(self._calls) == 0:
+            return
+
+        calls = self._calls
+        futures = self._futures
+        self._calls = []
+        self._futures = []
+
+        try:
+            self._webgme.send_request({'type': 'batch', 'name': 'batch', 'args': [calls]})
+            results = self._webgme.handle_response()
+        except Exception as e:
+            for future in futures:
+                future._set(e, None)
+            raise
+
+        for future, result in zip(futures, results):
+            future._set(get_js_error(result['err']) if result['err'] else None, result.get('res'))
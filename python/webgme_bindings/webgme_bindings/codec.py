@@ -0,0 +1,155 @@
+"""
+Codecs used for encoding the requests to and decoding the responses from the zmq-server. Which codec is
+used is negotiated with the server when a WebGME instance connects. The stdlib json is always available,
+orjson and msgpack are used if the packages are installed.
+"""
+
+import json
+import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    intern = sys.intern
+except AttributeError:
+    # The builtin intern of python 2 does not accept the unicode strings decoded by json.
+    def intern(string):
+        return string
+
+
+class JsonCodec(object):
+    """
+    Encodes messages as json using the json module from the standard library.
+    """
+    #: Name of the codec (as passed to WebGME)
+    name = 'json'
+    #: Name of the encoding on the wire (as negotiated with the server)
+    wire_name = 'json'
+    #: True if bytes can be encoded as is (rather than as base64 encoded strings)
+    binary = False
+
+    def encode(self, payload):
+        return json.dumps(payload).encode('utf-8')
+
+    def decode(self, data):
+        return json.loads(bytes(data).decode('utf-8'))
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Encodes messages as json using `orjson <https://github.com/ijl/orjson>`_.
+    """
+    name = 'orjson'
+
+    def encode(self, payload):
+        return orjson.dumps(payload)
+
+    def decode(self, data):
+        return orjson.loads(data)
+
+
+class MsgpackCodec(object):
+    """
+    Encodes messages using `MessagePack <https://msgpack.org/>`_, bytes are encoded natively.
+    """
+    name = 'msgpack'
+    wire_name = 'msgpack'
+    binary = True
+
+    def encode(self, payload):
+        return msgpack.packb(payload, use_bin_type=True)
+
+    def decode(self, data):
+        return msgpack.unpackb(data, raw=False)
+
+
+_CODECS = [
+    (MsgpackCodec, msgpack),
+    (OrjsonCodec, orjson),
+    (JsonCodec, json),
+]
+
+
+def available_codecs():
+    """
+    :returns: The names of the codecs with installed dependencies in order of preference.
+    :rtype: list of str
+    """
+    return [codec_cls.name for codec_cls, module in _CODECS if module is not None]
+
+
+def get_codec(name):
+    """
+    Creates a codec from its name.
+
+    :param name: 'json', 'orjson' or 'msgpack'
+    :type name: str
+    :returns: The codec instance.
+    :raises ValueError: If there is no such codec or its package is not installed.
+    """
+    for codec_cls, module in _CODECS:
+        if codec_cls.name == name:
+            if module is None:
+                raise ValueError('Codec "{0}" requires the {0} package to be installed.'.format(name))
+            return codec_cls()
+
+    raise ValueError('Unknown codec "{0}", available are {1}.'.format(name, available_codecs()))
+
+
+def resolve_attachments(value, attachments):
+    """
+    Replaces the placeholders, {'$bin': <index>}, in a decoded message with the binary frames sent
+    along with the message.
+
+    :param value: The decoded message (or part of it).
+    :param attachments: The frames following the body of the message.
+    :type attachments: list of zmq.Frame
+    :returns: The value with placeholders replaced by bytes.
+    """
+    if isinstance(value, list):
+        return [resolve_attachments(item, attachments) for item in value]
+    elif isinstance(value, dict):
+        if len(value) == 1 and '$bin' in value:
+            return attachments[value['$bin']].bytes
+
+        return dict((key, resolve_attachments(item, attachments)) for key, item in value.items())
+
+    return value
+
+
+def expand_node_lists(value, depth=2):
+    """
+    Expands the compact node lists, {'$nl': [root_id, paths]}, sent by the zmq-server (when the client accepts them)
+    into lists of node dicts. The paths are front coded, [prefix_length0, suffix0, prefix_length1, suffix1, ...] where
+    the prefix is shared with the previous path. The root_id is interned and shared by all nodes.
+
+    :param value: The decoded result (or part of it).
+    :param depth: How deep into lists and dicts to look for node lists (the server compacts to the same depth).
+    :type depth: int
+    :returns: The value with compact node lists expanded.
+    """
+    if isinstance(value, dict):
+        if len(value) == 1 and '$nl' in value:
+            root_id, paths = value['$nl']
+            root_id = intern(root_id)
+            nodes = []
+            path = ''
+            for i in range(0, len(paths), 2):
+                path = path[:paths[i]] + paths[i + 1]
+                nodes.append({'rootId': root_id, 'nodePath': path})
+
+            return nodes
+        elif depth > 0:
+            return dict((key, expand_node_lists(item, depth - 1)) for key, item in value.items())
+    elif depth > 0 and isinstance(value, list):
+        return [expand_node_lists(item, depth - 1) for item in value]
+
+    return value
@@ -0,0 +1,79 @@
+"""
+Compression of large message bodies exchanged with the zmq-server. Which compression is used is negotiated
+with the server along with the codec. zlib from the standard library is always available and zstd is used if the
+zstandard package is installed and the server supports it (i.e. runs on node 22.15 or later).
+"""
+
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+#: Default minimum size in bytes of a message body for it to be compressed
+DEFAULT_THRESHOLD = 4096
+
+
+class ZlibCompression(object):
+    """
+    Compresses with zlib (deflate) at the fastest level.
+    """
+    #: Name of the compression (as passed to WebGME and negotiated with the server)
+    name = 'zlib'
+
+    def compress(self, data):
+        return zlib.compress(data, 1)
+
+    def decompress(self, data):
+        return zlib.decompress(data)
+
+
+class ZstdCompression(object):
+    """
+    Compresses with `Zstandard <https://github.com/indygreg/python-zstandard>`_.
+    """
+    name = 'zstd'
+
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor()
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def decompress(self, data):
+        # Frames written by streaming compressors (e.g. node's) do not contain the content size.
+        return self._decompressor.decompressobj().decompress(data)
+
+
+_COMPRESSIONS = [
+    (ZstdCompression, zstandard),
+    (ZlibCompression, zlib),
+]
+
+
+def available_compressions():
+    """
+    :returns: The names of the compressions with installed dependencies in order of preference.
+    :rtype: list of str
+    """
+    return [compression_cls.name for compression_cls, module in _COMPRESSIONS if module is not None]
+
+
+def get_compression(name):
+    """
+    Creates a compression from its name.
+
+    :param name: 'zlib' or 'zstd'
+    :type name: str
+    :returns: The compression instance.
+    :raises ValueError: If there is no such compression or its package is not installed.
+    """
+    for compression_cls, module in _COMPRESSIONS:
+        if compression_cls.name == name:
+            if module is None:
+                raise ValueError('Compression "{0}" requires the zstandard package to be installed.'.format(name))
+            return compression_cls()
+
+    raise ValueError('Unknown compression "{0}", available are {1}.'.format(name, available_compressions()))
@@ -8,6 +8,59 @@ for example:
 `https://editor.webgme.org/docs/source/Core.html <https://editor.webgme.org/docs/source/Core.html>`_
 """
 
+import collections
+import threading
+import weakref
+
+
+class RootNode(dict):
+    """
+    A root node (dict with rootId and nodePath) returned by Core.open_root. The root is unloaded from the server\
+    when released, i.e. at the end of a with-block, by calling release or when the node is garbage collected.
+    """
+
+    def __init__(self, core, node):
+        super(RootNode, self).__init__(node)
+        self._core = core
+        self._token = object()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def release(self):
+        """
+        Unloads the root from the server (unless it was opened again and that node is not yet released). Changes\
+        that were not saved are lost.
+        """
+        self._core._release_root(self)
+
+
+def _get_describe_fields(fields):
+    if fields is None or isinstance(fields, dict):
+        return fields
+
+    return dict((field, True) for field in fields)
+
+
+def _to_arrays(columns):
+    # numpy is optional and slow to import, so it is only imported when arrays are asked for.
+    try:
+        import numpy
+    except ImportError:
+        raise ValueError('as_array requires the numpy package to be installed.')
+
+    arrays = {}
+    for name, column in columns.items():
+        if any(value is None for value in column):
+            arrays[name] = numpy.array([numpy.nan if value is None else value for value in column], dtype=float)
+        else:
+            arrays[name] = numpy.array(column)
+
+    return arrays
+
 
 class Core(object):
     """
@@ -18,9 +71,19 @@ class Core(object):
     def __init__(self, webgme):
         self._webgme = webgme
         self._CONSTANTS = None
+        self._abandoned_streams = []
+        # (token, rootId) of the garbage collected RootNodes, appended by their finalizers from any thread.
+        self._collected_roots = collections.deque()
+        # Token of each RootNode not yet released -> (weakref of the node, its rootId).
+        self._open_roots = {}
+        # Guards _open_roots, a Core can be shared by the threads of a WebGMEPool.
+        self._roots_lock = threading.Lock()
 
     def _send(self, payload):
         payload['type'] = 'core'
+        released_roots = self._take_released_roots()
+        if released_roots:
+            payload['unloadRoots'] = released_roots
         self._webgme.send_request(payload)
         return self._webgme.handle_response()
 
@@ -34,6 +97,436 @@ class Core(object):
 
         return self._CONSTANTS
 
+    def _stream(self, name, args, chunk_size, window):
+        # Streams abandoned by their consumers are closed along with the next stream that is opened (closing
+        # from the generator's finalizer could interleave with a request in flight).
+        close = self._abandoned_streams
+        self._abandoned_streams = []
+        res = self._send_stream({'name': 'open', 'args': [name, args, chunk_size, window], 'close': close})
+        done = res['done']
+        try:
+            while True:
+                if len(res['chunk']) > 0:
+                    yield res['chunk']
+                if done:
+                    break
+                res = self._send_stream({'name': 'next', 'args': [res['id'], window]})
+                done = res['done']
+        finally:
+            if not done:
+                self._abandoned_streams.append(res['id'])
+
+    def _send_stream(self, payload):
+        payload['type'] = 'stream'
+        self._webgme.send_request(payload)
+        return self._webgme.handle_response()
+
+    def iter_sub_tree(self, node, chunk_size=1000, window=2):
+        """
+        Streaming variant of load_sub_tree, the nodes are loaded in breadth-first order and sent in chunks as\
+        they are loaded. At most window chunks are buffered ahead by the server, so a slow consumer does not\
+        make the server hold the entire sub-tree. Not available from batches or AsyncWebGME.
+        The chunks are loaded in the background between the requests, so the stream is not isolated from\
+        modifications of the root made while it is consumed (e.g. by other threads), nodes loaded after a\
+        modification reflect it.
+
+        :param node: the node that is the root of the sub-tree in question.
+        :type node: dict
+        :param chunk_size: the maximum number of nodes in each chunk.
+        :type chunk_size: int
+        :param window: the number of chunks the server may load ahead of the consumer.
+        :type window: int
+        :returns: generator of lists of nodes (the node itself is included).
+        :rtype: generator
+        :raises CoreIllegalArgumentError: If some of the parameters don't match the input criteria.
+        :raises JSError: the result of the execution
+        """
+        return self._stream('loadSubTree', [node], chunk_size, window)
+
+    def iter_own_sub_tree(self, node, chunk_size=1000, window=2):
+        """
+        Streaming variant of load_own_sub_tree (see iter_sub_tree, also about modifications while streaming).
+
+        :param node: the node that is the root of the sub-tree in question.
+        :type node: dict
+        :param chunk_size: the maximum number of nodes in each chunk.
+        :type chunk_size: int
+        :param window: the number of chunks the server may load ahead of the consumer.
+        :type window: int
+        :returns: generator of lists of nodes (the node itself is included).
+        :rtype: generator
+        :raises CoreIllegalArgumentError: If some of the parameters don't match the input criteria.
+        :raises JSError: the result of the execution
+        """
+        return self._stream('loadOwnSubTree', [node], chunk_size, window)
+
+    def iter_instances(self, node, chunk_size=1000, window=2):
+        """
+        Streaming variant of load_instances, the instances are sent in chunks. The stream is not isolated from\
+        modifications of the root (see iter_sub_tree).
+
+        :param node: the node in question.
+        :type node: dict
+        :param chunk_size: the maximum number of nodes in each chunk.
+        :type chunk_size: int
+        :param window: the number of chunks the server may prepare ahead of the consumer.
+        :type window: int
+        :returns: generator of lists of nodes.
+        :rtype: generator
+        :raises CoreIllegalArgumentError: If some of the parameters don't match the input criteria.
+        :raises JSError: the result of the execution
+        """
+        return self._stream('loadInstances', [node], chunk_size, window)
+
+    def iter_collection(self, node, pointer_name, chunk_size=1000, window=2):
+        """
+        Streaming variant of load_collection, the sources of the pointer are sent in chunks. The stream is not\
+        isolated from modifications of the root (see iter_sub_tree).
+
+        :param node: the target node in question.
+        :type node: dict
+        :param pointer_name: the name of the pointer of the sources.
+        :type pointer_name: str
+        :param chunk_size: the maximum number of nodes in each chunk.
+        :type chunk_size: int
+        :param window: the number of chunks the server may prepare ahead of the consumer.
+        :type window: int
+        :returns: generator of lists of nodes.
+        :rtype: generator
+        :raises CoreIllegalArgumentError: If some of the parameters don't match the input criteria.
+        :raises JSError: the result of the execution
+        """
+        return self._stream('loadCollection', [node, pointer_name], chunk_size, window)
+
+    def iter_traverse(self, node, order='bfs', max_depth=None, prune_meta_types=None, prune_paths=None,
+                      fields=None, include_libraries=True, chunk_size=1000, window=2):
+        """
+        Traverses the sub-tree of the node on the server, the nodes are sent in chunks in the order they are\
+        visited. The sub-trees of pruned nodes are skipped. Not available from batches or AsyncWebGME. The stream\
+        is not isolated from modifications of the root (see iter_sub_tree).
+
+        .. code-block:: python
+
+            for chunk in core.iter_traverse(root, order='dfs', prune_meta_types=[META['Comment']],
+                                            fields={'attributes': ['name']}, include_libraries=False):
+                for record in chunk:
+                    print(record['path'], record['attributes']['name'])
+
+        :param node: the node to start from (it is always included).
+        :type node: dict
+        :param order: 'bfs' (breadth-first) or 'dfs' (depth-first, a node is visited before its children).
+        :type order: str
+        :param max_depth: the depth of the deepest nodes visited, the node is at depth 0 (None for no limit).
+        :type max_depth: int
+        :param prune_meta_types: instances of these meta nodes are pruned.
+        :type prune_meta_types: list of dict
+        :param prune_paths: the nodes at or below these paths are pruned.
+        :type prune_paths: list of str
+        :param fields: send records with these fields rather than nodes (see describe_nodes).
+        :type fields: list of str or dict
+        :param include_libraries: if False library roots are pruned.
+        :type include_libraries: bool
+        :param chunk_size: the maximum number of nodes in each chunk.
+        :type chunk_size: int
+        :param window: the number of chunks the server may load ahead of the consumer.
+        :type window: int
+        :returns: generator of lists of nodes (or records if fields are given).
+        :rtype: generator
+        :raises CoreIllegalArgumentError: If some of the parameters don't match the input criteria.
+        :raises JSError: the result of the execution
+        """
+        options = {
+            'order': order,
+            'maxDepth': max_depth,
+            'pruneMetaTypes': prune_meta_types or [],
+            'prunePaths': prune_paths or [],
+            'fields': _get_describe_fields(fields),
+            'includeLibraries': include_libraries,
+        }
+
+        return self._stream('traverse', [node, options], chunk_size, window)
+
+    def describe_nodes(self, nodes, fields=None):
+        """
+        Describes many nodes in one call, rather than one call per node and value. Each record holds the path of\
+        the node and the requested fields:
+
+        - attributes, ownAttributes, registry, ownRegistry: dict of values by name.
+        - pointers, ownPointers: dict of target paths by pointer name.
+        - sets: dict of member paths by set name.
+        - base, metaType: the node (dict) or None.
+        - guid, hash, fullyQualifiedName: str.
+        - childrenPaths: list of str.
+
+        The fields are given as a list of names or as a dict where a list of names selects the values to include\
+        for attributes, registry, pointers and sets, e.g. {'attributes': ['name'], 'guid': True}. The names are in\
+        camelCase (as the keys of the node dicts) and are the keys of the records, e.g. ownAttributes.
+
+        .. code-block:: python
+
+            for record in core.describe_nodes(core.load_children(root), ['attributes', 'base']):
+                print(record['path'], record['attributes']['name'])
+
+        :param nodes: the nodes to describe.
+        :type nodes: list of dict
+        :param fields: the fields to include (None gives attributes, pointers, base, guid and childrenPaths).
+        :type fields: list of str or dict
+        :returns: one record per node in the order of the nodes (None for nodes that do not exist).
+        :rtype: list of dict
+        :raises CoreIllegalArgumentError: If some of the parameters don't match the input criteria.
+        :raises JSError: the result of the execution
+        """
+        return self._send({'name': 'describeNodes', 'args': [nodes, _get_describe_fields(fields)]})
+
+    def iter_describe_nodes(self, nodes, fields=None, chunk_size=1000, window=2):
+        """
+        Streaming variant of describe_nodes, the nodes are loaded and described in chunks as they are consumed.\
+        Not available from batches or AsyncWebGME. The stream is not isolated from modifications of the root (see\
+        iter_sub_tree).
+
+        :param nodes: the nodes to describe.
+        :type nodes: list of dict
+        :param fields: the fields to include (see describe_nodes).
+        :type fields: list of str or dict
+        :param chunk_size: the maximum number of records in each chunk.
+        :type chunk_size: int
+        :param window: the number of chunks the server may prepare ahead of the consumer.
+        :type window: int
+        :returns: generator of lists of records.
+        :rtype: generator
+        :raises CoreIllegalArgumentError: If some of the parameters don't match the input criteria.
+        :raises JSError: the result of the execution
+        """
+        return self._stream('describeNodes', [nodes, _get_describe_fields(fields)], chunk_size, window)
+
+    def get_attributes(self, nodes, names, as_array=False):
+        """
+        Reads attributes of many nodes in one call, the values are returned column by column:
+
+        .. code-block:: python
+
+            columns = core.get_attributes(components, ['mass', 'cost'], as_array=True)
+            total_mass = columns['mass'].sum()
+
+        :param nodes: the nodes in question.
+        :type nodes: list of dict
+        :param names: the names of the attributes.
+        :type names: list of str
+        :param as_array: return the columns as numpy arrays (requires numpy), columns with missing values are\
+        converted to float arrays with nan in their place. Not available from batches or AsyncWebGME.
+        :type as_array: bool
+        :returns: dictionary from the names to the lists of values, in the order of the nodes (None where a node\
+        has no such attribute).
+        :rtype: dict
+        :raises CoreIllegalArgumentError: If some of the parameters don't match the input criteria.
+        :raises JSError: the result of the execution
+        :raises ValueError: If as_array is True and numpy is not installed.
+        """
+        columns = self._send({'name': 'getAttributes', 'args': [nodes, names]})
+
+        return _to_arrays(columns) if as_array else columns
+
+    def get_registries(self, nodes, names, as_array=False):
+        """
+        Reads registry entries of many nodes in one call, the values are returned column by column (see\
+        get_attributes).
+
+        :param nodes: the nodes in question.
+        :type nodes: list of dict
+        :param names: the names of the registry entries.
+        :type names: list of str
+        :param as_array: return the columns as numpy arrays (requires numpy).
+        :type as_array: bool
+        :returns: dictionary from the names to the lists of values, in the order of the nodes.
+        :rtype: dict
+        :raises CoreIllegalArgumentError: If some of the parameters don't match the input criteria.
+        :raises JSError: the result of the execution
+        :raises ValueError: If as_array is True and numpy is not installed.
+        """
+        columns = self._send({'name': 'getRegistries', 'args': [nodes, names]})
+
+        return _to_arrays(columns) if as_array else columns
+
+    def create_nodes(self, specs):
+        """
+        Creates many nodes in one call. Each spec is a dictionary with the parameters of create_node (parent, base,\
+        relid and guid) and optionally the attributes, registry, pointers and sets of the new node. A node is given\
+        either as a node or as the index of an earlier spec in the list, pointer targets and set members may also\
+        refer to later specs:
+
+        .. code-block:: python
+
+            nodes = core.create_nodes([
+                {'parent': root, 'base': fco, 'attributes': {'name': 'Block'}},
+                {'parent': 0, 'base': fco, 'registry': {'position': {'x': 10, 'y': 20}}},
+                {'parent': 0, 'base': connection, 'pointers': {'src': 1, 'dst': other_port}},
+                {'parent': root, 'base': fco, 'sets': {'members': [0, 1, 2]}},
+            ])
+
+        :param specs: parent, base, relid, guid, attributes (dict), registry (dict), pointers (dict from names to\
+        targets) and sets (dict from names to lists of members) of each node.
+        :type specs: list of dict
+        :returns: The created nodes, in the order of the specs.
+        :rtype: list of dict
+        :raises JSError: If a spec is invalid (the message starts with its index), the nodes of the earlier specs\
+        are created nonetheless.
+        """
+        return self._send({'name': 'createNodes', 'args': [list(specs)]})
+
+    def set_attributes(self, changes):
+        """
+        Sets attributes of many nodes in one call, the changes are (node, name, value) triples as the arguments of\
+        set_attribute. A failing change does not stop the others:
+
+        .. code-block:: python
+
+            errors = core.set_attributes([(node, 'name', 'New name') for node in nodes])
+            failed = [(node, error) for node, error in zip(nodes, errors) if error]
+
+        :param changes: the (node, name, value) of each change.
+        :type changes: list of tuple
+        :returns: None or the error message per change, in the order of the changes.
+        :rtype: list of str
+        :raises JSError: If the request could not be handled.
+        """
+        return self._send({'name': 'setAttributes', 'args': [list(changes)]})
+
+    def set_registries(self, changes):
+        """
+        Sets registry entries of many nodes in one call, the changes are (node, name, value) triples as the arguments\
+        of set_registry (see set_attributes).
+
+        :param changes: the (node, name, value) of each change.
+        :type changes: list of tuple
+        :returns: None or the error message per change, in the order of the changes.
+        :rtype: list of str
+        :raises JSError: If the request could not be handled.
+        """
+        return self._send({'name': 'setRegistries', 'args': [list(changes)]})
+
+    def set_pointers(self, changes):
+        """
+        Sets pointers of many nodes in one call, the changes are (node, name, target) triples as the arguments of\
+        set_pointer (see set_attributes).
+
+        :param changes: the (node, name, target) of each change, the target may be None.
+        :type changes: list of tuple
+        :returns: None or the error message per change, in the order of the changes.
+        :rtype: list of str
+        :raises JSError: If the request could not be handled.
+        """
+        return self._send({'name': 'setPointers', 'args': [list(changes)]})
+
+    def delete_nodes(self, nodes):
+        """
+        Removes many nodes from the containment hierarchy in one call (see delete_node). A failing removal does not\
+        stop the others.
+
+        :param nodes: the nodes to be removed.
+        :type nodes: list of dict
+        :returns: None or the error message per node, in the order of the nodes.
+        :rtype: list of str
+        :raises JSError: If the request could not be handled.
+        """
+        return self._send({'name': 'deleteNodes', 'args': [list(nodes)]})
+
+    def prefetch(self, node, depth=None, include_pointers=False):
+        """
+        Starts loading the sub-tree of the node in the background on the server and returns right away. Later calls\
+        on nodes in the sub-tree find the data in the cache rather than waiting for the storage.
+
+        :param node: the root of the sub-tree to load.
+        :type node: dict
+        :param depth: the number of levels below the node to load (None loads the entire sub-tree).
+        :type depth: int
+        :param include_pointers: if True the targets of the pointers of the loaded nodes are loaded too.
+        :type include_pointers: bool
+        :returns: Dictionary with the id of the prefetch (see prefetch_status) and estimatedSize, a lower bound\
+        of the number of nodes (the node and its children).
+        :rtype: dict
+        :raises CoreIllegalArgumentError: If some of the parameters don't match the input criteria.
+        :raises JSError: the result of the execution
+        """
+        return self._send({'name': 'prefetch', 'args': [node, depth, include_pointers]})
+
+    def prefetch_status(self, prefetch_id):
+        """
+        Returns the progress of a prefetch, once it is reported as done the id is no longer valid.
+
+        :param prefetch_id: the id returned by prefetch.
+        :type prefetch_id: str
+        :returns: Dictionary with loaded (the number of nodes loaded so far), done and error (message or None).
+        :rtype: dict
+        :raises JSError: If there is no prefetch with the id.
+        """
+        return self._send({'name': 'prefetchStatus', 'args': [prefetch_id]})
+
+    def open_root(self, root_hash):
+        """
+        Loads the root like load_root and returns it as a RootNode that unloads the root from the server when it is\
+        released: at the end of a with-block, by calling its release method or once it is garbage collected (the\
+        unload is then sent along with the next core request). A root opened several times is unloaded when all\
+        of them are released, don't mix it with load_root of the same hash. Not available from batches or\
+        AsyncWebGME.
+
+        .. code-block:: python
+
+            with core.open_root(root_hash) as root:
+                children = core.load_children(root)
+
+        :param root_hash: the hash of the data object to load as root.
+        :type root_hash: str
+        :returns: the root node.
+        :rtype: RootNode
+        :raises JSError: the result of the execution
+        """
+        root = RootNode(self, self.load_root(root_hash))
+        root_id = root['rootId']
+        token = root._token
+
+        def finalize(ref):
+            # Runs in whichever thread collects the node (possibly while holding _roots_lock), so it only queues
+            # the root to be closed along with the next request.
+            self._collected_roots.append((token, root_id))
+
+        with self._roots_lock:
+            self._open_roots[token] = (weakref.ref(root, finalize), root_id)
+
+        return root
+
+    def _close_root(self, token, root_id):
+        # True if the token was open and no other node of the root is (called with _roots_lock held).
+        if self._open_roots.pop(token, None) is None:
+            return False
+
+        return all(open_root_id != root_id for _, open_root_id in self._open_roots.values())
+
+    def _take_released_roots(self):
+        # The rootIds of the collected RootNodes that are to be unloaded.
+        released_roots = []
+        with self._roots_lock:
+            while True:
+                try:
+                    token, root_id = self._collected_roots.popleft()
+                except IndexError:
+                    break
+                if self._close_root(token, root_id):
+                    released_roots.append(root_id)
+
+        return released_roots
+
+    def _release_root(self, root):
+        with self._roots_lock:
+            if not self._close_root(root._token, root['rootId']):
+                return
+
+        payload = {'type': 'util', 'name': 'unloadRoot', 'args': [root]}
+        released_roots = self._take_released_roots()
+        if released_roots:
+            payload['unloadRoots'] = released_roots
+        self._webgme.send_request(payload)
+        self._webgme.handle_response()
+
     def add_library(self, node, name, library_root_hash, library_info=None):
         """
         It adds a project as library to your project by copying it over. The library will be a node\        with the given name directly under your project's ROOT. It becomes a read-only portion of your project.\        You will only be able to manipulate it with library functions, but cannot edit the individual nodes inside.\        However you will be able to instantiate or copy the nodes into other places of your project. Every node\        that was part of the META in the originating project becomes part of your project's meta.
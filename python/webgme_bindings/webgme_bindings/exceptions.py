@@ -52,3 +52,36 @@ class CoreInternalError(JSError):
 
     def __init__(self, err_data):
         super(CoreInternalError, self).__init__(err_data)
+
+
+class RequestTimeoutError(Exception):
+    """
+    RequestTimeoutError is raised when no response to a request was received from the zmq-server within the\
+    timeout (and any retries of read-only requests timed out too). The socket has been rebuilt when it is raised,\
+    so the WebGME instance can still be used for new requests.
+    """
+
+    def __init__(self, method, timeout):
+        super(RequestTimeoutError, self).__init__('No response to {0} within {1}s.'.format(method, timeout))
+
+        self.method = method
+        self.timeout = timeout
+
+
+_JS_ERROR_TYPES = {
+    'CoreIllegalArgumentError': CoreIllegalArgumentError,
+    'CoreIllegalOperationError': CoreIllegalOperationError,
+    'CoreInternalError': CoreInternalError,
+}
+
+
+def get_js_error(err_data):
+    """
+    Creates an exception instance of the class matching the type of the error raised on the java-script side.
+
+    :param err_data: The err part of a response from corezmq.
+    :type err_data: dict
+    :returns: The exception corresponding to the error type (defaults to JSError).
+    :rtype: JSError
+    """
+    return _JS_ERROR_TYPES.get(err_data['type'], JSError)(err_data)
@@ -87,9 +87,21 @@ class PluginBase(object):
 
         return self._META
 
-    def _send(self, payload):
+    def batch(self):
+        """
+        Creates a new batch of core, project and util calls sent in one request (see WebGME.batch).
+
+        :returns: A new batch bound to the WebGME instance of the plugin.
+        :rtype: Batch
+        """
+        return self._webgme.batch()
+
+    def _send(self, payload, attachments=None):
         payload['type'] = 'plugin'
-        self._webgme.send_request(payload)
+        if attachments:
+            self._webgme.send_request(payload, attachments)
+        else:
+            self._webgme.send_request(payload)
         return self._webgme.handle_response()
 
     def add_artifact(self, name, files):
@@ -106,15 +118,23 @@ class PluginBase(object):
         :raises JSError: The result of the execution.
         """
         extendedDict = {}
+        attachments = []
         for key in files:
             content = files[key];
             is_bytes = False
             if isinstance(content, bytes):
-                content = base64.b64encode(content).decode("UTF-8")
+                content = self._encode_bytes(content, attachments)
                 is_bytes = True
             extendedDict[key] = {'content': content, 'binary': is_bytes}
 
-        return self._send({'name': 'addArtifact', 'args': [name, extendedDict]})
+        return self._send({'name': 'addArtifact', 'args': [name, extendedDict]}, attachments)
+
+    def _encode_bytes(self, content, attachments):
+        # With a negotiated codec the bytes are sent as a separate frame, otherwise as base64 encoded string.
+        if self._webgme.codec is not None:
+            attachments.append(content)
+            return {'$bin': len(attachments) - 1}
+        return base64.b64encode(content).decode("UTF-8")
 
     def add_file(self, name, content):
         """
@@ -128,12 +148,13 @@ class PluginBase(object):
         :rtype: str
         :raises JSError: The result of the execution.
         """
+        attachments = []
         if isinstance(content, bytes):
-            content = base64.b64encode(content).decode("UTF-8")
+            content = self._encode_bytes(content, attachments)
             is_bytes = True
         else:
             is_bytes = False
-        return self._send({'name': 'addFile', 'args': [name, content, is_bytes]})
+        return self._send({'name': 'addFile', 'args': [name, content, is_bytes]}, attachments)
 
     def create_message(self, node, message, severity='info'):
         """
@@ -202,8 +223,10 @@ class PluginBase(object):
         :rtype: bytes
         :raises JSError: The result of the execution.
         """
-        content_as_string = self._send({'name': 'getBinFile', 'args': [metadata_hash, sub_path]})
-        return base64.b64decode(content_as_string.encode('UTF-8'))
+        content = self._send({'name': 'getBinFile', 'args': [metadata_hash, sub_path]})
+        if isinstance(content, bytes):
+            return content
+        return base64.b64decode(content.encode('UTF-8'))
 
     def get_current_config(self):
         """
@@ -0,0 +1,188 @@
+"""
+Pool of WebGME connections that can be shared between threads.
+"""
+
+import threading
+import uuid
+import zmq
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from .core import Core
+from .project import Project
+from .util import Util
+from .batch import Batch
+from .session import open_project
+from .stats import RPCStats
+from .compression import DEFAULT_THRESHOLD
+from .webgme import WebGME, get_default_logger
+
+
+class WebGMEPool(object):
+    """
+    Thread-safe counterpart of WebGME. A WebGME instance owns a single REQ socket and cannot be used from
+    multiple threads, the pool holds a number of connections and each call checks one out for the duration of
+    its request and response. The core, project and util APIs are the same as for WebGME:
+
+    .. code-block:: python
+
+        pool = WebGMEPool(5555, logger, size=8)
+        with concurrent.futures.ThreadPoolExecutor(8) as executor:
+            names = list(executor.map(lambda node: pool.core.get_attribute(node, 'name'), nodes))
+
+        pool.disconnect()
+
+    Note that the calls from different threads are handled in the order they reach the server (one at a time
+    unless it runs with --router), await mutations before issuing calls that depend on them.
+    """
+
+    def __init__(self, port=5555, logger=None, address=None, codec=None, size=4, timeout=None, retries=2,
+                 compression=None, compression_threshold=DEFAULT_THRESHOLD, compact_nodes=True, session_key=None):
+        """
+        Creates the pool and connects size WebGME instances to the zmq-server (sharing one zmq context).
+
+        :param port: The port that the webgme zmq-server listens on (or its full address).
+        :type port: int or str
+        :param logger: Optional logger (defaults to DEBUG console logger)
+        :param address: If given the port is not used and the zmq clients will connect to the address.
+        :type address: str
+        :param codec: Name of codec to encode messages with, 'json', 'orjson' or 'msgpack'.
+        :type codec: str
+        :param size: Number of connections, i.e. the maximum number of requests in flight.
+        :type size: int
+        :param timeout: Seconds to wait for each response, None waits forever (see WebGME).
+        :type timeout: float
+        :param retries: Number of times a read-only request is resent after timing out.
+        :type retries: int
+        :param compression: Name of compression for large message bodies (see WebGME), False disables it.
+        :type compression: str or bool
+        :param compression_threshold: Minimum size in bytes of request bodies to compress.
+        :type compression_threshold: int
+        :param compact_nodes: Let the server send compact lists of nodes (see WebGME).
+        :type compact_nodes: bool
+        :param session_key: Key shared by the connections, a server started with --workers handles all their\
+        requests at the same worker (see WebGME). Defaults to a new random key.
+        :type session_key: str
+        """
+        if logger:
+            self.logger = logger
+        else:
+            self.logger = get_default_logger()
+
+        self._context = zmq.Context()
+        self._stats = RPCStats()
+        self._connections = []
+        self._idle = queue.Queue()
+        self._local = threading.local()
+        session_key = session_key or uuid.uuid4().hex
+
+        for _ in range(size):
+            webgme = WebGME(port, self.logger, address, codec, timeout, retries, self._context, compression,
+                            compression_threshold, compact_nodes, session_key)
+            webgme._stats = self._stats
+            self._connections.append(webgme)
+            self._idle.put(webgme)
+
+        #: An instance of webgme_bindings.Core
+        self.core = Core(self)
+
+        #: An instance of webgme_bindings.Project
+        self.project = Project(self)
+
+        #: An instance of webgme_bindings.Util
+        self.util = Util(self)
+
+    def __len__(self):
+        return len(self._connections)
+
+    @property
+    def codec(self):
+        """
+        The codec negotiated with the server (the same for all connections).
+        """
+        return self._connections[0].codec
+
+    def disconnect(self):
+        """
+        Disconnects all connections from the nodejs zmq-server.
+        """
+        for webgme in self._connections:
+            webgme.disconnect()
+
+    def batch(self):
+        """
+        Creates a new batch of calls that are sent to the zmq-server in one request (see WebGME.batch). A batch
+        must be used from a single thread.
+
+        :returns: A new batch bound to this pool.
+        :rtype: Batch
+        """
+        return Batch(self)
+
+    def open_project(self, project_name, owner=None):
+        """
+        Opens a session at another project served by the same zmq-server (see WebGME.open_project), its calls\
+        check out connections from the pool.
+
+        :param project_name: Name of the project.
+        :type project_name: str
+        :param owner: Owner of the project (defaults to the user of the server).
+        :type owner: str
+        :returns: The session at the project.
+        :rtype: ProjectSession
+        :raises JSError: If the project could not be opened.
+        """
+        return open_project(self, project_name, owner)
+
+    def stats(self):
+        """
+        Statistics of the requests sent from all connections of the pool (see WebGME.stats).
+
+        :returns: The statistics recorded since the pool was created (or last reset).
+        :rtype: RPCStats
+        """
+        return self._stats
+
+    def ping(self, timeout=1.0):
+        """
+        Sends a heartbeat to the zmq-server through one of the connections.
+
+        :param timeout: Seconds to wait for the response.
+        :type timeout: float
+        :returns: The round-trip time in seconds.
+        :rtype: float
+        :raises RequestTimeoutError: If the server did not respond in time.
+        """
+        webgme = self._idle.get()
+        try:
+            return webgme.ping(timeout)
+        finally:
+            self._idle.put(webgme)
+
+    def send_request(self, payload, attachments=None):
+        """
+        Checks out a connection for the calling thread and sends the request on it, the connection is returned to\
+        the pool by the following handle_response (from the same thread).
+        """
+        webgme = self._idle.get()
+        try:
+            if attachments:
+                webgme.send_request(payload, attachments)
+            else:
+                webgme.send_request(payload)
+        except Exception:
+            self._idle.put(webgme)
+            raise
+
+        self._local.webgme = webgme
+
+    def handle_response(self):
+        webgme = self._local.webgme
+        self._local.webgme = None
+        try:
+            return webgme.handle_response()
+        finally:
+            self._idle.put(webgme)
@@ -0,0 +1,97 @@
+"""
+Sessions at other projects than the one the zmq-server was started at.
+"""
+
+from .core import Core
+from .project import Project
+from .util import Util
+from .batch import Batch
+
+
+class ProjectSession(object):
+    """
+    Core, project and util APIs at another project served by the same zmq-server (and connection). The server
+    opens the project at its storage connection and keeps it, with its own core, loaded roots and node cache, open
+    until it is closed or has been idle for a while. Instances are created from WebGME.open_project:
+
+    .. code-block:: python
+
+        with webgme.open_project('OtherProject') as other:
+            commit_hash = other.project.get_branch_hash('master')
+            root = other.core.load_root(other.project.get_root_hash(commit_hash))
+
+    Nodes loaded in a session can only be passed to calls made through the same session.
+    """
+
+    def __init__(self, webgme, project_id):
+        self._webgme = webgme
+        self.logger = webgme.logger
+
+        #: The id of the project, '<owner>+<name>'
+        self.project_id = project_id
+
+        #: An instance of webgme_bindings.Core at the project
+        self.core = Core(self)
+
+        #: An instance of webgme_bindings.Project at the project
+        self.project = Project(self)
+
+        #: An instance of webgme_bindings.Util at the project
+        self.util = Util(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def codec(self):
+        """
+        The codec negotiated by the underlying connection.
+        """
+        return self._webgme.codec
+
+    def batch(self):
+        """
+        Creates a new batch of calls at the project (see WebGME.batch).
+
+        :returns: A new batch bound to this session.
+        :rtype: Batch
+        """
+        return Batch(self)
+
+    def send_request(self, payload, attachments=None):
+        payload['projectId'] = self.project_id
+        if attachments:
+            self._webgme.send_request(payload, attachments)
+        else:
+            self._webgme.send_request(payload)
+
+    def handle_response(self):
+        return self._webgme.handle_response()
+
+    def close(self):
+        """
+        Lets the server close the project (it is reopened if the session is used again).
+        """
+        self._webgme.send_request({'type': 'util', 'name': 'closeProject', 'args': [self.project_id]})
+        self._webgme.handle_response()
+
+
+def open_project(webgme, project_name, owner=None):
+    """
+    Opens a session at the project (see WebGME.open_project).
+
+    :param webgme: The connection to open the session through, e.g. a WebGME or WebGMEPool.
+    :param project_name: Name of the project.
+    :type project_name: str
+    :param owner: Owner of the project (defaults to the user of the server).
+    :type owner: str
+    :returns: The session at the project.
+    :rtype: ProjectSession
+    :raises JSError: If the project could not be opened.
+    """
+    webgme.send_request({'type': 'util', 'name': 'openProject', 'args': [project_name, owner]})
+
+    return ProjectSession(webgme, webgme.handle_response())
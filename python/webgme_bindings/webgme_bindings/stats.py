@@ -0,0 +1,158 @@
+"""
+Statistics about the requests sent to the zmq-server.
+"""
+
+import json
+import math
+import threading
+import time
+
+#: Clock used for measuring latencies.
+clock = getattr(time, 'perf_counter', time.time)
+
+# Latencies are bucketed logarithmically from 1 micro-second with four buckets per doubling (~19% resolution).
+_BUCKETS_PER_DOUBLING = 4
+_MIN_LATENCY = 1e-6
+_NUM_BUCKETS = 128
+
+
+class LatencyHistogram(object):
+    """
+    Histogram of latencies (in seconds) with logarithmic buckets.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._buckets = [0] * _NUM_BUCKETS
+
+    def add(self, latency):
+        self.count += 1
+        self.total += latency
+        if self.min is None or latency < self.min:
+            self.min = latency
+        if self.max is None or latency > self.max:
+            self.max = latency
+
+        if latency <= _MIN_LATENCY:
+            index = 0
+        else:
+            index = min(int(math.log(latency / _MIN_LATENCY, 2) * _BUCKETS_PER_DOUBLING) + 1, _NUM_BUCKETS - 1)
+
+        self._buckets[index] += 1
+
+    def percentile(self, q):
+        """
+        :param q: The percentile in the range [0, 100].
+        :type q: int or float
+        :returns: The upper bound of the bucket containing the percentile (None if empty).
+        :rtype: float
+        """
+        if self.count == 0:
+            return None
+
+        rank = q / 100.0 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self._buckets):
+            cumulative += bucket_count
+            if cumulative >= rank and bucket_count > 0:
+                upper = _MIN_LATENCY * 2 ** (float(index) / _BUCKETS_PER_DOUBLING)
+                return max(self.min, min(upper, self.max))
+
+        return self.max
+
+
+class RPCStats(object):
+    """
+    Per-method statistics of requests, keyed by '<type>.<name>', e.g. 'core.getAttribute'. For each method
+    the number of calls and errors, latencies (mean, p50, p95, p99 and max in seconds), the number of
+    request and response bytes and the compression ratio of the bodies are recorded. Recording is thread-safe,
+    so an instance can be shared by the connections of a WebGMEPool.
+    """
+
+    def __init__(self):
+        self._methods = {}
+        self._lock = threading.Lock()
+
+    def record(self, method, latency, request_bytes, response_bytes, error=False, uncompressed_bytes=None):
+        """
+        Records a completed request.
+
+        :param method: Key of the method, '<type>.<name>'.
+        :type method: str
+        :param latency: Time from sending the request until the response was received (in seconds).
+        :type latency: float
+        :param request_bytes: Size of the encoded request.
+        :type request_bytes: int
+        :param response_bytes: Size of the encoded response.
+        :type response_bytes: int
+        :param error: True if the response was an error.
+        :type error: bool
+        :param uncompressed_bytes: Size of request and response before compression (defaults to their sizes).
+        :type uncompressed_bytes: int
+        """
+        if uncompressed_bytes is None:
+            uncompressed_bytes = request_bytes + response_bytes
+
+        with self._lock:
+            entry = self._methods.get(method)
+            if entry is None:
+                entry = self._methods[method] = {
+                    'errors': 0,
+                    'latency': LatencyHistogram(),
+                    'request_bytes': 0,
+                    'response_bytes': 0,
+                    'uncompressed_bytes': 0,
+                }
+
+            entry['latency'].add(latency)
+            entry['request_bytes'] += request_bytes
+            entry['response_bytes'] += response_bytes
+            entry['uncompressed_bytes'] += uncompressed_bytes
+            if error:
+                entry['errors'] += 1
+
+    def reset(self):
+        """
+        Clears all recorded statistics.
+        """
+        with self._lock:
+            self._methods = {}
+
+    def as_dict(self):
+        """
+        :returns: Dictionary from method key to a dictionary with count, errors, total_time, mean, p50, p95, p99,\
+        max, request_bytes, response_bytes and compression_ratio (uncompressed size over sent and received bytes).
+        :rtype: dict
+        """
+        result = {}
+        with self._lock:
+            # Read under the lock as well, for the counters of an entry to be consistent with each other.
+            for method, entry in self._methods.items():
+                latency = entry['latency']
+                result[method] = {
+                    'count': latency.count,
+                    'errors': entry['errors'],
+                    'total_time': latency.total,
+                    'mean': latency.total / latency.count,
+                    'p50': latency.percentile(50),
+                    'p95': latency.percentile(95),
+                    'p99': latency.percentile(99),
+                    'max': latency.max,
+                    'request_bytes': entry['request_bytes'],
+                    'response_bytes': entry['response_bytes'],
+                    'compression_ratio': float(entry['uncompressed_bytes']) /
+                    max(entry['request_bytes'] + entry['response_bytes'], 1),
+                }
+
+        return result
+
+    def to_json(self, **kwargs):
+        """
+        :param kwargs: Passed on to json.dumps, e.g. indent.
+        :returns: The statistics from as_dict as a json string.
+        :rtype: str
+        """
+        return json.dumps(self.as_dict(), **kwargs)
@@ -11,14 +11,19 @@ coverage run -m unittest discover -s C:/Users/patrik85/GIT/webgme-core-bindings/
 """
 
 import unittest
+import gc
 import os
+import sys
 import signal
 import subprocess
 import time
 import logging
+import threading
 from .webgme import WebGME
-from .exceptions import JSError, CoreIllegalArgumentError, CoreIllegalOperationError
+from .pool import WebGMEPool
+from .exceptions import JSError, CoreIllegalArgumentError, CoreIllegalOperationError, RequestTimeoutError
 from .pluginbase import PluginBase
+from .codec import available_codecs
 
 logger = logging.getLogger('test-logger')
 logger.setLevel(logging.ERROR)
@@ -27,7 +32,9 @@ logger.setLevel(logging.ERROR)
 WEBGME_IMPORT_BIN = 'node_modules/webgme-engine/src/bin/import.js'
 SEED_FILE = 'node_modules/webgme-engine/seeds/EmptyProject.webgmex'
 TEST_PROJECT = 'PythonTestProject'
+OTHER_TEST_PROJECT = 'PythonOtherTestProject'
 PORT = '5555'
+ROUTER_PORT = '5556'
 dir_path = os.path.dirname(os.path.realpath(__file__))
 root_dir = os.path.join(dir_path, '..', '..', '..')
 my_env = os.environ.copy()
@@ -347,6 +354,136 @@ class CoreTests(ConnectedTestClass):
         self.assertTrue(self.core.is_valid_new_child(self.child2, self.child))
         self.assertFalse(self.core.is_valid_new_child(self.fco, self.fco))
 
+    def test_iter_should_stream_same_nodes_in_chunks(self):
+        tree_nodes = sorted(self.core.load_sub_tree(self.root), key=node_dict_sort)
+        chunks = list(self.core.iter_sub_tree(self.root, chunk_size=2))
+        self.assertTrue(all(0 < len(chunk) <= 2 for chunk in chunks))
+        self.assertEqual(sorted([node for chunk in chunks for node in chunk], key=node_dict_sort), tree_nodes)
+
+        own_nodes = [node for chunk in self.core.iter_own_sub_tree(self.root, chunk_size=1, window=1) for node in chunk]
+        self.assertEqual(sorted(own_nodes, key=node_dict_sort), tree_nodes)
+
+        instances = [node for chunk in self.core.iter_instances(self.fco, chunk_size=1) for node in chunk]
+        self.assertEqual(sorted(instances, key=node_dict_sort),
+                         sorted(self.core.load_instances(self.fco), key=node_dict_sort))
+
+    def test_describe_nodes_should_give_the_values_of_the_fields(self):
+        nodes = [self.root, self.child, self.child_instance]
+        records = self.core.describe_nodes(nodes)
+        self.assertEqual([record['path'] for record in records], [self.core.get_path(node) for node in nodes])
+        for node, record in zip(nodes, records):
+            self.assertEqual(record['attributes']['name'], self.core.get_attribute(node, 'name'))
+            self.assertEqual(record['guid'], self.core.get_guid(node))
+            self.assertEqual(record['childrenPaths'], self.core.get_children_paths(node))
+        self.assertEqual(records[0]['base'], None)
+        self.assertTrue(self.equal(records[2]['base'], self.child))
+
+        records = self.core.describe_nodes([self.child], {'ownAttributes': ['name'], 'metaType': True})
+        self.assertEqual(records[0], {'path': self.core.get_path(self.child), 'ownAttributes': {'name': 'child'},
+                                      'metaType': self.fco})
+        self.assertRaises(JSError, self.core.describe_nodes, [self.child], ['noSuchField'])
+        self.assertRaises(JSError, self.core.describe_nodes, [self.child], ['own_attributes'])
+
+        chunks = list(self.core.iter_describe_nodes(nodes, ['guid'], chunk_size=2))
+        self.assertEqual([record for chunk in chunks for record in chunk],
+                         self.core.describe_nodes(nodes, ['guid']))
+
+    def test_get_attributes_should_give_the_values_per_name(self):
+        nodes = [self.root, self.child, self.child_instance]
+        columns = self.core.get_attributes(nodes, ['name', 'noSuchAttribute'])
+        self.assertEqual(columns['name'], [self.core.get_attribute(node, 'name') for node in nodes])
+        self.assertEqual(columns['noSuchAttribute'], [None, None, None])
+
+        columns = self.core.get_registries([self.child], ['position'])
+        self.assertEqual(columns['position'], [self.core.get_registry(self.child, 'position')])
+
+    def test_set_attributes_should_apply_all_changes_and_report_errors(self):
+        errors = self.core.set_attributes([(self.child, 'name', 'renamed'), (self.child2, 'noSuchAttribute', 1)])
+        self.assertEqual(errors[0], None)
+        self.assertEqual(self.core.get_attribute(self.child, 'name'), 'renamed')
+
+        self.assertEqual(self.core.set_registries([(self.child, 'position', {'x': 1, 'y': 2})]), [None])
+        self.assertEqual(self.core.get_registry(self.child, 'position'), {'x': 1, 'y': 2})
+
+        self.assertEqual(self.core.set_pointers([(self.child, 'ref', self.child2), (self.child2, 'ref', None)]),
+                         [None, None])
+        self.assertEqual(self.core.get_pointer_path(self.child, 'ref'), self.core.get_path(self.child2))
+        self.assertEqual(self.core.get_pointer_path(self.child2, 'ref'), None)
+
+        child_path = self.core.get_path(self.child)
+        self.assertEqual(self.core.delete_nodes([self.child]), [None])
+        self.assertEqual(self.core.load_by_path(self.root, child_path), None)
+
+    def test_delete_nodes_should_delete_descendants_along_with_their_ancestor(self):
+        grandchild = self.core.create_child(self.child, self.fco)
+        paths = [self.core.get_path(grandchild), self.core.get_path(self.child)]
+        self.assertEqual(self.core.delete_nodes([grandchild, self.child, self.child]), [None, None, None])
+        self.assertEqual([self.core.load_by_path(self.root, path) for path in paths], [None, None])
+
+    def test_create_nodes_should_resolve_references_to_other_specs(self):
+        nodes = self.core.create_nodes([
+            {'parent': self.root, 'base': self.fco, 'attributes': {'name': 'container'}, 'pointers': {'ref': 2}},
+            {'parent': 0, 'base': self.fco, 'relid': 'port', 'registry': {'position': {'x': 1, 'y': 2}}},
+            {'parent': 0, 'base': 1, 'sets': {'members': [0, self.child]}},
+        ])
+        self.assertEqual(len(nodes), 3)
+        self.assertEqual(self.core.get_attribute(nodes[0], 'name'), 'container')
+        self.assertTrue(self.equal(self.core.get_parent(nodes[1]), nodes[0]))
+        self.assertEqual(self.core.get_relid(nodes[1]), 'port')
+        self.assertEqual(self.core.get_registry(nodes[1], 'position'), {'x': 1, 'y': 2})
+        self.assertTrue(self.equal(self.core.get_base(nodes[2]), nodes[1]))
+        self.assertEqual(self.core.get_pointer_path(nodes[0], 'ref'), self.core.get_path(nodes[2]))
+        self.assertEqual(sorted(self.core.get_member_paths(nodes[2], 'members')),
+                         sorted([self.core.get_path(nodes[0]), self.core.get_path(self.child)]))
+        self.assertRaises(JSError, self.core.create_nodes, [{'parent': 1, 'base': self.fco}])
+
+    def test_iter_traverse_should_visit_in_order_and_prune(self):
+        def paths(chunks):
+            return [node['nodePath'] for chunk in chunks for node in chunk]
+
+        bfs = paths(self.core.iter_traverse(self.root, chunk_size=2))
+        self.assertEqual(sorted(bfs), sorted(self.core.get_path(node) for node in self.core.load_sub_tree(self.root)))
+        self.assertEqual(bfs[0], '')
+        dfs = paths(self.core.iter_traverse(self.root, order='dfs'))
+        self.assertEqual(sorted(dfs), sorted(bfs))
+
+        self.assertEqual(paths(self.core.iter_traverse(self.root, max_depth=0)), [''])
+        pruned = paths(self.core.iter_traverse(self.root, prune_meta_types=[self.child],
+                                               prune_paths=[self.core.get_path(self.child2)]))
+        self.assertEqual(sorted(pruned), sorted(['', self.core.get_path(self.fco)]))
+
+        records = [record for chunk in self.core.iter_traverse(self.root, max_depth=1, fields=['guid'])
+                   for record in chunk]
+        self.assertEqual(records[0], {'path': '', 'guid': self.core.get_guid(self.root)})
+        self.assertRaises(JSError, list, self.core.iter_traverse(self.root, order='random'))
+
+    def test_prefetch_should_load_sub_tree_in_background(self):
+        info = self.core.prefetch(self.root)
+        self.assertEqual(info['estimatedSize'], 1 + len(self.core.get_children_paths(self.root)))
+        status = self.core.prefetch_status(info['id'])
+        while not status['done']:
+            time.sleep(0.01)
+            status = self.core.prefetch_status(info['id'])
+
+        self.assertEqual(status['error'], None)
+        self.assertEqual(status['loaded'], len(self.core.load_sub_tree(self.root)))
+        self.assertRaises(JSError, self.core.prefetch_status, info['id'])
+
+        info = self.core.prefetch(self.root, depth=1, include_pointers=True)
+        status = self.core.prefetch_status(info['id'])
+        while not status['done']:
+            time.sleep(0.01)
+            status = self.core.prefetch_status(info['id'])
+        self.assertEqual(status['loaded'], info['estimatedSize'])
+
+    def test_iter_should_close_abandoned_streams(self):
+        for _ in self.core.iter_sub_tree(self.root, chunk_size=1):
+            break
+
+        self.assertEqual(len(self.core._abandoned_streams), 1)
+        self.assertEqual(len(list(self.core.iter_collection(self.fco, 'noSuchPointer'))), 0)
+        self.assertEqual(len(self.core._abandoned_streams), 0)
+
     # @unittest.skip("Temp")
     def test_instance_base_related(self):
         self.assertEqual(self.core.get_base(self.fco), None)
@@ -780,6 +917,26 @@ class UtilTests(ConnectedTestClass):
         self.util.unload_root(self.fco)  # any node can be passed
         self.assertRaises(JSError, self.core.get_attribute, self.fco, 'name')
 
+    def test_open_root_should_unload_the_root_when_released(self):
+        self.core.set_attribute(self.fco, 'name', 'opened')
+        c_obj = self.project.get_commit_object(self.util.save(self.root, self.commit_hash, None, 'Open')['hash'])
+        with self.core.open_root(c_obj['root']) as root:
+            fco = self.core.get_fco(root)
+            self.assertEqual(self.core.get_attribute(fco, 'name'), 'opened')
+
+        self.assertRaises(JSError, self.core.get_attribute, fco, 'name')
+
+    def test_open_root_should_unload_collected_root_along_with_next_request(self):
+        self.core.set_attribute(self.fco, 'name', 'collected')
+        c_obj = self.project.get_commit_object(self.util.save(self.root, self.commit_hash, None, 'Open')['hash'])
+        root = self.core.open_root(c_obj['root'])
+        fco = self.core.get_fco(root)
+        self.assertEqual(self.core.get_attribute(fco, 'name'), 'collected')
+        del root
+        gc.collect()
+        self.assertEqual(self.core.get_attribute(self.fco, 'name'), 'collected')  # carries the unload
+        self.assertRaises(JSError, self.core.get_attribute, fco, 'name')
+
     def test_traverse_should_visit_all_nodes(self):
         self.child = self.core.create_child(self.root, self.fco)
         self.core.set_attribute(self.child, 'name', 'child')
@@ -796,6 +953,290 @@ class UtilTests(ConnectedTestClass):
         self.util.traverse(self.root, at_node)
         self.assertEqual(len(names), 5)
 
+    def test_traverse_should_stream_nodes_unless_asked_not_to(self):
+        self.child = self.core.create_child(self.root, self.fco)
+        self.core.set_attribute(self.child, 'name', 'child')
+        paths = []
+        streamed_paths = []
+
+        self.util.traverse(self.root, lambda node: paths.append(node['nodePath']), stream=False)
+        self.util.traverse(self.root, lambda node: streamed_paths.append(node['nodePath']))
+        self.assertEqual(streamed_paths, paths)
+
+        streamed_paths = []
+        self.util.traverse(self.root, lambda node: streamed_paths.append(node['nodePath']), max_depth=0)
+        self.assertEqual(streamed_paths, [''])
+        self.assertRaises(TypeError, self.util.traverse, self.root, paths.append, stream=False, max_depth=0)
+
+    def test_server_stats_should_count_node_cache_hits(self):
+        self.core.get_attribute(self.fco, 'name')
+        before = self.util.get_server_stats()['nodeCache']
+        self.core.get_attribute(self.fco, 'name')
+        after = self.util.get_server_stats()['nodeCache']
+        self.assertEqual(after['hits'], before['hits'] + 1)
+        self.assertTrue(after['size'] > 0)
+
+    def test_node_cache_should_not_return_moved_or_deleted_nodes(self):
+        child = self.core.create_child(self.root, self.fco)
+        container = self.core.create_child(self.root, self.fco)
+        grand_child = self.core.create_child(child, self.fco)
+        self.core.set_attribute(grand_child, 'name', 'grandChild')
+        moved = self.core.move_node(child, container)
+        self.assertEqual(self.core.load_by_path(self.root, child['nodePath']), None)
+        self.assertEqual(len(self.core.load_children(moved)), 1)
+        self.core.delete_node(moved)
+        self.assertEqual(self.core.load_by_path(self.root, grand_child['nodePath']), None)
+
+    def test_ping_should_return_round_trip_time(self):
+        self.assertTrue(self.webgme.ping() >= 0)
+
+    def test_should_time_out_when_no_server_responds(self):
+        self.assertRaises(RequestTimeoutError, WebGME, '5599', logger, None, None, 0.1, 1)
+
+    def test_timeout_should_be_restored_after_block(self):
+        with self.webgme.timeout(10):
+            self.assertEqual(self.webgme.request_timeout, 10)
+            self.assertEqual(self.core.get_attribute(self.fco, 'name'), 'FCO')
+        self.assertEqual(self.webgme.request_timeout, None)
+
+
+# class BatchTests(object):
+class BatchTests(ConnectedTestClass):
+    def setUp(self):
+        super(BatchTests, self).setUp()
+        self.root = self.core.load_root(self.project.get_root_hash('master'))
+        self.fco = self.core.get_fco(self.root)
+
+    def tearDown(self):
+        self.util.unload_root(self.root)
+        super(BatchTests, self).tearDown()
+
+    def test_batch_should_resolve_forward_references(self):
+        with self.webgme.batch() as b:
+            child = b.core.create_child(self.root, self.fco)
+            b.core.set_attribute(child, 'name', 'batchChild')
+            name = b.core.get_attribute(child, 'name')
+            parent = b.core.get_parent(child)
+            self.assertEqual(len(b), 4)
+            self.assertFalse(name.done())
+
+        self.assertTrue(name.done())
+        self.assertEqual(name.result(), 'batchChild')
+        self.assertTrue(self.util.equal(parent.result(), self.root))
+        self.assertEqual(self.core.get_attribute(child.result(), 'name'), 'batchChild')
+
+    def test_batch_should_report_errors_per_call(self):
+        b = self.webgme.batch()
+        bad = b.core.get_set_attribute(self.fco, 'doesNotExist', 'attr')
+        bad_ref = b.core.get_attribute(bad, 'name')
+        good = b.core.get_attribute(self.fco, 'name')
+        b.flush()
+
+        self.assertRaises(CoreIllegalOperationError, bad.result)
+        self.assertRaises(JSError, bad_ref.result)
+        self.assertEqual(good.result(), 'FCO')
+
+    def test_result_should_flush_pending_batch(self):
+        b = self.webgme.batch()
+        name = b.core.get_attribute(self.fco, 'name')
+        self.assertEqual(name.result(), 'FCO')
+        self.assertEqual(len(b), 0)
+
+
+# class CodecTests(object):
+class CodecTests(ConnectedTestClass):
+    def test_should_negotiate_the_requested_codecs(self):
+        root_hash = self.project.get_root_hash('master')
+        for codec_name in available_codecs():
+            webgme = WebGME(PORT, logger, codec=codec_name)
+            try:
+                self.assertEqual(webgme.codec.name, codec_name)
+                root = webgme.core.load_root(root_hash)
+                fco = webgme.core.get_fco(root)
+                self.assertEqual(webgme.core.get_attribute(fco, 'name'), 'FCO')
+                webgme.util.unload_root(root)
+            finally:
+                webgme.disconnect()
+
+    def test_should_compress_large_bodies(self):
+        root_hash = self.project.get_root_hash('master')
+        webgme = WebGME(PORT, logger, compression='zlib', compression_threshold=0)
+        try:
+            self.assertEqual(webgme.compression.name, 'zlib')
+            root = webgme.core.load_root(root_hash)
+            self.assertEqual(len(webgme.core.load_sub_tree(root)), len(self.core.load_sub_tree(
+                self.core.load_root(root_hash))))
+            self.assertTrue(webgme.stats().as_dict()['core.loadSubTree']['compression_ratio'] > 1)
+            webgme.util.unload_root(root)
+        finally:
+            webgme.disconnect()
+
+    def test_compact_node_lists_should_expand_to_same_nodes(self):
+        root_hash = self.project.get_root_hash('master')
+        webgme = WebGME(PORT, logger, compact_nodes=False)
+        try:
+            self.assertFalse(webgme._compact_nodes)
+            self.assertTrue(self.webgme._compact_nodes or self.webgme.codec is None)
+            root = webgme.core.load_root(root_hash)
+            expected = webgme.core.load_sub_tree(root)
+            self.assertEqual(self.core.load_sub_tree(self.core.load_root(root_hash)), expected)
+            webgme.util.unload_root(root)
+        finally:
+            webgme.disconnect()
+
+    def test_should_not_compress_if_disabled(self):
+        webgme = WebGME(PORT, logger, compression=False)
+        try:
+            self.assertEqual(webgme.compression, None)
+        finally:
+            webgme.disconnect()
+
+    def test_should_fail_on_unknown_codec(self):
+        self.assertRaises(ValueError, WebGME, PORT, logger, None, 'doesNotExist')
+
+
+# class PoolTests(object):
+class PoolTests(ConnectedTestClass):
+    def setUp(self):
+        super(PoolTests, self).setUp()
+        self.pool = WebGMEPool(PORT, logger, size=3)
+        self.root = self.pool.core.load_root(self.project.get_root_hash('master'))
+        self.fco = self.pool.core.get_fco(self.root)
+
+    def tearDown(self):
+        self.pool.util.unload_root(self.root)
+        self.pool.disconnect()
+        super(PoolTests, self).tearDown()
+
+    def test_should_handle_calls_from_multiple_threads(self):
+        results = []
+
+        def get_names():
+            for _ in range(20):
+                results.append(self.pool.core.get_attribute(self.fco, 'name'))
+
+        threads = [threading.Thread(target=get_names) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ['FCO'] * 120)
+        self.assertEqual(self.pool.stats().as_dict()['core.getAttribute']['count'], 120)
+
+    def test_should_release_connection_on_error(self):
+        for _ in range(len(self.pool) + 1):
+            self.assertRaises(CoreIllegalArgumentError, self.pool.core.get_attribute, self.fco, 5)
+
+        self.assertEqual(self.pool.core.get_attribute(self.fco, 'name'), 'FCO')
+
+
+# class SessionTests(object):
+class SessionTests(ConnectedTestClass):
+    def setUp(self):
+        super(SessionTests, self).setUp()
+        self.session = self.webgme.open_project(OTHER_TEST_PROJECT)
+
+    def tearDown(self):
+        self.session.close()
+        super(SessionTests, self).tearDown()
+
+    def test_should_open_other_project(self):
+        self.assertTrue(self.session.project_id.endswith('+' + OTHER_TEST_PROJECT))
+        self.assertEqual(self.session.project.get_project_info()['name'], OTHER_TEST_PROJECT)
+        self.assertEqual(self.project.get_project_info()['name'], TEST_PROJECT)
+
+    def test_should_load_nodes_in_other_project(self):
+        root = self.session.core.load_root(self.session.project.get_root_hash('master'))
+        fco = self.session.core.get_fco(root)
+        self.session.core.set_attribute(fco, 'name', 'OtherFCO')
+        self.assertEqual(self.session.core.get_attribute(fco, 'name'), 'OtherFCO')
+
+        with self.session.batch() as b:
+            name = b.core.get_attribute(fco, 'name')
+
+        self.assertEqual(name.result(), 'OtherFCO')
+        self.assertEqual(self.webgme.util.get_server_stats()['projects'], 1)
+
+    def test_should_reopen_closed_project(self):
+        self.session.close()
+        self.assertEqual(len(self.session.project.get_branches()), 1)
+
+    def test_should_raise_for_unknown_project(self):
+        self.assertRaises(JSError, self.webgme.open_project, 'DoesNotExist')
+
+
+# class StatsTests(object):
+class StatsTests(ConnectedTestClass):
+    def test_should_record_calls_per_method(self):
+        self.webgme.stats().reset()
+        for _ in range(3):
+            self.core.get_attribute(self.fco, 'name')
+        self.assertRaises(CoreIllegalArgumentError, self.core.get_attribute, self.fco, 5)
+
+        stats = self.webgme.stats().as_dict()
+        self.assertEqual(list(stats.keys()), ['core.getAttribute'])
+        self.assertEqual(stats['core.getAttribute']['count'], 4)
+        self.assertEqual(stats['core.getAttribute']['errors'], 1)
+        self.assertTrue(stats['core.getAttribute']['p50'] <= stats['core.getAttribute']['max'])
+        self.assertTrue(stats['core.getAttribute']['request_bytes'] > 0)
+
+        self.webgme.stats().reset()
+        self.assertEqual(self.webgme.stats().as_dict(), {})
+
+
+# class AsyncTests(object):
+@unittest.skipIf(sys.version_info < (3, 7), 'asyncio.run requires python 3.7+')
+@unittest.skipIf('DO_NOT_START_SERVER' in my_env, 'requires a corezmq server listening with a router socket')
+class AsyncTests(unittest.TestCase):
+    def setUp(self):
+        self.node_process = subprocess.Popen(['node', COREZMQ_SERVER_FILE, TEST_PROJECT, '-p', ROUTER_PORT,
+                                              '--router'], env=my_env, cwd=root_dir)
+
+    def tearDown(self):
+        self.node_process.send_signal(signal.SIGTERM)
+
+    def test_should_have_multiple_requests_in_flight(self):
+        import asyncio
+        from .aio import AsyncWebGME
+
+        async def run():
+            async with AsyncWebGME(ROUTER_PORT, logger) as webgme:
+                core = webgme.core
+                root = await core.load_root(await webgme.project.get_root_hash('master'))
+                fco = await core.get_fco(root)
+                children = await asyncio.gather(*[core.create_child(root, fco) for _ in range(10)])
+                await asyncio.gather(*[core.set_attribute(child, 'name', str(i)) for i, child in enumerate(children)])
+                names = await asyncio.gather(*[core.get_attribute(child, 'name') for child in children])
+                self.assertEqual(names, [str(i) for i in range(10)])
+
+                with self.assertRaises(CoreIllegalOperationError):
+                    await core.get_set_attribute(fco, 'doesNotExist', 'attr')
+
+        asyncio.run(run())
+
+    def test_should_keep_mutations_at_a_root_in_order(self):
+        import asyncio
+        from .aio import AsyncWebGME
+
+        async def run():
+            async with AsyncWebGME(ROUTER_PORT, logger) as webgme:
+                core = webgme.core
+                root = await core.load_root(await webgme.project.get_root_hash('master'))
+                fco = await core.get_fco(root)
+                calls = []
+                for i in range(10):
+                    calls.append(core.set_attribute(fco, 'name', str(i)))
+                    calls.append(core.get_attribute(fco, 'name'))
+
+                results = await asyncio.gather(*calls)
+                self.assertEqual(results[1::2], [str(i) for i in range(10)])
+
+                stats = await webgme.util.get_server_stats()
+                self.assertEqual(stats['requests']['queued'], 0)
+
+        asyncio.run(run())
+
 
 class PluginExample(PluginBase):
     def main(self):
@@ -845,6 +1286,15 @@ class PluginTests(ConnectedTestClass):
         self.assertEqual(len(hash), 40)
         self.assertEqual(self.plugin.get_file(hash), text)
 
+    def test_should_add_get_bin_file(self):
+        content = bytes(bytearray(range(256)))
+        hash = self.plugin.add_file('my_file.bin', content)
+        self.assertEqual(self.plugin.get_bin_file(hash), content)
+        self.assertEqual(self.plugin.get_file_metadata(hash)['size'], len(content))
+
+        hash = self.plugin.add_artifact('binArtifact', {'f.bin': content, 'f.txt': 'Hello'})
+        self.assertEqual(self.plugin.get_bin_file(hash, 'f.bin'), content)
+
     def test_should_add_get_artifact(self):
         hash = self.plugin.add_artifact('anArtifact', {'f1.txt': 'Hello1', 'f2.txt': 'Hello2'})
         self.assertEqual(len(hash), 40)
@@ -861,8 +1311,9 @@ class PluginTests(ConnectedTestClass):
 
 # Import test project(s)
 if 'DO_NOT_START_SERVER' not in my_env:
-    status = subprocess.call(['node', WEBGME_IMPORT_BIN, SEED_FILE, '-p', TEST_PROJECT, '--overwrite'],
-                             env=my_env, cwd=root_dir)
+    for project_name in [TEST_PROJECT, OTHER_TEST_PROJECT]:
+        status = subprocess.call(['node', WEBGME_IMPORT_BIN, SEED_FILE, '-p', project_name, '--overwrite'],
+                                 env=my_env, cwd=root_dir)
 else:
     print('DO_NOT_START_SERVER env. set -> will not start any nodejs processes')
 
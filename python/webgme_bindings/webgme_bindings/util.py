@@ -67,6 +67,20 @@ class Util(object):
             'args': [node]
         })
 
+    def get_server_stats(self):
+        """
+        Returns counters from the corezmq.js server, e.g. the hits, misses, evictions and invalidations of its cache\
+        of loaded nodes (saving the look-up of the node from the root on every call).
+
+        :returns: Dictionary with nodeCache (hits, misses, evictions, invalidations and size), roots and streams.
+        :rtype: dict
+        :raises JSError: The result of the execution.
+        """
+        return self._send({
+            'name': 'getServerStats',
+            'args': []
+        })
+
     def META(self, node, namespace=None):
         """
         Gathers the and returns the meta nodes in the core tree associated with the node.\
@@ -100,15 +114,22 @@ class Util(object):
         """
         return node1['nodePath'] == node2['nodePath'] and node1['rootId'] == node2['rootId']
 
-    def traverse(self, node, visitor_fn):
+    def traverse(self, node, visitor_fn, stream=True, **kwargs):
         """
         Traverses the sub-tree starting from node and invokes visitor_fn with each encountered node (including
-        the passed in node).
+        the passed in node). The sub-tree is traversed on the server (core.iter_traverse) and the nodes are visited\
+        depth-first as they are streamed, the server loads ahead of the visitor, i.e. children added or removed by\
+        visitor_fn may not be reflected.
 
         :param node: The root-node of the subtree to traverse.
         :type node: dict
         :param visitor_fn: The function invoked at each encountered node.
         :type visitor_fn: function
+        :param stream: If False the children of each node are loaded by a request of their own as it is visited\
+        instead (the options of core.iter_traverse are then not supported).
+        :type stream: bool
+        :param kwargs: Further options of core.iter_traverse, e.g. max_depth, prune_meta_types or include_libraries\
+        (the order defaults to 'dfs').
         :returns: Nothing is returned by the function.
         :rtype: None
         :raises CoreIllegalArgumentError: If some of the parameters don't match the input criteria.
@@ -118,6 +139,15 @@ class Util(object):
 
         core = self._webgme.core
 
+        if stream:
+            kwargs.setdefault('order', 'dfs')
+            for chunk in core.iter_traverse(node, **kwargs):
+                for sub_node in chunk:
+                    visitor_fn(sub_node)
+            return
+        elif kwargs:
+            raise TypeError('traverse options {0} are not supported with stream=False'.format(sorted(kwargs)))
+
         def traverse_rec(sub_root_node):
             visitor_fn(sub_root_node)
             for child in core.load_children(sub_root_node):
@@ -2,54 +2,183 @@ import zmq
 import json
 import sys
 import logging
+import contextlib
+import uuid
 
 from .core import Core
 from .project import Project
 from .util import Util
-from .exceptions import CoreIllegalArgumentError, CoreIllegalOperationError, CoreInternalError, JSError
+from .batch import Batch
+from .session import open_project
+from .codec import available_codecs, get_codec, resolve_attachments, expand_node_lists
+from .compression import DEFAULT_THRESHOLD, available_compressions, get_compression
+from .stats import RPCStats, clock
+from .exceptions import JSError, RequestTimeoutError, get_js_error
 
 is_python_3 = sys.version_info > (3, 0)
 
+# Requests that do not modify any state on the server and can be resent after a timeout.
+_READ_ONLY_PREFIXES = {
+    'core': ('get', 'is', 'load'),
+    'project': ('get',),
+    'util': ('hello', 'META', 'gmeConfig', 'getServerStats', 'openProject'),
+}
+
+# Requests that do not depend on any state (loaded roots) at the server, a broker in front of several server
+# processes (corezmq_server --workers) may route them to any of them.
+_STATELESS_PREFIXES = {
+    'project': ('get',),
+    'util': ('gmeConfig', 'getServerStats'),
+}
+
+# zmq-level heartbeats (milliseconds) detecting dead connections, requires libzmq 4.2+.
+_HEARTBEAT_IVL = 2000
+_HEARTBEAT_TIMEOUT = 10000
+
+
+def is_read_only(payload):
+    """
+    :param payload: A request with type, name and args.
+    :type payload: dict
+    :returns: True if the request can safely be resent, i.e. it does not mutate anything on the server.
+    :rtype: bool
+    """
+    if payload['type'] == 'batch':
+        return all(is_read_only(call) for call in payload['args'][0])
+
+    return payload['name'].startswith(_READ_ONLY_PREFIXES.get(payload['type'], ()))
+
+
+def is_stateless(payload):
+    """
+    :param payload: A request with type, name and args.
+    :type payload: dict
+    :returns: True if the request does not depend on the session at the server, i.e. it can be handled by any worker.
+    :rtype: bool
+    """
+    return payload['name'].startswith(_STATELESS_PREFIXES.get(payload['type'], ()))
+
+
+def get_default_logger():
+    """
+    :returns: The 'webgme' logger, with a console handler at DEBUG level added if it had no handlers.
+    :rtype: logging.Logger
+    """
+    logger = logging.getLogger('webgme')
+    if len(logger.handlers) == 0:
+        logger.setLevel(logging.DEBUG)
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setLevel(logging.DEBUG)
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+    logger.warning('No logger passed to WebGME - created console logger at DEBUG level.')
+    logger.warning('Pass a configured logger to the constructor to suppress DEBUG messages.')
+
+    return logger
+
+
+def get_result(res, logger):
+    """
+    Extracts the result from a decoded response from the zmq-server.
+
+    :param res: The decoded response, a dict with err and res.
+    :type res: dict
+    :param logger: Logger to log errors of unknown types at.
+    :type logger: logging.Logger
+    :returns: The result of the request.
+    :raises CoreIllegalArgumentError: If some of the parameters don't match the input criteria.
+    :raises CoreIllegalOperationError: If the context of the operation is not allowed.
+    :raises CoreInternalError: If some internal error took place inside the core layers.
+    :raises JSError: The result of the execution.
+    """
+    if res['err']:
+        error = get_js_error(res['err'])
+        if type(error) is JSError:
+            logger.error(res['err'])
+        raise error
+
+    if 'res' in res:
+        return res['res']
+    else:
+        return None
+
 
 class WebGME(object):
     """
     The main class for connecting to the webgme api
     """
 
-    def __init__(self, port=5555, logger=None, address=None):
+    def __init__(self, port=5555, logger=None, address=None, codec=None, timeout=None, retries=2, context=None,
+                 compression=None, compression_threshold=DEFAULT_THRESHOLD, compact_nodes=True, session_key=None):
         """
         Creates an instance of WebGME and creates and connects a zmq socket-object to
         tcp://127.0.0.1:<port>. To disconnect use the disconnect method.
 
-        :param port: The port that the webgme zmq-server listens on.
+        If a timeout is given and no response arrives in time the socket is closed and a new one is connected
+        (a REQ socket cannot send again before it received a reply). Read-only requests (getters, loads, batches\
+        of those) are then resent up to retries times, other requests raise RequestTimeoutError right away.
+
+        :param port: The port that the webgme zmq-server listens on (or its full address, e.g. ipc://..., as passed\
+        to python plugins by the plugin launcher).
         :type port: int or str
         :param logger: Optional logger (defaults to DEBUG console logger)
         :param address: If given the port is not used and the zmq client will connect to the address.
         :type address: str
+        :param codec: Name of codec to encode messages with, 'json', 'orjson' or 'msgpack'. If not given the\
+        fastest installed codec supported by the server is used.
+        :type codec: str
+        :param timeout: Seconds to wait for each response, None waits forever. See also the timeout method.
+        :type timeout: float
+        :param retries: Number of times a read-only request is resent after timing out.
+        :type retries: int
+        :param context: Optional zmq.Context to create the socket from (a new context is created by default).
+        :type context: zmq.Context
+        :param compression: Name of compression for large message bodies, 'zstd' or 'zlib'. If not given the best\
+        installed compression supported by the server is used, pass False to disable compression. zstd is only\
+        supported by servers running on node 22.15 or later.
+        :type compression: str or bool
+        :param compression_threshold: Minimum size in bytes of request bodies to compress (the server applies its\
+        own threshold to responses).
+        :type compression_threshold: int
+        :param compact_nodes: Let the server send lists of nodes with the rootId once and front coded paths (they\
+        are expanded to regular node dicts on receipt).
+        :type compact_nodes: bool
+        :param session_key: Key sent along with each request, a server started with --workers handles all requests\
+        with the same key at the same worker (where the roots were loaded). Defaults to a new random key, pass the\
+        same key to connections sharing loaded roots.
+        :type session_key: str
         """
         if logger:
             self.logger = logger
         else:
-            self.logger = logging.getLogger('webgme')
-            if len(self.logger.handlers) == 0:
-                self.logger.setLevel(logging.DEBUG)
-                handler = logging.StreamHandler(sys.stdout)
-                handler.setLevel(logging.DEBUG)
-                formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-                handler.setFormatter(formatter)
-                self.logger.addHandler(handler)
-
-            self.logger.warning('No logger passed to WebGME - created console logger at DEBUG level.')
-            self.logger.warning('Pass a configured logger to the constructor to suppress DEBUG messages.')
-
-        self._socket = zmq.Context().socket(zmq.REQ)
-        if address is None:
+            self.logger = get_default_logger()
+
+        #: Seconds to wait for each response (None waits forever).
+        self.request_timeout = timeout
+        #: Number of times a read-only request is resent after timing out.
+        self.retries = retries
+
+        self._context = context or zmq.Context()
+        if address is None and '://' in str(port):
+            self._address = port
+        elif address is None:
             self._address = 'tcp://127.0.0.1:{0}'.format(port)
         else:
             self._address = address
 
-        self._socket.connect(self._address)
+        self._connect()
         self.logger.info('Connected to {0}'.format(self._address))
+        self._stats = RPCStats()
+        self._request = None
+        self._request_info = None
+        self._codec = None
+        self._compression = None
+        self._compression_threshold = compression_threshold
+        self._compact_nodes = False
+        self._session_key = session_key or uuid.uuid4().hex
+        self._negotiate_codec(codec, compression, compact_nodes)
         self.core = Core(self)
         self.util = Util(self)
         self.project = Project(self)
@@ -61,34 +190,257 @@ class WebGME(object):
         self._socket.disconnect(self._address)
         self.logger.info('Disconnected from {0}'.format(self._address))
 
-    def send_request(self, payload):
-        self.logger.debug('send_request: {0}'.format(payload))
-        if is_python_3:
-            self._socket.send_string(json.dumps(payload))
+    def _connect(self):
+        self._socket = self._context.socket(zmq.REQ)
+        self._socket.setsockopt(zmq.LINGER, 0)
+        if hasattr(zmq, 'HEARTBEAT_IVL') and zmq.zmq_version_info() >= (4, 2):
+            self._socket.setsockopt(zmq.HEARTBEAT_IVL, _HEARTBEAT_IVL)
+            self._socket.setsockopt(zmq.HEARTBEAT_TIMEOUT, _HEARTBEAT_TIMEOUT)
+
+        self._socket.connect(self._address)
+
+    def _reconnect(self):
+        self._socket.close()
+        self._connect()
+
+    @contextlib.contextmanager
+    def timeout(self, seconds):
+        """
+        Overrides the timeout of the requests sent within the with-block:
+
+        .. code-block:: python
+
+            with webgme.timeout(30):
+                root = webgme.core.load_root(root_hash)
+
+        :param seconds: Seconds to wait for each response, None waits forever.
+        :type seconds: float
+        """
+        previous = self.request_timeout
+        self.request_timeout = seconds
+        try:
+            yield self
+        finally:
+            self.request_timeout = previous
+
+    def ping(self, timeout=1.0):
+        """
+        Sends a heartbeat to the zmq-server (handled without touching the storage or the core).
+
+        :param timeout: Seconds to wait for the response.
+        :type timeout: float
+        :returns: The round-trip time in seconds.
+        :rtype: float
+        :raises RequestTimeoutError: If the server did not respond in time.
+        """
+        start = clock()
+        with self.timeout(timeout):
+            self.send_request({'type': 'util', 'name': 'ping', 'args': []})
+            self.handle_response()
+
+        return clock() - start
+
+    def _negotiate_codec(self, codec_name, compression_name, compact_nodes):
+        if codec_name is None:
+            codecs = [get_codec(name) for name in available_codecs()]
         else:
-            self._socket.send(json.dumps(payload))
+            codecs = [get_codec(codec_name)]
+
+        try:
+            self.send_request({'type': 'util', 'name': 'hello', 'args': [{
+                'codecs': [codec.wire_name for codec in codecs],
+            }]})
+            info = self.handle_response()
+        except JSError:
+            self.logger.info('Server does not support codec negotiation - using plain json messages.')
+            return
+
+        for codec in codecs:
+            if codec.wire_name == info['codec']:
+                self._codec = codec
+                self._header = codec.wire_name.encode('ascii')
+                self.logger.debug('Using codec %s', codec.name)
+                break
+
+        if self._codec is None:
+            return
+
+        header = '{0};k={1}'.format(self._codec.wire_name, self._session_key)
+        if compact_nodes and info.get('nodeLists'):
+            self._compact_nodes = True
+            header += ';n=1'
+
+        if compression_name is not False:
+            if compression_name is None:
+                names = available_compressions()
+            else:
+                names = [get_compression(compression_name).name]
+
+            for name in names:
+                if name in info.get('compressions', []):
+                    self._compression = get_compression(name)
+                    header += ';a={0}'.format(name)
+                    self._compressed_header = '{0};c={1}'.format(header, name).encode('ascii')
+                    self.logger.debug('Using compression %s', name)
+                    break
+            else:
+                self.logger.info('Server does not support compression %s - sending uncompressed messages.', names)
+
+        self._header = header.encode('ascii')
+
+    @property
+    def codec(self):
+        """
+        The codec negotiated with the server (None if the server does not support codec negotiation).
+        """
+        return self._codec
+
+    @property
+    def compression(self):
+        """
+        The compression of large message bodies negotiated with the server (None if not compressing).
+        """
+        return self._compression
+
+    def batch(self):
+        """
+        Creates a new batch of calls that are sent to the zmq-server in one request (and reply) rather than one
+        request per call. Use it as a context manager, the queued calls are sent when the block exits:
+
+        .. code-block:: python
+
+            with webgme.batch() as b:
+                child = b.core.create_child(root, fco)
+                b.core.set_attribute(child, 'name', 'NewChild')
+                name = b.core.get_attribute(child, 'name')
+
+            print(child.result(), name.result())
+
+        :returns: A new batch bound to this instance.
+        :rtype: Batch
+        """
+        return Batch(self)
+
+    def open_project(self, project_name, owner=None):
+        """
+        Opens a session at another project served by the same zmq-server, its core, project and util attributes\
+        work like the ones of this instance but at the other project. This avoids starting one server (and storage\
+        connection) per project when working with many projects:
+
+        .. code-block:: python
+
+            for name in ['ProjectA', 'ProjectB']:
+                with webgme.open_project(name) as session:
+                    branches = session.project.get_branches()
+
+        :param project_name: Name of the project.
+        :type project_name: str
+        :param owner: Owner of the project (defaults to the user of the server).
+        :type owner: str
+        :returns: The session at the project.
+        :rtype: ProjectSession
+        :raises JSError: If the project could not be opened.
+        """
+        return open_project(self, project_name, owner)
+
+    def send_request(self, payload, attachments=None):
+        """
+        Sends a request to the zmq-server, the response must be retrieved with handle_response.
+
+        :param payload: The request with type, name and args.
+        :type payload: dict
+        :param attachments: Binary content sent as separate frames (without copying), referenced from the\
+        payload with {'$bin': <index>}. Requires a negotiated codec.
+        :type attachments: list of bytes
+        """
+        self.logger.debug('send_request: %s', payload)
+        if self._codec is not None:
+            body = self._codec.encode(payload)
+            uncompressed_bytes = len(body)
+            if self._compression is not None and len(body) >= self._compression_threshold:
+                message = [self._compressed_header, self._compression.compress(body)]
+            else:
+                message = [self._header, body]
+            if is_stateless(payload):
+                message[0] += b';s=1'
+            if attachments:
+                message.extend(attachments)
+            request_bytes = sum(len(frame) for frame in message)
+            uncompressed_bytes += request_bytes - len(message[1])
+        else:
+            message = json.dumps(payload)
+            request_bytes = uncompressed_bytes = len(message)
+
+        self._send_message(message)
+        self._request = (payload, message)
+        self._request_info = ('{0}.{1}'.format(payload.get('type'), payload.get('name')), request_bytes,
+                              uncompressed_bytes, clock())
+
+    def _send_message(self, message):
+        if self._codec is not None:
+            self._socket.send_multipart(message, copy=False)
+        elif is_python_3:
+            self._socket.send_string(message)
+        else:
+            self._socket.send(message)
+
+    def _wait_for_response(self):
+        payload, message = self._request
+        method, request_bytes, uncompressed_bytes, start = self._request_info
+        retries = self.retries if is_read_only(payload) else 0
+
+        while self.request_timeout is not None and \
+                self._socket.poll(int(self.request_timeout * 1000), zmq.POLLIN) == 0:
+            self.logger.warning('No response to %s within %ss, reconnecting to %s.', method, self.request_timeout,
+                                self._address)
+            self._reconnect()
+            if retries == 0:
+                self._stats.record(method, clock() - start, request_bytes, 0, True, uncompressed_bytes)
+                raise RequestTimeoutError(method, self.request_timeout)
+
+            retries -= 1
+            self._send_message(message)
 
     def handle_response(self):
-        if is_python_3:
-            raw_res = self._socket.recv_string()
+        self._wait_for_response()
+        if self._codec is not None:
+            frames = self._socket.recv_multipart(copy=False)
+            response_bytes = sum(len(frame) for frame in frames)
+            if b';c=' in frames[0].bytes:
+                body = self._compression.decompress(frames[1].buffer)
+                uncompressed_response_bytes = response_bytes - len(frames[1]) + len(body)
+            else:
+                body = frames[1].buffer
+                uncompressed_response_bytes = response_bytes
+            res = self._codec.decode(body)
+            if len(frames) > 2:
+                res = resolve_attachments(res, frames[2:])
+            if self._compact_nodes and res['err'] is None:
+                res['res'] = expand_node_lists(res.get('res'))
         else:
-            raw_res = self._socket.recv()
-
-        self.logger.debug('handle_response: {0}'.format(raw_res))
-        res = json.loads(raw_res)
-
-        if res['err']:
-            if res['err']['type'] == 'CoreIllegalArgumentError':
-                raise CoreIllegalArgumentError(res['err'])
-            elif res['err']['type'] == 'CoreIllegalOperationError':
-                raise CoreIllegalOperationError(res['err'])
-            elif res['err']['type'] == 'CoreInternalError':
-                raise CoreInternalError(res['err'])
+            if is_python_3:
+                raw_res = self._socket.recv_string()
             else:
-                self.logger.error(res['err'])
-                raise JSError(res['err'])
+                raw_res = self._socket.recv()
 
-        if 'res' in res:
-            return res['res']
-        else:
-            return None
+            response_bytes = uncompressed_response_bytes = len(raw_res)
+            res = json.loads(raw_res)
+
+        self._request = None
+        method, request_bytes, uncompressed_bytes, start = self._request_info
+        self._stats.record(method, clock() - start, request_bytes, response_bytes, bool(res['err']),
+                           uncompressed_bytes + uncompressed_response_bytes)
+        self.logger.debug('handle_response: %s', res)
+
+        return get_result(res, self.logger)
+
+    def stats(self):
+        """
+        Statistics of the requests sent from this instance, per method the number of calls, latencies\
+        and request/response sizes are recorded. Use reset() on the returned object to clear it and\
+        as_dict() or to_json() to export it.
+
+        :returns: The statistics recorded since the connection was made (or last reset).
+        :rtype: RPCStats
+        """
+        return self._stats
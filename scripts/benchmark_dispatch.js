@@ -0,0 +1,87 @@
+/* eslint-env node */
+/* eslint no-console: 0 */
+/**
+ * Micro-benchmark of how many requests per second CoreZMQ handles (decoding and sockets not included, the reply is
+ * encoded as json). The core is an in-memory stand-in so that the numbers reflect the overhead of the dispatching
+ * rather than the work done by the core.
+ *
+ *     node ./scripts/benchmark_dispatch.js [requestsPerMethod]
+ */
+
+const CoreZMQ = require('../src/corezmq');
+const codecs = require('../src/codec');
+
+const REQUESTS = parseInt(process.argv[2], 10) || 100000;
+const CHILDREN = 10;
+
+function createCore() {
+    const nodes = {};
+    const root = {path: '', attributes: {name: 'ROOT'}, children: []};
+
+    nodes[''] = root;
+    for (let i = 0; i < CHILDREN; i += 1) {
+        const child = {path: `/${i}`, attributes: {name: `child${i}`}, children: []};
+        nodes[child.path] = child;
+        root.children.push(child);
+    }
+
+    return {
+        loadRoot: () => Promise.resolve(root),
+        loadByPath: (node, path) => Promise.resolve(nodes[path] || null),
+        loadChildren: node => Promise.resolve(node.children),
+        getPath: node => node.path,
+        getAttribute: (node, name) => node.attributes[name],
+        getChildrenPaths: node => node.children.map(child => child.path),
+        getParent: node => node.path ? root : null,
+    };
+}
+
+const logger = {
+    debug: () => {},
+    info: () => {},
+    warn: () => {},
+    error: () => {},
+};
+
+logger.fork = () => logger;
+
+function run(corezmq, name, args) {
+    const req = {type: 'core', name, args};
+    const start = process.hrtime();
+    let count = 0;
+
+    return new Promise((resolve, reject) => {
+        const next = () => {
+            if (count === REQUESTS) {
+                const elapsed = process.hrtime(start);
+                const seconds = elapsed[0] + elapsed[1] / 1e9;
+                console.log(`${name}: ${Math.round(REQUESTS / seconds)} requests/sec`);
+                resolve();
+                return;
+            }
+
+            count += 1;
+            corezmq.handleRequest(req)
+                .then(res => codecs.encodeMessage({err: null, res}, null))
+                .then(next)
+                .catch(reject);
+        };
+
+        next();
+    });
+}
+
+const corezmq = new CoreZMQ({}, createCore(), logger, {});
+const node = {rootId: '#hash', nodePath: '/1'};
+
+corezmq.handleRequest({type: 'core', name: 'loadRoot', args: ['#hash']})
+    .then(() => run(corezmq, 'getAttribute', [node, 'name']))
+    .then(() => run(corezmq, 'getPath', [node]))
+    .then(() => run(corezmq, 'getParent', [node]))
+    .then(() => run(corezmq, 'getChildrenPaths', [{rootId: '#hash', nodePath: ''}]))
+    .then(() => run(corezmq, 'loadChildren', [{rootId: '#hash', nodePath: ''}]))
+    .then(() => process.exit(0))
+    .catch((err) => {
+        console.error(err);
+        process.exit(1);
+    });
@@ -25,6 +25,22 @@ const PROJECT_EXCLUDES = {
     loadObject: true,
 };
 
+const DISPATCH_TABLE_OUTPUT = './src/coredispatch.js';
+
+// Core functions with node arguments nested in objects (or passed as varargs), these are dispatched by hand.
+const DISPATCH_EXCLUDES = {
+    createNode: true,
+    generateTreeDiff: true,
+    getCommonBase: true,
+    getCommonParent: true,
+    getValidChildrenMetaNodes: true,
+    getValidSetElementsMetaNodes: true,
+    loadRoot: true,
+};
+
+const MUTATING_PREFIXES = ['add', 'apply', 'clear', 'copy', 'create', 'del', 'delete', 'import', 'move', 'remove',
+    'rename', 'set', 'update'];
+
 const fileReadPromises = [];
 
 config.forEach((templateInfo) => {
@@ -64,6 +80,7 @@ docs.forEach((docItem) => {
         exceptions: docItem.exceptions || [],
         args: [],
         returns: docItem.returns || [],
+        async: false,
     };
 
     (docItem.params || []).forEach((arg) => {
@@ -108,6 +125,7 @@ docs.forEach((docItem) => {
                 //     methodData.args.push(nodePathArg);
             } else if (arg.type.names[0] === 'function' && arg.optional === true && arg.name === 'callback') {
                 console.log('Skipping callback arg for ', docItem.longname);
+                methodData.async = true;
             } else {
                 methodData.args.push(arg);
             }
@@ -184,9 +202,76 @@ const typeMaps = {
     }
 };
 
+function getDispatchArgKind(arg) {
+    const names = arg.type.names;
+
+    if (names.indexOf('Array.<module:Core~Node>') > -1) {
+        return 'nodes';
+    } else if (names.indexOf('module:Core~Node') === -1) {
+        return null;
+    } else if (names.indexOf('string') > -1) {
+        return 'nodeOrPath';
+    }
+
+    return names.indexOf('null') > -1 || names.indexOf('undefined') > -1 ? 'node?' : 'node';
+}
+
+function getDispatchResultKind(returns) {
+    const names = returns[0].type.names;
+
+    if (names.indexOf('module:Core~Node') > -1) {
+        return 'node';
+    } else if (names.indexOf('Array.<module:Core~Node>') > -1) {
+        return 'nodes';
+    } else if (names.indexOf('Object.<string, module:Core~Node>') > -1) {
+        return 'nodeDict';
+    } else if (names.indexOf('module:Core~DefinitionInfo') > -1) {
+        return 'definitionInfo';
+    }
+
+    return 'value';
+}
+
+/**
+ * Renders the dispatch table used by src/corezmq.js for the core requests. For each function it records the kind
+ * of every argument (null for plain values), how the result is wrapped, whether it is asynchronous and whether it
+ * (by its name) mutates nodes.
+ */
+function renderDispatchTable(methods) {
+    const lines = methods
+        .filter(methodData => !DISPATCH_EXCLUDES[methodData.name])
+        .map((methodData) => {
+            const args = methodData.args.map(getDispatchArgKind);
+            const mutates = args.some(kind => kind !== null) && MUTATING_PREFIXES.some(prefix =>
+                methodData.name.startsWith(prefix) && /[A-Z]/.test(methodData.name.charAt(prefix.length)));
+
+            return `    ${methodData.name}: {args: [${args.map(kind => kind ? `'${kind}'` : 'null').join(', ')}], ` +
+                `result: '${getDispatchResultKind(methodData.returns)}', async: ${methodData.async}, ` +
+                `mutates: ${mutates}},`;
+        });
+
+    return `/* eslint-env node */
+/**
+ * Dispatch table of the Core functions handled by CoreZMQ - generated by scripts/generate_api.js, do not edit!
+ *
+ * args - the kind of each argument: 'node', 'node?' (nullable), 'nodeOrPath', 'nodes' or null for plain values.
+ * result - 'value', 'node', 'nodes', 'nodeDict' or 'definitionInfo'.
+ * async - the function returns a promise.
+ * mutates - the function modifies (some of) the nodes passed.
+ */
+
+module.exports = {
+${lines.join('\n')}
+};
+`;
+}
+
 Q.all(fileReadPromises)
     .then((templates) => {
-        const promises = [];
+        const promises = [
+            Q.ninvoke(fs, 'writeFile', DISPATCH_TABLE_OUTPUT, renderDispatchTable(data.core))
+                .then(() => console.log(`Wrote out ${DISPATCH_TABLE_OUTPUT}`)),
+        ];
 
         templates.forEach((templateInfo) => {
             const coreStr = ejs.render(templateInfo.core.template, {methods: data.core, Case, typeMaps});
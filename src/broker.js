@@ -0,0 +1,168 @@
+/* eslint-env node */
+/**
+ * Load-balancing broker in front of a number of CoreZMQ workers (each listening with a router socket), used by
+ * bin/corezmq_server.js --workers. Clients connect to the broker as to a single server.
+ *
+ * Roots are loaded at the worker handling the request, so all requests of a session are routed to the same worker.
+ * The session is given by the parameter ";k=<key>" of the header frame (connections sharing roots, e.g. of a
+ * WebGMEPool, pass the same key) or else the identity of the connection. Requests flagged with ";s=1" do not depend
+ * on any loaded state (e.g. project requests) and are routed to the worker with the fewest requests in flight.
+ *
+ * The broker never decodes the bodies, each request is forwarded with a token of the broker's own in place of the
+ * client's routing frames and the reply is routed back by the token.
+ */
+
+const zmq = require('zeromq/v5-compat');
+const Q = require('q');
+
+/**
+ * @param {GmeLogger} mainLogger - Logger that will be forked off from.
+ * @param {object} [opts]
+ * @param {number} [opts.sessionIdleTimeout=3600000] - Sessions not used within this time (ms) are forgotten, i.e. may
+ * be routed to another worker afterwards.
+ * @constructor
+ */
+function Broker(mainLogger, opts) {
+    opts = opts || {};
+    const logger = mainLogger.fork('Broker');
+    const frontend = zmq.socket('router');
+    const workers = [];
+    const sessions = new Map();
+    const pending = new Map();
+    let tokenCounter = 0;
+    let sweepTimer = null;
+
+    function getLeastBusyWorker(sessionCount) {
+        return workers.reduce((best, worker) => {
+            if (sessionCount && worker.sessions !== best.sessions) {
+                return worker.sessions < best.sessions ? worker : best;
+            }
+
+            return worker.inFlight < best.inFlight ? worker : best;
+        });
+    }
+
+    function pickWorker(identity, message) {
+        let key = null;
+
+        if (message.length > 1) {
+            const params = message[0].toString().split(';');
+            if (params.indexOf('s=1') > -1) {
+                return getLeastBusyWorker(false);
+            }
+
+            params.forEach((param) => {
+                if (param.startsWith('k=')) {
+                    key = param.substring(2);
+                }
+            });
+        }
+
+        key = key || identity.toString('hex');
+
+        let session = sessions.get(key);
+        if (!session) {
+            session = {worker: getLeastBusyWorker(true), lastAccess: 0};
+            session.worker.sessions += 1;
+            sessions.set(key, session);
+        }
+
+        session.lastAccess = Date.now();
+
+        return session.worker;
+    }
+
+    function sweepSessions() {
+        const idleTime = Date.now() - (opts.sessionIdleTimeout || 3600000);
+
+        sessions.forEach((session, key) => {
+            if (session.lastAccess < idleTime) {
+                session.worker.sessions -= 1;
+                sessions.delete(key);
+            }
+        });
+    }
+
+    function connectWorker(address) {
+        const worker = {
+            address,
+            socket: zmq.socket('dealer'),
+            inFlight: 0,
+            sessions: 0,
+        };
+
+        worker.socket.on('message', (token, ...reply) => {
+            const request = pending.get(token.toString());
+
+            if (!request) {
+                logger.warn('Dropping reply with unknown token from', address);
+                return;
+            }
+
+            pending.delete(token.toString());
+            worker.inFlight -= 1;
+            frontend.send(request.envelope.concat(reply));
+        });
+
+        worker.socket.connect(address);
+        workers.push(worker);
+    }
+
+    /**
+     * Connects to the workers and binds the frontend socket.
+     * @param {string} address - The address to listen at, e.g. tcp://127.0.0.1:5555 (with port * an available port
+     * is picked).
+     * @param {string[]} workerAddresses
+     * @returns {external:Promise} Resolves with the address listened at.
+     */
+    this.start = (address, workerAddresses) => {
+        workerAddresses.forEach(connectWorker);
+
+        frontend.on('message', (...frames) => {
+            // [identity, '', ...] from REQ and [identity, requestId, ...] from DEALER clients.
+            const envelope = frames.slice(0, 2);
+            const message = frames.slice(2);
+            const worker = pickWorker(frames[0], message);
+
+            tokenCounter += 1;
+            const token = String(tokenCounter);
+            pending.set(token, {envelope});
+            worker.inFlight += 1;
+            worker.socket.send([token].concat(message));
+        });
+
+        sweepTimer = setInterval(sweepSessions, 60000);
+        sweepTimer.unref();
+
+        return Q.ninvoke(frontend, 'bind', address)
+            .then(() => {
+                logger.info('Routing', address, 'to', workerAddresses.length, 'workers');
+                return frontend.getsockopt(zmq.ZMQ_LAST_ENDPOINT).toString();
+            });
+    };
+
+    /**
+     * @returns {object[]} Per worker its address, the number of requests in flight and sessions routed to it.
+     */
+    this.getStats = () => {
+        return workers.map((worker) => {
+            return {
+                address: worker.address,
+                inFlight: worker.inFlight,
+                sessions: worker.sessions,
+            };
+        });
+    };
+
+    this.stop = () => {
+        clearInterval(sweepTimer);
+        frontend.close();
+        workers.forEach((worker) => {
+            worker.socket.close();
+        });
+
+        return Q();
+    };
+}
+
+module.exports = Broker;
@@ -0,0 +1,95 @@
+/* eslint-env node */
+/**
+ * Buffered stream of chunks pulled by a client one request at a time. The chunks are produced ahead of the
+ * requests but at most window chunks are buffered, so a slow consumer does not make the server hold the
+ * entire result.
+ */
+
+const Q = require('q');
+
+/**
+ * @param {function} produce - Returns a promise resolving with the next chunk (array) or null when exhausted.
+ * @param {number} window - The maximum number of chunks to buffer.
+ * @constructor
+ */
+function ChunkStream(produce, window) {
+    this.produce = produce;
+    this.window = Math.max(window || 1, 1);
+    this.buffer = [];
+    this.exhausted = false;
+    this.error = null;
+    this.producing = false;
+    this.waiting = null;
+    this.lastAccess = Date.now();
+
+    this._pump();
+}
+
+ChunkStream.prototype._pump = function () {
+    if (this.producing || this.exhausted || this.error || this.buffer.length >= this.window) {
+        return;
+    }
+
+    this.producing = true;
+    Q(this.produce())
+        .then((chunk) => {
+            this.producing = false;
+            if (chunk === null) {
+                this.exhausted = true;
+            } else {
+                this.buffer.push(chunk);
+            }
+
+            this._notify();
+            this._pump();
+        })
+        .catch((err) => {
+            this.producing = false;
+            this.error = err;
+            this._notify();
+        });
+};
+
+ChunkStream.prototype._notify = function () {
+    if (this.waiting) {
+        const deferred = this.waiting;
+        this.waiting = null;
+        deferred.resolve();
+    }
+};
+
+/**
+ * Takes the next chunk from the buffer (waiting for it to be produced if needed).
+ * @param {number} [window] - Updated number of chunks the client allows to be buffered.
+ * @returns {Promise<{chunk: Array, done: boolean}>}
+ */
+ChunkStream.prototype.next = function (window) {
+    this.lastAccess = Date.now();
+    if (typeof window === 'number') {
+        this.window = Math.max(window, 1);
+    }
+
+    if (this.buffer.length > 0) {
+        const chunk = this.buffer.shift();
+        this._pump();
+        return Q({chunk, done: this.isDone()});
+    } else if (this.error) {
+        return Q.reject(this.error);
+    } else if (this.exhausted) {
+        return Q({chunk: [], done: true});
+    }
+
+    this.waiting = Q.defer();
+    this._pump();
+
+    return this.waiting.promise.then(() => this.next());
+};
+
+/**
+ * @returns {boolean} True if all chunks have been taken.
+ */
+ChunkStream.prototype.isDone = function () {
+    return this.exhausted && this.buffer.length === 0;
+};
+
+module.exports = ChunkStream;
@@ -0,0 +1,192 @@
+/* eslint-env node */
+/**
+ * Codecs for the messages exchanged with the clients. Plain json is always available and MessagePack
+ * is available if the optional dependency @msgpack/msgpack is installed.
+ *
+ * A message is either a single json frame (clients that don't negotiate a codec) or
+ * the frames [header, body, ...attachments] where the header is the name of the codec used for the body.
+ * Attachments are binary contents referenced from the body with placeholders {$bin: <index>}.
+ * The header may carry parameters after the codec name for the compression of the body (see ./compression) and
+ * ";n=1" if the client accepts compact node lists (see compactNodeLists).
+ * The response is always encoded the same way as the request.
+ */
+
+const compressions = require('./compression');
+
+const CODECS = {
+    json: {
+        name: 'json',
+        binary: false,
+        encode: payload => JSON.stringify(payload),
+        decode: data => JSON.parse(data.toString()),
+    },
+};
+
+try {
+    const msgpack = require('@msgpack/msgpack');
+
+    CODECS.msgpack = {
+        name: 'msgpack',
+        binary: true,
+        encode: (payload) => {
+            const data = msgpack.encode(payload);
+            return Buffer.from(data.buffer, data.byteOffset, data.byteLength);
+        },
+        decode: data => msgpack.decode(data),
+    };
+} catch (e) {
+    // MessagePack is an optional dependency.
+}
+
+/**
+ * Picks the first of the codecs preferred by the client that is supported here.
+ * @param {string[]} preferred - Names of codecs in the order preferred by the client.
+ * @returns {string} The name of the codec (json if none of the preferred are available).
+ */
+function negotiate(preferred) {
+    const names = (preferred || []).filter(name => CODECS.hasOwnProperty(name));
+
+    return names.length > 0 ? names[0] : CODECS.json.name;
+}
+
+/**
+ * Decodes the frames of a request.
+ * @param {Buffer[]} frames
+ * @returns {{codec: object|null, compression: object|null, compactNodes: boolean, payload: object,
+ * attachments: Buffer[]}} The codec is null for plain (single frame) json requests, the compression is the one
+ * accepted by the client for the response.
+ */
+function decodeMessage(frames) {
+    if (frames.length === 1) {
+        return {
+            codec: null,
+            compression: null,
+            compactNodes: false,
+            payload: CODECS.json.decode(frames[0]),
+            attachments: [],
+        };
+    }
+
+    const params = frames[0].toString().split(';');
+    const codecName = params.shift();
+    const codec = CODECS[codecName];
+    let compression = null;
+    let compactNodes = false;
+    let body = frames[1];
+
+    if (!codec) {
+        throw new Error(`Unsupported codec [${codecName}]`);
+    }
+
+    params.forEach((param) => {
+        const value = param.substring(2);
+        if (param.startsWith('c=')) {
+            body = compressions.getCompression(value).decompress(body);
+        } else if (param.startsWith('a=') && compressions.COMPRESSIONS.hasOwnProperty(value)) {
+            compression = compressions.COMPRESSIONS[value];
+        } else if (param === 'n=1') {
+            compactNodes = true;
+        }
+    });
+
+    return {
+        codec,
+        compression,
+        compactNodes,
+        payload: codec.decode(body),
+        attachments: frames.slice(2),
+    };
+}
+
+/**
+ * Encodes the payload of a response with the same codec as the request was encoded.
+ * @param {object} payload
+ * @param {object|null} codec
+ * @param {Buffer[]} [attachments] - Binary contents referenced from the payload (requires a codec).
+ * @param {object|null} [compression] - Compression accepted by the client.
+ * @param {number} [threshold=compressions.DEFAULT_THRESHOLD] - Minimum size of the body to compress it (0 compresses
+ * every body).
+ * @returns {string|Array}
+ */
+function encodeMessage(payload, codec, attachments, compression, threshold) {
+    if (!codec) {
+        return CODECS.json.encode(payload);
+    }
+
+    let header = codec.name;
+    let body = codec.encode(payload);
+
+    if (compression && body.length >= (threshold === undefined ? compressions.DEFAULT_THRESHOLD : threshold)) {
+        header += `;c=${compression.name}`;
+        body = compression.compress(body);
+    }
+
+    const frames = [header, body];
+
+    return attachments && attachments.length > 0 ? frames.concat(attachments) : frames;
+}
+
+function isNodeWrapper(value) {
+    return value !== null && typeof value === 'object' && typeof value.rootId === 'string' &&
+        typeof value.nodePath === 'string' && Object.keys(value).length === 2;
+}
+
+/**
+ * Replaces arrays of (at least two) node wrappers from the same root with {$nl: [rootId, paths]}, where paths is
+ * front coded: [prefixLength0, suffix0, prefixLength1, suffix1, ...] with the prefix length shared with the
+ * previous path. Only the value itself and its members down to the given depth are inspected.
+ * @param {*} value
+ * @param {number} depth
+ * @returns {*}
+ */
+function compactNodeLists(value, depth) {
+    if (Array.isArray(value)) {
+        if (value.length > 1 && isNodeWrapper(value[0])) {
+            const rootId = value[0].rootId;
+            const paths = new Array(value.length * 2);
+            let prevPath = '';
+            let i;
+
+            for (i = 0; i < value.length; i += 1) {
+                if (!isNodeWrapper(value[i]) || value[i].rootId !== rootId) {
+                    break;
+                }
+
+                const path = value[i].nodePath;
+                const maxLength = Math.min(path.length, prevPath.length);
+                let prefixLength = 0;
+
+                while (prefixLength < maxLength && path[prefixLength] === prevPath[prefixLength]) {
+                    prefixLength += 1;
+                }
+
+                paths[i * 2] = prefixLength;
+                paths[i * 2 + 1] = path.substring(prefixLength);
+                prevPath = path;
+            }
+
+            if (i === value.length) {
+                return {$nl: [rootId, paths]};
+            }
+        }
+
+        return depth > 0 ? value.map(item => compactNodeLists(item, depth - 1)) : value;
+    } else if (depth > 0 && value !== null && typeof value === 'object' && value.constructor === Object) {
+        const result = {};
+        Object.keys(value).forEach((key) => {
+            result[key] = compactNodeLists(value[key], depth - 1);
+        });
+
+        return result;
+    }
+
+    return value;
+}
+
+module.exports = {
+    compactNodeLists,
+    CODECS,
+    negotiate,
+    decodeMessage,
+    encodeMessage,
+};
@@ -0,0 +1,48 @@
+/* eslint-env node */
+/**
+ * Compression of message bodies. zlib is always available and zstd if the node version provides it
+ * (zlib.zstdCompressSync, node 22.15+).
+ *
+ * A client announces which compression it accepts for responses by adding ";a=<name>" to the header frame
+ * and a compressed body is flagged with ";c=<name>" in the header, e.g. "msgpack;a=zstd;c=zstd".
+ * Only bodies of at least the threshold size are compressed, attachments are sent as is.
+ */
+
+const zlib = require('zlib');
+
+const DEFAULT_THRESHOLD = 4096;
+
+const COMPRESSIONS = {
+    zlib: {
+        name: 'zlib',
+        compress: data => zlib.deflateSync(data, {level: 1}),
+        decompress: data => zlib.inflateSync(data),
+    },
+};
+
+if (typeof zlib.zstdCompressSync === 'function') {
+    COMPRESSIONS.zstd = {
+        name: 'zstd',
+        compress: data => zlib.zstdCompressSync(data),
+        decompress: data => zlib.zstdDecompressSync(data),
+    };
+}
+
+/**
+ * @param {string} name
+ * @returns {object} The compression.
+ * @throws {Error} If the compression is not available.
+ */
+function getCompression(name) {
+    if (!COMPRESSIONS.hasOwnProperty(name)) {
+        throw new Error(`Unsupported compression [${name}]`);
+    }
+
+    return COMPRESSIONS[name];
+}
+
+module.exports = {
+    COMPRESSIONS,
+    DEFAULT_THRESHOLD,
+    getCompression,
+};
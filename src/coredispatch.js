@@ -0,0 +1,196 @@
+/* eslint-env node */
+/**
+ * Dispatch table of the Core functions handled by CoreZMQ - generated by scripts/generate_api.js, do not edit!
+ *
+ * args - the kind of each argument: 'node', 'node?' (nullable), 'nodeOrPath', 'nodes' or null for plain values.
+ * result - 'value', 'node', 'nodes', 'nodeDict' or 'definitionInfo'.
+ * async - the function returns a promise.
+ * mutates - the function modifies (some of) the nodes passed.
+ */
+
+module.exports = {
+    addLibrary: {args: ['node', null, null, null], result: 'value', async: true, mutates: true},
+    addMember: {args: ['node', null, 'node'], result: 'value', async: false, mutates: true},
+    addMixin: {args: ['node', null], result: 'value', async: false, mutates: true},
+    applyResolution: {args: [null], result: 'value', async: false, mutates: false},
+    applyTreeDiff: {args: ['node', null], result: 'value', async: true, mutates: true},
+    canSetAsMixin: {args: ['node', null], result: 'value', async: false, mutates: false},
+    clearMetaRules: {args: ['node'], result: 'value', async: false, mutates: true},
+    clearMixins: {args: ['node'], result: 'value', async: false, mutates: true},
+    copyNode: {args: ['node', 'node'], result: 'node', async: false, mutates: true},
+    copyNodes: {args: ['nodes', 'node'], result: 'nodes', async: false, mutates: true},
+    createChild: {args: ['node', 'node'], result: 'node', async: false, mutates: true},
+    createSet: {args: ['node', null], result: 'value', async: false, mutates: true},
+    delAspectMeta: {args: ['node', null], result: 'value', async: false, mutates: true},
+    delAspectMetaTarget: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    delAttribute: {args: ['node', null], result: 'value', async: false, mutates: true},
+    delAttributeMeta: {args: ['node', null], result: 'value', async: false, mutates: true},
+    delChildMeta: {args: ['node', null], result: 'value', async: false, mutates: true},
+    delConstraint: {args: ['node', null], result: 'value', async: false, mutates: true},
+    delMember: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    delMemberAttribute: {args: ['node', null, null, null], result: 'value', async: false, mutates: true},
+    delMemberRegistry: {args: ['node', null, null, null], result: 'value', async: false, mutates: true},
+    delMixin: {args: ['node', null], result: 'value', async: false, mutates: true},
+    delPointer: {args: ['node', null], result: 'value', async: false, mutates: true},
+    delPointerMeta: {args: ['node', null], result: 'value', async: false, mutates: true},
+    delPointerMetaTarget: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    delRegistry: {args: ['node', null], result: 'value', async: false, mutates: true},
+    delSet: {args: ['node', null], result: 'value', async: false, mutates: true},
+    delSetAttribute: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    delSetRegistry: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    deleteNode: {args: ['node'], result: 'value', async: false, mutates: true},
+    deletePointer: {args: ['node', null], result: 'value', async: false, mutates: true},
+    deleteSet: {args: ['node', null], result: 'value', async: false, mutates: true},
+    getAllMetaNodes: {args: ['node'], result: 'nodeDict', async: false, mutates: false},
+    getAspectDefinitionInfo: {args: ['node', null, 'node'], result: 'definitionInfo', async: false, mutates: false},
+    getAspectDefinitionOwner: {args: ['node', null], result: 'node', async: false, mutates: false},
+    getAspectMeta: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getAttribute: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getAttributeDefinitionOwner: {args: ['node', null], result: 'node', async: false, mutates: false},
+    getAttributeMeta: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getAttributeNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getBase: {args: ['node'], result: 'node', async: false, mutates: false},
+    getBaseRoot: {args: ['node'], result: 'node', async: false, mutates: false},
+    getBaseType: {args: ['node'], result: 'node', async: false, mutates: false},
+    getBaseTypes: {args: ['node'], result: 'nodes', async: false, mutates: false},
+    getChildDefinitionInfo: {args: ['node', 'node'], result: 'definitionInfo', async: false, mutates: false},
+    getChildrenHashes: {args: ['node'], result: 'value', async: false, mutates: false},
+    getChildrenMeta: {args: ['node'], result: 'value', async: false, mutates: false},
+    getChildrenPaths: {args: ['node'], result: 'value', async: false, mutates: false},
+    getChildrenRelids: {args: ['node'], result: 'value', async: false, mutates: false},
+    getClosureInformation: {args: ['nodes'], result: 'value', async: false, mutates: false},
+    getCollectionNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getCollectionPaths: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getConstraint: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getConstraintNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getFCO: {args: ['node'], result: 'node', async: false, mutates: false},
+    getFullyQualifiedName: {args: ['node'], result: 'value', async: false, mutates: false},
+    getGuid: {args: ['node'], result: 'value', async: false, mutates: false},
+    getHash: {args: ['node'], result: 'value', async: false, mutates: false},
+    getInstancePaths: {args: ['node'], result: 'value', async: false, mutates: false},
+    getJsonMeta: {args: ['node'], result: 'value', async: false, mutates: false},
+    getLibraryGuid: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getLibraryInfo: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getLibraryMetaNodes: {args: ['node', null, null], result: 'nodes', async: false, mutates: false},
+    getLibraryNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getLibraryRoot: {args: ['node', null], result: 'node', async: false, mutates: false},
+    getMemberAttribute: {args: ['node', null, null, null], result: 'value', async: false, mutates: false},
+    getMemberAttributeNames: {args: ['node', null, null], result: 'value', async: false, mutates: false},
+    getMemberOwnAttribute: {args: ['node', null, null, null], result: 'value', async: false, mutates: false},
+    getMemberOwnAttributeNames: {args: ['node', null, null], result: 'value', async: false, mutates: false},
+    getMemberOwnRegistry: {args: ['node', null, null, null], result: 'value', async: false, mutates: false},
+    getMemberOwnRegistryNames: {args: ['node', null, null], result: 'value', async: false, mutates: false},
+    getMemberPaths: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getMemberRegistry: {args: ['node', null, null, null], result: 'value', async: false, mutates: false},
+    getMemberRegistryNames: {args: ['node', null, null], result: 'value', async: false, mutates: false},
+    getMetaType: {args: ['node'], result: 'node', async: false, mutates: false},
+    getMixinErrors: {args: ['node'], result: 'value', async: false, mutates: false},
+    getMixinNodes: {args: ['node'], result: 'nodeDict', async: false, mutates: false},
+    getMixinPaths: {args: ['node'], result: 'value', async: false, mutates: false},
+    getNamespace: {args: ['node'], result: 'value', async: false, mutates: false},
+    getOwnAttribute: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getOwnAttributeNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getOwnChildrenPaths: {args: ['node'], result: 'value', async: false, mutates: false},
+    getOwnChildrenRelids: {args: ['node'], result: 'value', async: false, mutates: false},
+    getOwnConstraintNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getOwnJsonMeta: {args: ['node'], result: 'value', async: false, mutates: false},
+    getOwnMemberPaths: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getOwnPointerNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getOwnPointerPath: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getOwnRegistry: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getOwnRegistryNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getOwnSetAttribute: {args: ['node', null, null], result: 'value', async: false, mutates: false},
+    getOwnSetAttributeNames: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getOwnSetNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getOwnSetRegistry: {args: ['node', null, null], result: 'value', async: false, mutates: false},
+    getOwnSetRegistryNames: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getOwnValidAspectNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getOwnValidAspectTargetPaths: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getOwnValidAttributeNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getOwnValidPointerNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getOwnValidSetNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getOwnValidTargetPaths: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getParent: {args: ['node'], result: 'node', async: false, mutates: false},
+    getPath: {args: ['node'], result: 'value', async: false, mutates: false},
+    getPointerDefinitionInfo: {args: ['node', null, 'node'], result: 'definitionInfo', async: false, mutates: false},
+    getPointerMeta: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getPointerNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getPointerPath: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getRegistry: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getRegistryNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getRelid: {args: ['node'], result: 'value', async: false, mutates: false},
+    getRoot: {args: ['node'], result: 'node', async: false, mutates: false},
+    getSetAttribute: {args: ['node', null, null], result: 'value', async: false, mutates: false},
+    getSetAttributeNames: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getSetDefinitionInfo: {args: ['node', null, 'node'], result: 'definitionInfo', async: false, mutates: false},
+    getSetNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getSetRegistry: {args: ['node', null, null], result: 'value', async: false, mutates: false},
+    getSetRegistryNames: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getTypeRoot: {args: ['node'], result: 'node', async: false, mutates: false},
+    getValidAspectNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getValidAspectTargetPaths: {args: ['node', null], result: 'value', async: false, mutates: false},
+    getValidAttributeNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getValidChildrenPaths: {args: ['node'], result: 'value', async: false, mutates: false},
+    getValidPointerNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getValidSetNames: {args: ['node'], result: 'value', async: false, mutates: false},
+    getValidTargetPaths: {args: ['node', null], result: 'value', async: false, mutates: false},
+    importClosure: {args: ['node', null], result: 'value', async: false, mutates: true},
+    isAbstract: {args: ['node'], result: 'value', async: false, mutates: false},
+    isConnection: {args: ['node'], result: 'value', async: false, mutates: false},
+    isEmpty: {args: ['node'], result: 'value', async: false, mutates: false},
+    isFullyOverriddenMember: {args: ['node', null, null], result: 'value', async: false, mutates: false},
+    isInstanceOf: {args: ['node', 'nodeOrPath'], result: 'value', async: false, mutates: false},
+    isLibraryElement: {args: ['node'], result: 'value', async: false, mutates: false},
+    isLibraryRoot: {args: ['node'], result: 'value', async: false, mutates: false},
+    isMemberOf: {args: ['node'], result: 'value', async: false, mutates: false},
+    isMetaNode: {args: ['node'], result: 'value', async: false, mutates: false},
+    isTypeOf: {args: ['node', 'nodeOrPath'], result: 'value', async: false, mutates: false},
+    isValidAspectMemberOf: {args: ['node', 'node', null], result: 'value', async: false, mutates: false},
+    isValidAttributeValueOf: {args: ['node', null, null], result: 'value', async: false, mutates: false},
+    isValidChildOf: {args: ['node', 'node'], result: 'value', async: false, mutates: false},
+    isValidNewBase: {args: ['node', 'node?'], result: 'value', async: false, mutates: false},
+    isValidNewChild: {args: ['node?', 'node?'], result: 'value', async: false, mutates: false},
+    isValidNewParent: {args: ['node', 'node'], result: 'value', async: false, mutates: false},
+    isValidTargetOf: {args: ['node', 'node', null], result: 'value', async: false, mutates: false},
+    loadByPath: {args: ['node', null], result: 'node', async: true, mutates: false},
+    loadChild: {args: ['node', null], result: 'node', async: true, mutates: false},
+    loadChildren: {args: ['node'], result: 'nodes', async: true, mutates: false},
+    loadCollection: {args: ['node', null], result: 'nodes', async: true, mutates: false},
+    loadInstances: {args: ['node'], result: 'nodes', async: true, mutates: false},
+    loadMembers: {args: ['node', null], result: 'nodes', async: true, mutates: false},
+    loadOwnChildren: {args: ['node'], result: 'nodes', async: true, mutates: false},
+    loadOwnMembers: {args: ['node', null], result: 'nodes', async: true, mutates: false},
+    loadOwnSubTree: {args: ['node'], result: 'nodes', async: true, mutates: false},
+    loadPointer: {args: ['node', null], result: 'node', async: true, mutates: false},
+    loadSubTree: {args: ['node'], result: 'nodes', async: true, mutates: false},
+    moveAspectMetaTarget: {args: ['node', 'node', null, null], result: 'value', async: false, mutates: true},
+    moveMember: {args: ['node', null, null, null], result: 'value', async: false, mutates: true},
+    moveNode: {args: ['node', 'node'], result: 'node', async: false, mutates: true},
+    movePointerMetaTarget: {args: ['node', 'node', null, null], result: 'value', async: false, mutates: true},
+    persist: {args: ['node'], result: 'value', async: false, mutates: false},
+    removeLibrary: {args: ['node', null], result: 'value', async: false, mutates: true},
+    renameAttribute: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    renameAttributeMeta: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    renameLibrary: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    renamePointer: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    renameRegistry: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    renameSet: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    setAspectMetaTarget: {args: ['node', null, 'node'], result: 'value', async: false, mutates: true},
+    setAttribute: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    setAttributeMeta: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    setBase: {args: ['node', 'node?'], result: 'value', async: false, mutates: true},
+    setChildMeta: {args: ['node', 'node', null, null], result: 'value', async: false, mutates: true},
+    setChildrenMetaLimits: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    setConstraint: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    setGuid: {args: ['node', null], result: 'value', async: true, mutates: true},
+    setMemberAttribute: {args: ['node', null, null, null, null], result: 'value', async: false, mutates: true},
+    setMemberRegistry: {args: ['node', null, null, null, null], result: 'value', async: false, mutates: true},
+    setPointer: {args: ['node', null, 'node?'], result: 'value', async: false, mutates: true},
+    setPointerMetaLimits: {args: ['node', null, null, null], result: 'value', async: false, mutates: true},
+    setPointerMetaTarget: {args: ['node', null, 'node', null, null], result: 'value', async: false, mutates: true},
+    setRegistry: {args: ['node', null, null], result: 'value', async: false, mutates: true},
+    setSetAttribute: {args: ['node', null, null, null], result: 'value', async: false, mutates: true},
+    setSetRegistry: {args: ['node', null, null, null], result: 'value', async: false, mutates: true},
+    tryToConcatChanges: {args: [null, null], result: 'value', async: false, mutates: false},
+    updateLibrary: {args: ['node', null, null, null], result: 'value', async: true, mutates: true},
+};
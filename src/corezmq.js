@@ -12,7 +12,97 @@
 
 const zmq = require('zeromq/v5-compat');
 const Q = require('q');
+const os = require('os');
+const path = require('path');
+const fs = require('fs');
 const pluginUtil = require('webgme-engine/src/plugin/util');
+const PROJECT_ID_SEP = require('webgme-engine/src/common/storage/constants').PROJECT_ID_SEP;
+const codecs = require('./codec');
+const compressions = require('./compression');
+const ChunkStream = require('./chunkstream');
+const NodeCache = require('./nodecache');
+const RootCache = require('./rootcache');
+const ResponseCache = require('./responsecache');
+const RequestQueue = require('./requestqueue');
+const coreDispatch = require('./coredispatch');
+
+// Core functions after which cached nodes may be stale. Moving, deleting or rebasing a node also changes the
+// inherited children of instances anywhere in the tree (as do libraries and tree diffs), so the entire root is
+// dropped from the cache. Copies only add nodes below the parent (second argument).
+const NODE_CACHE_INVALIDATIONS = {
+    moveNode: 'root',
+    deleteNode: 'root',
+    setBase: 'root',
+    applyTreeDiff: 'root',
+    addLibrary: 'root',
+    updateLibrary: 'root',
+    removeLibrary: 'root',
+    renameLibrary: 'root',
+    copyNode: 'parent',
+    copyNodes: 'parent',
+    deleteNodes: 'nodes',
+};
+
+// Requests, besides the mutating core functions of the dispatch table, that modify the roots they access.
+const EXCLUSIVE_REQUESTS = {
+    loadRoot: true,
+    createNode: true,
+    createNodes: true,
+    setAttributes: true,
+    setRegistries: true,
+    setPointers: true,
+    deleteNodes: true,
+    save: true,
+    unloadRoot: true,
+};
+
+// Fields of the records of describeNodes when the request gives none.
+const DEFAULT_DESCRIBE_FIELDS = {attributes: true, pointers: true, base: true, guid: true, childrenPaths: true};
+
+// Fields of describeNodes holding a value per name, the core functions giving the names and the value at a name.
+const DESCRIBE_NAMED_FIELDS = {
+    attributes: ['getAttributeNames', 'getAttribute'],
+    ownAttributes: ['getOwnAttributeNames', 'getOwnAttribute'],
+    registry: ['getRegistryNames', 'getRegistry'],
+    ownRegistry: ['getOwnRegistryNames', 'getOwnRegistry'],
+    pointers: ['getPointerNames', 'getPointerPath'],
+    ownPointers: ['getOwnPointerNames', 'getOwnPointerPath'],
+    sets: ['getSetNames', 'getMemberPaths'],
+};
+
+// Fields of describeNodes given by a core function of the node alone, the nodes are given as node wrappers.
+const DESCRIBE_VALUE_FIELDS = {
+    guid: 'getGuid',
+    hash: 'getHash',
+    childrenPaths: 'getChildrenPaths',
+    fullyQualifiedName: 'getFullyQualifiedName',
+};
+
+const DESCRIBE_NODE_FIELDS = {
+    base: 'getBase',
+    metaType: 'getMetaType',
+};
+
+// Requests, besides the mutating core functions of the dispatch table, rejected by a read-only server.
+const MUTATING_REQUESTS = {
+    core: {
+        createNode: true,
+        createNodes: true,
+        setAttributes: true,
+        setRegistries: true,
+        setPointers: true,
+        deleteNodes: true,
+    },
+    project: {
+        createBranch: true,
+        createTag: true,
+        deleteBranch: true,
+        deleteTag: true,
+        setBranchHash: true,
+        makeCommit: true,
+    },
+    util: {save: true},
+};
 
 /**
  *
@@ -20,23 +110,165 @@ const pluginUtil = require('webgme-engine/src/plugin/util');
  * @param {Core} core - A core instance that requested are proxyed to.
  * @param {GmeLogger} mainLogger - Logger that will be forked off from.
  * @param {object} [opts] - Optional options.
- * @param {number} [opts.port=5555] - Port number of which to bind the server listener.
+ * @param {number} [opts.port=5555] - Port number of which to bind the server listener. If 0 an available port is
+ * picked by the os (and startServer resolves with it).
  * @param {number} [opts.portAttempts=100] - Number of attempts to increase port number while occupied.
  * @param {string} [opts.address] - If given the port is not used and the server will listen at the given address.
+ * @param {boolean} [opts.ipc=false] - If true (and no address given) the server listens at a unique ipc:// address
+ * in the tmp directory (not supported on windows).
+ * @param {string} [opts.socketType='rep'] - 'rep' handles one request at a time, 'router' accepts requests from
+ * both REQ and DEALER clients and handles them as they arrive (DEALER clients prefix each request with an id frame).
+ * Requests at the same root are kept in order when one of them mutates it, read-only requests run concurrently.
+ * @param {number} [opts.maxInFlight=64] - Maximum number of requests handled at the same time by a router socket.
+ * @param {number} [opts.compressionThreshold=4096] - Minimum size in bytes of reply bodies to compress (when the
+ * client accepts compression).
+ * @param {number} [opts.streamIdleTimeout=60000] - Streams not pulled from within this time (ms) are closed when
+ * the next stream is opened.
+ * @param {boolean|number} [opts.prefetchOnLoadRoot=false] - Prefetch the tree of every loaded root in the background,
+ * a number limits the depth.
+ * @param {number} [opts.nodeCacheSize=10000] - Maximum number of loaded nodes cached per root (0 disables the cache).
+ * @param {number} [opts.maxRoots=0] - Maximum number of loaded roots, the least recently used roots without
+ * modifications are evicted when exceeded and reloaded from their hash when accessed again (0 for no limit).
+ * @param {number} [opts.maxHeapUsed=0] - Heap used (bytes) above which unmodified roots are evicted as new roots are
+ * loaded (0 for no limit).
+ * @param {function} [opts.openProject] - Opens another project by its id, resolving with {project, core, [close]}.
+ * If given, clients can open sessions at other projects (util openProject) and requests carrying their projectId are
+ * handled by a CoreZMQ (without socket) of its own for the project.
+ * @param {number} [opts.maxProjects=16] - Maximum number of other projects kept open, the least recently used is
+ * closed when exceeded.
+ * @param {number} [opts.projectIdleTimeout=600000] - Other projects not used within this time (ms) are closed.
+ * @param {boolean} [opts.readOnly=false] - Reject all requests modifying the roots or the project. As nothing can
+ * change, the results of the core functions are then cached per root (rootId) and arguments, and identical requests
+ * in flight share the computation.
+ * @param {number} [opts.responseCacheSize=67108864] - Maximum size in bytes (estimated as json) of the results
+ * cached in read-only mode.
+ * @param {boolean} [opts.debug=false] - Log every request and response at debug level (also enabled by a set DEBUG
+ * environment variable).
  * @param {string} [opts.namespace=''] - Namespace the meta should
  * @param {PluginBase} [opts.plugin] - Optional plugin-instance when running from a plugin.
  */
 function CoreZMQ(project, core, mainLogger, opts) {
-    const responder = zmq.socket('rep');
-    const roots = {};
-    const logger = mainLogger.fork('CoreZMQ');
     opts = opts || {};
+    const socketType = opts.socketType || 'rep';
+    let responder = null;
+    let requestQueue = null;
+    const rootCache = new RootCache(opts.maxRoots, opts.maxHeapUsed);
+    const reloadingRoots = {};
+    const responseCache = opts.readOnly ? new ResponseCache(opts.responseCacheSize) : null;
+    const nodeCache = new NodeCache(opts.nodeCacheSize);
+    const streams = {};
+    let streamCounter = 0;
+    const prefetches = {};
+    let prefetchCounter = 0;
+    const projectSessions = {};
+    let projectSweepTimer = null;
+    const logger = mainLogger.fork('CoreZMQ');
+    // Formatting every message is expensive, so only do it when it can end up anywhere.
+    const debugEnabled = opts.debug === true || !!process.env.DEBUG;
 
     const plugin = opts.plugin;
 
-    const initialPort = opts.port || 5555;
+    const initialPort = typeof opts.port === 'number' ? opts.port : 5555;
     const portAttempts = opts.portAttempts || 100;
-    const address = opts.address;
+    const ipcPath = !opts.address && opts.ipc ?
+        path.join(os.tmpdir(), `webgme-corezmq-${process.pid}-${Math.random().toString(36).substr(2)}.ipc`) : null;
+    const address = ipcPath ? `ipc://${ipcPath}` : opts.address;
+
+    function addRoot(rootId, rootNode) {
+        rootCache.set(rootId, rootNode)
+            .forEach((evictedId) => {
+                logger.debug('Evicted root', evictedId);
+                nodeCache.clear(evictedId);
+            });
+    }
+
+    /**
+     * Loads an evicted root again from its hash (once for concurrent requests).
+     * @param {string} rootId
+     * @returns {external:Promise}
+     */
+    function reloadRoot(rootId) {
+        if (!reloadingRoots[rootId]) {
+            reloadingRoots[rootId] = core.loadRoot(rootId)
+                .then((rootNode) => {
+                    delete reloadingRoots[rootId];
+                    if (rootCache.isEvicted(rootId)) {
+                        addRoot(rootId, rootNode);
+                    }
+
+                    return rootNode;
+                }, (err) => {
+                    delete reloadingRoots[rootId];
+                    throw err;
+                });
+        }
+
+        return reloadingRoots[rootId];
+    }
+
+    /**
+     * Marks the roots of the nodes as modified, which keeps them from being evicted.
+     * @param {object[]} nodeWrappers
+     * @param {object[]} nodes - The nodes resolved from the wrappers.
+     */
+    function markRootsDirty(nodeWrappers, nodes) {
+        for (let i = 0; i < nodeWrappers.length; i += 1) {
+            if (nodes[i] && rootCache.markDirty(nodeWrappers[i].rootId, core.getRoot(nodes[i]))) {
+                nodeCache.clear(nodeWrappers[i].rootId);
+            }
+        }
+    }
+
+    /**
+     * Retrieves a node without loading it, i.e. if it is a root or in the node cache.
+     * @param {object} nodeWrapper
+     * @param {string} nodeWrapper.rootId
+     * @param {string} nodeWrapper.nodePath
+     * @returns {object|undefined} The node or undefined if it needs to be loaded (or its root reloaded).
+     * @throws {Error} If the root is not loaded.
+     */
+    const getLoadedNode = (nodeWrapper) => {
+        const rootNode = rootCache.get(nodeWrapper.rootId);
+        if (!rootNode) {
+            if (rootCache.isEvicted(nodeWrapper.rootId)) {
+                return undefined;
+            }
+
+            throw new Error(`No root loaded at rootId: [${nodeWrapper.rootId}]!`);
+        }
+
+        return nodeWrapper.nodePath ? nodeCache.get(nodeWrapper.rootId, nodeWrapper.nodePath) : rootNode;
+    };
+
+    /**
+     * Loads a node not retrieved by getLoadedNode, i.e. without looking it up (again) in the node cache.
+     * @param {object} nodeWrapper
+     * @param {string} nodeWrapper.rootId
+     * @param {string} nodeWrapper.nodePath
+     * @returns {external:Promise}
+     */
+    const loadNode = (nodeWrapper) => {
+        const rootNode = rootCache.get(nodeWrapper.rootId);
+        if (!rootNode) {
+            if (!rootCache.isEvicted(nodeWrapper.rootId)) {
+                // Unloaded by the client while reloading.
+                return Q.reject(new Error(`No root loaded at rootId: [${nodeWrapper.rootId}]!`));
+            }
+
+            // The cached nodes of an evicted root are cleared, so the node is loaded from the reloaded root.
+            return reloadRoot(nodeWrapper.rootId)
+                .then(reloaded => nodeWrapper.nodePath ? loadNode(nodeWrapper) : reloaded);
+        }
+
+        return core.loadByPath(rootNode, nodeWrapper.nodePath)
+            .then((node) => {
+                if (node) {
+                    nodeCache.set(nodeWrapper.rootId, nodeWrapper.nodePath, node);
+                }
+
+                return node;
+            });
+    };
 
     /**
      * Retrieves a node by loading it.
@@ -46,14 +278,32 @@ function CoreZMQ(project, core, mainLogger, opts) {
      * @returns {external:Promise}
      */
     const getNode = (nodeWrapper) => {
-        const rootNode = roots[nodeWrapper.rootId];
-        if (!rootNode) {
-            return Q.reject(new Error(`No root loaded at rootId: [${nodeWrapper.rootId}]!`));
+        let loadedNode;
+        try {
+            loadedNode = getLoadedNode(nodeWrapper);
+        } catch (e) {
+            return Q.reject(e);
         }
 
-        return core.loadByPath(rootNode, nodeWrapper.nodePath);
+        return loadedNode ? Q(loadedNode) : loadNode(nodeWrapper);
     };
 
+    function invalidateNodeCache(req) {
+        switch (NODE_CACHE_INVALIDATIONS[req.name]) {
+            case 'root':
+                nodeCache.clear(req.args[0].rootId);
+                break;
+            case 'parent':
+                nodeCache.invalidate(req.args[1].rootId, req.args[1].nodePath);
+                break;
+            case 'nodes':
+                (req.args[0] || []).forEach(nodeWrapper => nodeCache.clear(nodeWrapper.rootId));
+                break;
+            default:
+                break;
+        }
+    }
+
     const getNodeDataWrapper = (node, orgNodeWrapper) => {
         return {
             rootId: orgNodeWrapper.rootId,
@@ -71,36 +321,428 @@ function CoreZMQ(project, core, mainLogger, opts) {
         return result;
     };
 
-    function send(payload) {
-        const serialized = JSON.stringify(payload);
+    function send(payload, ctx) {
+        const serialized = codecs.encodeMessage(payload, ctx.codec, ctx.replyAttachments, ctx.compression,
+            opts.compressionThreshold);
         if (payload.err) {
             logger.error('res', payload);
-        } else {
+        } else if (debugEnabled) {
             logger.debug('res', payload);
         }
 
-        responder.send(serialized);
+        if (ctx.envelope) {
+            responder.send(ctx.envelope.concat(serialized));
+        } else {
+            responder.send(serialized);
+        }
+    }
+
+    function getErrorData(err, req) {
+        return {
+            message: err.message,
+            type: err.name,
+            stack: err.stack,
+            req: req,
+        };
     }
 
-    function sendError(err, req) {
+    function sendError(err, req, ctx) {
         send({
-            err: {
-                message: err.message,
-                type: err.name,
-                stack: err.stack,
-                req: req,
-            },
+            err: getErrorData(err, req),
             res: null
+        }, ctx);
+    }
+
+    function sendResult(res, ctx) {
+        if (ctx.compactNodes) {
+            // Covers plain results, stream chunks and the results of batched calls.
+            res = codecs.compactNodeLists(res, 2);
+        }
+
+        send({err: null, res}, ctx);
+    }
+
+    /**
+     * Binary content is either an attachment frame referenced by {$bin: <index>}, bytes decoded by a binary
+     * codec (Uint8Array) or, from clients not negotiating a codec, a base64 encoded string.
+     * @param {string|Uint8Array|object} content
+     * @param {object} ctx - Context of the request message.
+     * @returns {Buffer}
+     */
+    function toBuffer(content, ctx) {
+        if (typeof content === 'string') {
+            return Buffer.from(content, 'base64');
+        } else if (typeof content.$bin === 'number') {
+            if (!ctx.attachments[content.$bin]) {
+                throw new Error(`Missing attachment frame [${content.$bin}]`);
+            }
+
+            return ctx.attachments[content.$bin];
+        }
+
+        return Buffer.from(content.buffer, content.byteOffset, content.byteLength);
+    }
+
+    /**
+     * Adds the buffer as a frame to the reply.
+     * @param {Buffer} buffer
+     * @param {object} ctx - Context of the request message.
+     * @returns {object} The placeholder, {$bin: <index>}, to put in the result.
+     */
+    function attach(buffer, ctx) {
+        ctx.replyAttachments.push(buffer);
+        return {$bin: ctx.replyAttachments.length - 1};
+    }
+
+    /**
+     * @param {object|null} fields - The fields requested, {<field>: true|string[]} where a list selects the names of
+     * the named fields (attributes, pointers etc.) rather than all.
+     * @returns {object} The fields to describe the nodes with.
+     * @throws {Error} If a field is unknown.
+     */
+    function getDescribeFields(fields) {
+        fields = fields || DEFAULT_DESCRIBE_FIELDS;
+
+        Object.keys(fields)
+            .forEach((field) => {
+                if (!DESCRIBE_NAMED_FIELDS.hasOwnProperty(field) && !DESCRIBE_VALUE_FIELDS.hasOwnProperty(field) &&
+                    !DESCRIBE_NODE_FIELDS.hasOwnProperty(field)) {
+                    throw new Error(`Unknown field [${field}] to describe nodes with, available are ` +
+                        `${Object.keys(DESCRIBE_NAMED_FIELDS).concat(Object.keys(DESCRIBE_VALUE_FIELDS),
+                            Object.keys(DESCRIBE_NODE_FIELDS))}`);
+                }
+            });
+
+        return fields;
+    }
+
+    /**
+     * @param {object|null} node
+     * @param {object} fields - See getDescribeFields.
+     * @param {object} nodeWrapper - The wrapper the node was resolved from.
+     * @returns {object|null} The record with the path and the requested fields of the node (null if no node).
+     */
+    function describeNode(node, fields, nodeWrapper) {
+        if (!node) {
+            return null;
+        }
+
+        const record = {path: core.getPath(node)};
+
+        Object.keys(fields)
+            .forEach((field) => {
+                const selection = fields[field];
+
+                if (!selection) {
+                    return;
+                } else if (DESCRIBE_NAMED_FIELDS.hasOwnProperty(field)) {
+                    const getNames = DESCRIBE_NAMED_FIELDS[field][0];
+                    const getValue = DESCRIBE_NAMED_FIELDS[field][1];
+                    const values = {};
+
+                    (Array.isArray(selection) ? selection : core[getNames](node))
+                        .forEach((name) => {
+                            const value = core[getValue](node, name);
+                            values[name] = value === undefined ? null : value;
+                        });
+
+                    record[field] = values;
+                } else if (DESCRIBE_VALUE_FIELDS.hasOwnProperty(field)) {
+                    record[field] = core[DESCRIBE_VALUE_FIELDS[field]](node);
+                } else {
+                    const fieldNode = core[DESCRIBE_NODE_FIELDS[field]](node);
+                    record[field] = fieldNode ? getNodeDataWrapper(fieldNode, nodeWrapper) : null;
+                }
+            });
+
+        return record;
+    }
+
+    /**
+     * @param {object[]} nodeWrappers
+     * @param {object} fields - See getDescribeFields.
+     * @returns {external:Promise} Resolves with one record per node.
+     */
+    function describeNodes(nodeWrappers, fields) {
+        return Q.all(nodeWrappers.map(getNode))
+            .then(nodes => nodes.map((node, i) => describeNode(node, fields, nodeWrappers[i])));
+    }
+
+    /**
+     * Reads the values at the names of many nodes in one pass, column by column.
+     * @param {object[]} nodeWrappers
+     * @param {string[]} names
+     * @param {string} getValue - Name of the core function reading a value, e.g. getAttribute.
+     * @returns {external:Promise} Resolves with {<name>: <values>} holding the values of the nodes in their order
+     * (null for missing values and nodes).
+     */
+    function getColumns(nodeWrappers, names, getValue) {
+        return Q.all(nodeWrappers.map(getNode))
+            .then((nodes) => {
+                const columns = {};
+
+                names.forEach((name) => {
+                    const column = columns[name] = new Array(nodes.length);
+                    for (let i = 0; i < nodes.length; i += 1) {
+                        const value = nodes[i] ? core[getValue](nodes[i], name) : null;
+                        column[i] = value === undefined ? null : value;
+                    }
+                });
+
+                return columns;
+            });
+    }
+
+    /**
+     * Creates the nodes of the specs in one pass. The parent and base of a spec are node wrappers or indices of earlier
+     * specs, the targets of its pointers and members of its sets are node wrappers or indices of any spec. The
+     * pointers and sets are set once all nodes are created.
+     * @param {object[]} specs - {parent, base, relid, guid, attributes, registry, pointers, sets}.
+     * @returns {external:Promise} Resolves with the node wrappers of the created nodes.
+     */
+    function createNodes(specs) {
+        // Each referenced node (e.g. a parent shared by many specs) is loaded once.
+        const nodeWrappers = [];
+        const keys = new Set();
+        const getKey = nodeWrapper => `${nodeWrapper.rootId}#${nodeWrapper.nodePath}`;
+        const addNodeWrapper = (ref) => {
+            if (ref && typeof ref === 'object' && !keys.has(getKey(ref))) {
+                keys.add(getKey(ref));
+                nodeWrappers.push(ref);
+            }
+        };
+
+        specs.forEach((spec) => {
+            addNodeWrapper(spec.parent);
+            addNodeWrapper(spec.base);
+            Object.keys(spec.pointers || {}).forEach(name => addNodeWrapper(spec.pointers[name]));
+            Object.keys(spec.sets || {}).forEach(name => spec.sets[name].forEach(addNodeWrapper));
         });
+
+        return Q.all(nodeWrappers.map(getNode))
+            .then((nodes) => {
+                const loadedNodes = new Map(nodeWrappers.map((nodeWrapper, i) => [getKey(nodeWrapper), nodes[i]]));
+                const created = [];
+                const origins = [];
+                const resolve = (ref, i, earlierOnly) => {
+                    if (typeof ref === 'number') {
+                        if (ref < 0 || ref >= (earlierOnly ? i : specs.length) || ref !== Math.floor(ref)) {
+                            throw new Error(`Invalid index ${ref}, ` +
+                                (earlierOnly ? 'parent and base must be earlier specs' : 'out of range'));
+                        }
+
+                        return created[ref];
+                    } else if (!ref) {
+                        return null;
+                    }
+
+                    const node = loadedNodes.get(getKey(ref));
+                    if (!node) {
+                        throw new Error(`Node does not exist at path [${ref.nodePath}]`);
+                    }
+
+                    return node;
+                };
+
+                const forEachSpec = (fn) => {
+                    specs.forEach((spec, i) => {
+                        try {
+                            fn(spec, i);
+                        } catch (err) {
+                            err.message = `specs[${i}]: ${err.message}`;
+                            throw err;
+                        }
+                    });
+                };
+
+                markRootsDirty(nodeWrappers, nodes);
+
+                forEachSpec((spec, i) => {
+                    const parent = resolve(spec.parent, i, true);
+                    const base = resolve(spec.base, i, true);
+                    const parentRef = parent ? spec.parent : spec.base;
+                    origins[i] = typeof parentRef === 'number' ? origins[parentRef] : parentRef;
+                    if (!origins[i]) {
+                        throw new Error('A parent or base is required');
+                    }
+
+                    created[i] = core.createNode({parent, base, relid: spec.relid, guid: spec.guid});
+
+                    Object.keys(spec.attributes || {})
+                        .forEach(name => core.setAttribute(created[i], name, spec.attributes[name]));
+                    Object.keys(spec.registry || {})
+                        .forEach(name => core.setRegistry(created[i], name, spec.registry[name]));
+                });
+
+                forEachSpec((spec, i) => {
+                    Object.keys(spec.pointers || {})
+                        .forEach(name => core.setPointer(created[i], name, resolve(spec.pointers[name], i, false)));
+                    Object.keys(spec.sets || {})
+                        .forEach((name) => {
+                            if (core.getSetNames(created[i]).indexOf(name) === -1) {
+                                core.createSet(created[i], name);
+                            }
+
+                            spec.sets[name].forEach(ref => core.addMember(created[i], name, resolve(ref, i, false)));
+                        });
+                });
+
+                return created.map((node, i) => {
+                    const nodeWrapper = getNodeDataWrapper(node, origins[i]);
+                    nodeCache.set(nodeWrapper.rootId, nodeWrapper.nodePath, node);
+                    return nodeWrapper;
+                });
+            });
+    }
+
+    /**
+     * Applies many changes in one pass, a failing change does not stop the others.
+     * @param {Array[]} changes - The arguments of the single-item core function per change.
+     * @param {function} getNodeWrappers - Returns the node wrappers of a change, the node changed first.
+     * @param {function} apply - Called with the change and its resolved nodes.
+     * @returns {external:Promise} Resolves with null or the error message per change.
+     */
+    function applyChanges(changes, getNodeWrappers, apply) {
+        return Q.allSettled(changes.map(change => Q.all(getNodeWrappers(change).map(getNode))))
+            .then(results => results.map((result, i) => {
+                if (result.state === 'rejected') {
+                    return result.reason.message;
+                }
+
+                const nodeWrappers = getNodeWrappers(changes[i]);
+                const missing = result.value.indexOf(null);
+                if (missing > -1) {
+                    return `Node does not exist at path [${nodeWrappers[missing].nodePath}]`;
+                }
+
+                try {
+                    markRootsDirty(nodeWrappers, result.value);
+                    apply(changes[i], result.value);
+                    return null;
+                } catch (err) {
+                    return err.message;
+                }
+            }));
+    }
+
+    /**
+     * Nodes in the sub-tree of another node to delete (or given more than once) are removed along with it, deleting
+     * them on their own would act on an already removed node.
+     * @param {object[]} nodeWrappers - The nodes to delete.
+     * @returns {Set<object>} The node wrappers removed along with another one.
+     */
+    function getDeletedAlong(nodeWrappers) {
+        const keys = new Set();
+        const deletedAlong = new Set();
+
+        nodeWrappers.forEach((nodeWrapper) => {
+            const key = `${nodeWrapper.rootId}#${nodeWrapper.nodePath}`;
+            if (keys.has(key)) {
+                deletedAlong.add(nodeWrapper);
+            }
+
+            keys.add(key);
+        });
+
+        nodeWrappers.forEach((nodeWrapper) => {
+            const relids = nodeWrapper.nodePath.split('/');
+            // The root (path '') cannot be deleted, so it is never an ancestor to delete along.
+            for (let i = 2; i < relids.length; i += 1) {
+                if (keys.has(`${nodeWrapper.rootId}#${relids.slice(0, i).join('/')}`)) {
+                    deletedAlong.add(nodeWrapper);
+                    break;
+                }
+            }
+        });
+
+        return deletedAlong;
     }
 
-    function sendResult(res) {
-        send({err: null, res});
+    /**
+     * Loads the sub-tree level by level so that the data is in the core's (and storage's) cache when requested later.
+     * @param {object} node
+     * @param {number|null} depth - Number of levels below the node to load (null loads the entire sub-tree).
+     * @param {boolean} includePointers - Also load the targets of the pointers of the loaded nodes.
+     * @param {{loaded: number}} status - The number of loaded nodes is counted up as they are loaded.
+     * @returns {external:Promise}
+     */
+    function loadTree(node, depth, includePointers, status) {
+        const maxDepth = typeof depth === 'number' ? depth : Infinity;
+        let level = [node];
+        let currentDepth = 0;
+
+        const loadPointers = (nodes) => {
+            return Q.all(nodes.map(levelNode => Q.all(core.getPointerNames(levelNode)
+                .filter(name => core.getPointerPath(levelNode, name))
+                .map(name => core.loadPointer(levelNode, name).catch(() => null)))));
+        };
+
+        const loadLevel = () => {
+            if (level.length === 0 || currentDepth >= maxDepth) {
+                return Q();
+            }
+
+            currentDepth += 1;
+            return Q.all(level.map(levelNode => core.loadChildren(levelNode)))
+                .then((childrenLists) => {
+                    level = [].concat(...childrenLists);
+                    status.loaded += level.length;
+
+                    return includePointers ? loadPointers(level) : null;
+                })
+                .then(loadLevel);
+        };
+
+        return (includePointers ? loadPointers(level) : Q())
+            .then(loadLevel);
+    }
+
+    /**
+     * Loads the sub-tree in the background (see loadTree), the status is kept in prefetches until polled when done.
+     * @param {object} node
+     * @param {number|null} depth
+     * @param {boolean} includePointers
+     * @returns {{id: string, estimatedSize: number}} The estimated size is a lower bound, the node and its children.
+     */
+    function startPrefetch(node, depth, includePointers) {
+        prefetchCounter += 1;
+        const id = String(prefetchCounter);
+        const status = prefetches[id] = {loaded: 1, done: false, error: null};
+
+        loadTree(node, depth, includePointers, status)
+            .then(() => {
+                status.done = true;
+                logger.debug('Prefetch', id, 'loaded', status.loaded, 'nodes');
+            })
+            .catch((err) => {
+                logger.warn('Prefetch', id, 'failed', err);
+                status.done = true;
+                status.error = err.message;
+            });
+
+        return {
+            id,
+            estimatedSize: 1 + core.getChildrenRelids(node).length,
+        };
+    }
+
+    function unloadRoot(rootId) {
+        rootCache.delete(rootId);
+        nodeCache.clear(rootId);
     }
 
     function handleUtilRequest(req) {
 
         switch (req.name) {
+            case 'hello':
+                return Q({
+                    codec: codecs.negotiate(req.args[0].codecs),
+                    codecs: Object.keys(codecs.CODECS),
+                    compressions: Object.keys(compressions.COMPRESSIONS),
+                    nodeLists: true,
+                });
+            case 'ping':
+                return Q(Date.now());
             case 'META':
                 return getNode(req.args[0])
                     .then((rootNode) => {
@@ -122,9 +764,25 @@ function CoreZMQ(project, core, mainLogger, opts) {
                             persisted.objects,
                             req.args[3]);
                     });
+            case 'getServerStats':
+                return Q({
+                    nodeCache: nodeCache.getStats(),
+                    roots: rootCache.roots.size,
+                    rootCache: rootCache.getStats(),
+                    streams: Object.keys(streams).length,
+                    prefetches: Object.keys(prefetches).length,
+                    projects: Object.keys(projectSessions).length,
+                    requests: requestQueue ? requestQueue.getStats() : null,
+                    responseCache: responseCache ? responseCache.getStats() : null,
+                });
+            case 'openProject':
+                return openProjectSession(req.args[0], req.args[1]);
+            case 'closeProject':
+                closeProjectSession(req.args[0]);
+                return Q();
             case 'unloadRoot':
                 try {
-                    delete roots[req.args[0].rootId];
+                    unloadRoot(req.args[0].rootId);
                     return Q();
                 } catch (e) {
                     return Q.reject(e);
@@ -134,547 +792,297 @@ function CoreZMQ(project, core, mainLogger, opts) {
         }
     }
 
+    /**
+     * Resolves the node arguments of a core request according to their kinds in the dispatch table.
+     * @param {object} spec - Entry of the dispatch table.
+     * @param {Array} args - The arguments of the request.
+     * @returns {Array|external:Promise} The arguments directly if all nodes were loaded already, otherwise a promise.
+     */
+    function resolveCoreArgs(spec, args) {
+        const resolved = new Array(spec.args.length);
+        const missing = [];
+
+        const resolveNode = (nodeWrapper, target, index) => {
+            const node = getLoadedNode(nodeWrapper);
+            if (node) {
+                target[index] = node;
+            } else {
+                missing.push({nodeWrapper, target, index});
+            }
+        };
+
+        for (let i = 0; i < spec.args.length; i += 1) {
+            const arg = args[i];
+
+            switch (spec.args[i]) {
+                case 'node':
+                    resolveNode(arg, resolved, i);
+                    break;
+                case 'node?':
+                    if (arg) {
+                        resolveNode(arg, resolved, i);
+                    } else {
+                        resolved[i] = null;
+                    }
+                    break;
+                case 'nodeOrPath':
+                    if (typeof arg === 'string') {
+                        resolved[i] = arg;
+                    } else {
+                        resolveNode(arg, resolved, i);
+                    }
+                    break;
+                case 'nodes':
+                    resolved[i] = new Array(arg.length);
+                    for (let j = 0; j < arg.length; j += 1) {
+                        resolveNode(arg[j], resolved[i], j);
+                    }
+                    break;
+                default:
+                    resolved[i] = arg;
+                    break;
+            }
+        }
+
+        if (missing.length === 0) {
+            return resolved;
+        }
+
+        return Promise.all(missing.map(entry => loadNode(entry.nodeWrapper)
+            .then((node) => {
+                entry.target[entry.index] = node;
+            })))
+            .then(() => resolved);
+    }
+
+    /**
+     * @returns {object|null} The first node wrapper among the arguments, its rootId is given to the resulting nodes.
+     */
+    function getOriginNodeWrapper(spec, args) {
+        for (let i = 0; i < spec.args.length; i += 1) {
+            if (spec.args[i] === 'nodes') {
+                if (args[i].length > 0) {
+                    return args[i][0];
+                }
+            } else if (spec.args[i] !== null && args[i] && typeof args[i] === 'object') {
+                return args[i];
+            }
+        }
+
+        return null;
+    }
+
+    function wrapCoreResult(spec, res, origin) {
+        switch (spec.result) {
+            case 'node':
+                if (res) {
+                    return getNodeDataWrapper(res, origin);
+                }
+
+                // Important difference between null and undefined from the load functions!
+                return spec.async ? res : null;
+            case 'nodes':
+                return res.map(node => getNodeDataWrapper(node, origin));
+            case 'nodeDict':
+                return getNodesDictDataWrapper(res, origin);
+            case 'definitionInfo':
+                return {
+                    ownerNode: res.ownerNode ? getNodeDataWrapper(res.ownerNode, origin) : null,
+                    targetNode: res.targetNode ? getNodeDataWrapper(res.targetNode, origin) : null,
+                };
+            default:
+                return res;
+        }
+    }
+
+    function markMutatedRoots(spec, args, resolvedArgs) {
+        for (let i = 0; i < spec.args.length; i += 1) {
+            if (spec.args[i] === 'nodes') {
+                markRootsDirty(args[i], resolvedArgs[i]);
+            } else if (spec.args[i] !== null && args[i] && typeof args[i] === 'object') {
+                markRootsDirty([args[i]], [resolvedArgs[i]]);
+            }
+        }
+    }
+
+    /**
+     * Calls the core function as described by its entry in the dispatch table. Synchronous functions whose nodes are
+     * all loaded already are called directly (throwing any error) without waiting for any promise.
+     * @param {object} spec - Entry of the dispatch table.
+     * @param {object} req
+     * @returns {Promise}
+     */
+    function dispatchCoreRequest(spec, req) {
+        const origin = getOriginNodeWrapper(spec, req.args);
+        const args = resolveCoreArgs(spec, req.args);
+
+        if (!spec.async && Array.isArray(args)) {
+            if (spec.mutates) {
+                markMutatedRoots(spec, req.args, args);
+            }
+
+            return Promise.resolve(wrapCoreResult(spec, core[req.name].apply(core, args), origin));
+        }
+
+        return Promise.resolve(args)
+            .then((args_) => {
+                if (spec.mutates) {
+                    markMutatedRoots(spec, req.args, args_);
+                }
+
+                return core[req.name].apply(core, args_);
+            })
+            .then(res => wrapCoreResult(spec, res, origin));
+    }
+
+    /**
+     * Serves the call from the results cached in read-only mode (the rootIds of the nodes are part of the key).
+     * @param {object} spec - Entry of the dispatch table.
+     * @param {object} req
+     * @returns {Promise}
+     */
+    function getCachedCoreResult(spec, req) {
+        const origin = getOriginNodeWrapper(spec, req.args);
+
+        // Results of unloaded roots are kept, but must not be served.
+        if (origin && !rootCache.get(origin.rootId) && !rootCache.isEvicted(origin.rootId)) {
+            throw new Error(`No root loaded at rootId: [${origin.rootId}]!`);
+        }
+
+        return responseCache.get(`${req.name}:${JSON.stringify(req.args)}`, () => dispatchCoreRequest(spec, req));
+    }
+
     function handleCoreRequest(req) {
-        const deferred = Q.defer();
+        if (coreDispatch.hasOwnProperty(req.name)) {
+            return responseCache ? getCachedCoreResult(coreDispatch[req.name], req) :
+                dispatchCoreRequest(coreDispatch[req.name], req);
+        }
 
         switch (req.name) {
             case 'loadRoot':
-                if (roots.hasOwnProperty(req.args[0])) {
+                if (rootCache.get(req.args[0])) {
                     logger.warn('Attempting to load same root-hash twice, resolving with same node..');
-                    deferred.resolve({
+                    return Q({
                         rootId: req.args[0],
                         nodePath: '',
                     });
-                } else {
-                    core.loadRoot(req.args[0])
-                        .then((rootNode) => {
-                            roots[req.args[0]] = rootNode;
-                            deferred.resolve({
-                                rootId: req.args[0],
-                                nodePath: '',
-                            });
-                        })
-                        .catch(deferred.reject);
-                }
-                break;
-            case 'addMember':
-            case 'setAspectMetaTarget':
-                Q.all([
-                    getNode(req.args[0]),
-                    getNode(req.args[2]),
-                ])
-                    .then((nodes) => {
-                        deferred.resolve(core[req.name](nodes[0], req.args[1], nodes[1]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'setPointer':
-                Q.all([
-                    getNode(req.args[0]),
-                    req.args[2] ? getNode(req.args[2]) : Q(null),
-                ])
-                    .then((nodes) => {
-                        deferred.resolve(core[req.name](nodes[0], req.args[1], nodes[1]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'setPointerMetaTarget':
-                Q.all([
-                    getNode(req.args[0]),
-                    getNode(req.args[2]),
-                ])
-                    .then((nodes) => {
-                        deferred.resolve(core[req.name](nodes[0], req.args[1], nodes[1], req.args[3], req.args[4]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'applyResolution':
-                try {
-                    deferred.resolve(core.applyResolution(req.args[0]));
-                } catch (e) {
-                    deferred.reject(e);
-                }
-                break;
-            case 'tryToConcatChanges':
-                try {
-                    deferred.resolve(core.tryToConcatChanges(req.args[0], req.args[1]));
-                } catch (e) {
-                    deferred.reject(e);
                 }
-                break;
-            case 'createChild':
-            case 'copyNode':
-            case 'moveNode':
-                Q.all([
-                    getNode(req.args[0]),
-                    getNode(req.args[1]),
-                ])
-                    .then((nodes) => {
-                        deferred.resolve(getNodeDataWrapper(core[req.name](nodes[0], nodes[1]), req.args[0]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'copyNodes':
-                Q.all([
-                    Q.all(req.args[0].map(nodeDataWrapper => getNode(nodeDataWrapper))),
-                    getNode(req.args[1]),
-                ])
-                    .then((nodes) => {
-                        deferred.resolve(core.copyNodes(nodes[0], nodes[1])
-                            .map(newNode => getNodeDataWrapper(newNode, req.args[1]))
-                        );
-                    })
-                    .catch(deferred.reject);
-                break;
+
+                return core.loadRoot(req.args[0])
+                    .then((rootNode) => {
+                        addRoot(req.args[0], rootNode);
+                        if (opts.prefetchOnLoadRoot) {
+                            // Nobody polls the status of these.
+                            delete prefetches[startPrefetch(rootNode,
+                                typeof opts.prefetchOnLoadRoot === 'number' ? opts.prefetchOnLoadRoot : null,
+                                false).id];
+                        }
+
+                        return {
+                            rootId: req.args[0],
+                            nodePath: '',
+                        };
+                    });
             case 'createNode':
-                Q.all([
+                return Q.all([
                     req.args[0].parent ? getNode(req.args[0].parent) : Q(null),
                     req.args[0].base ? getNode(req.args[0].base) : Q(null),
                 ])
                     .then((nodes) => {
-                        deferred.resolve(getNodeDataWrapper(
+                        markRootsDirty([req.args[0].parent, req.args[0].base], nodes);
+                        return getNodeDataWrapper(
                             core.createNode({
                                 parent: nodes[0],
                                 base: nodes[1],
                                 relid: req.args[0].relid,
                                 guid: req.args[0].guid,
-                            }), req.args[0].parent || req.args[0].base)
-                        );
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'getAllMetaNodes':
-            case 'getMixinNodes':
-                getNode(req.args[0])
-                    .then((node) => {
-                        deferred.resolve(getNodesDictDataWrapper(core[req.name](node), req.args[0]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'clearMetaRules':
-            case 'clearMixins':
-            case 'deleteNode':
-            case 'getAttributeNames':
-            case 'getChildrenHashes':
-            case 'getChildrenMeta':
-            case 'getChildrenPaths':
-            case 'getChildrenRelids':
-            case 'getCollectionNames':
-            case 'getConstraintNames':
-            case 'getFullyQualifiedName':
-            case 'getGuid':
-            case 'getHash':
-            case 'getInstancePaths':
-            case 'getJsonMeta':
-            case 'getLibraryNames':
-            case 'getMixinErrors':
-            case 'getMixinPaths':
-            case 'getNamespace':
-            case 'getOwnAttributeNames':
-            case 'getOwnChildrenPaths':
-            case 'getOwnChildrenRelids':
-            case 'getOwnConstraintNames':
-            case 'getOwnJsonMeta':
-            case 'getOwnPointerNames':
-            case 'getOwnRegistryNames':
-            case 'getOwnSetNames':
-            case 'getOwnValidAspectNames':
-            case 'getOwnValidAttributeNames':
-            case 'getOwnValidPointerNames':
-            case 'getOwnValidSetNames':
-            case 'getPath':
-            case 'getPointerNames':
-            case 'getRegistryNames':
-            case 'getRelid':
-            case 'getSetNames':
-            case 'getValidAspectNames':
-            case 'getValidAttributeNames':
-            case 'getValidChildrenPaths':
-            case 'getValidPointerNames':
-            case 'getValidSetNames':
-            case 'isAbstract':
-            case 'isConnection':
-            case 'isEmpty':
-            case 'isLibraryElement':
-            case 'isLibraryRoot':
-            case 'isMemberOf':
-            case 'isMetaNode':
-            case 'persist':
-                getNode(req.args[0])
-                    .then((node) => {
-                        deferred.resolve(core[req.name](node));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'addMixin':
-            case 'applyTreeDiff':
-            case 'canSetAsMixin':
-            case 'createSet':
-            case 'delAspectMeta':
-            case 'delAttribute':
-            case 'delAttributeMeta':
-            case 'delChildMeta':
-            case 'getCollectionPaths':
-            case 'delConstraint':
-            case 'deletePointer':
-            case 'deleteSet':
-            case 'delMixin':
-            case 'delPointer':
-            case 'delPointerMeta':
-            case 'delRegistry':
-            case 'delSet':
-            case 'getAspectMeta':
-            case 'getAttribute':
-            case 'getAttributeMeta':
-            case 'getConstraint':
-            case 'getLibraryGuid':
-            case 'getLibraryInfo':
-            case 'getMemberPaths':
-            case 'getOwnAttribute':
-            case 'getOwnMemberPaths':
-            case 'getOwnPointerPath':
-            case 'getOwnRegistry':
-            case 'getOwnSetAttributeNames':
-            case 'getOwnSetRegistryNames':
-            case 'getOwnValidAspectTargetPaths':
-            case 'getOwnValidTargetPaths':
-            case 'getPointerMeta':
-            case 'getPointerPath':
-            case 'getRegistry':
-            case 'getSetAttributeNames':
-            case 'getSetRegistryNames':
-            case 'getValidAspectTargetPaths':
-            case 'getValidTargetPaths':
-            case 'removeLibrary':
-            case 'setGuid':
-                getNode(req.args[0])
-                    .then((node) => {
-                        deferred.resolve(core[req.name](node, req.args[1]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'delAspectMetaTarget':
-            case 'delMember':
-            case 'delSetAttribute':
-            case 'delSetRegistry':
-            case 'delPointerMetaTarget':
-            case 'getMemberAttributeNames':
-            case 'getMemberOwnAttributeNames':
-            case 'getMemberOwnRegistryNames':
-            case 'getMemberRegistryNames':
-            case 'getOwnSetAttribute':
-            case 'getOwnSetRegistry':
-            case 'getSetAttribute':
-            case 'getSetRegistry':
-            case 'isFullyOverriddenMember':
-            case 'isValidAttributeValueOf':
-            case 'renameAttribute':
-            case 'renameAttributeMeta':
-            case 'renameLibrary':
-            case 'renamePointer':
-            case 'renameRegistry':
-            case 'renameSet':
-            case 'setAttribute':
-            case 'setAttributeMeta':
-            case 'setChildrenMetaLimits':
-            case 'setConstraint':
-            case 'setRegistry':
-                getNode(req.args[0])
-                    .then((node) => {
-                        deferred.resolve(core[req.name](node, req.args[1], req.args[2]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'addLibrary':
-            case 'delMemberAttribute':
-            case 'delMemberRegistry':
-            case 'getMemberAttribute':
-            case 'getMemberOwnAttribute':
-            case 'getMemberOwnRegistry':
-            case 'getMemberRegistry':
-            case 'moveMember':
-            case 'setPointerMetaLimits':
-            case 'setSetAttribute':
-            case 'setSetRegistry':
-            case 'updateLibrary':
-                getNode(req.args[0])
-                    .then((node) => {
-                        deferred.resolve(core[req.name](node, req.args[1], req.args[2], req.args[3]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'setMemberAttribute':
-            case 'setMemberRegistry':
-                getNode(req.args[0])
-                    .then((node) => {
-                        deferred.resolve(core[req.name](node, req.args[1], req.args[2], req.args[3], req.args[4]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'generateTreeDiff':
-                deferred.reject(new Error('generateTreeDiff not supported!'));
-                break;
-            case 'getChildDefinitionInfo':
-                Q.all([
-                    getNode(req.args[0]),
-                    getNode(req.args[1]),
-                ])
-                    .then((nodes) => {
-                        const info = core[req.name](nodes[0], nodes[1]);
-
-                        deferred.resolve({
-                            ownerNode: info.ownerNode ? getNodeDataWrapper(info.ownerNode, req.args[0]) : null,
-                            targetNode: info.targetNode ? getNodeDataWrapper(info.targetNode, req.args[0]) : null,
-                        });
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'getAspectDefinitionInfo':
-            case 'getPointerDefinitionInfo':
-            case 'getSetDefinitionInfo':
-                Q.all([
-                    getNode(req.args[0]),
-                    getNode(req.args[2]),
-                ])
-                    .then((nodes) => {
-                        const info = core[req.name](nodes[0], req.args[1], nodes[1]);
-
-                        deferred.resolve({
-                            ownerNode: info.ownerNode ? getNodeDataWrapper(info.ownerNode, req.args[0]) : null,
-                            targetNode: info.targetNode ? getNodeDataWrapper(info.targetNode, req.args[0]) : null,
-                        });
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'getBase':
-            case 'getBaseRoot':
-            case 'getBaseType':
-            case 'getFCO':
-            case 'getMetaType':
-            case 'getParent':
-            case 'getRoot':
-            case 'getTypeRoot':
-                getNode(req.args[0])
-                    .then((node) => {
-                        const resNode = core[req.name](node);
-                        if (resNode) {
-                            deferred.resolve(getNodeDataWrapper(resNode, req.args[0]));
-                        } else {
-                            deferred.resolve(null);
-                        }
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'getLibraryRoot':
-                getNode(req.args[0])
-                    .then((node) => {
-                        const resNode = core[req.name](node, req.args[1]);
-                        if (resNode) {
-                            deferred.resolve(getNodeDataWrapper(resNode, req.args[0]));
-                        } else {
-                            deferred.resolve(null);
-                        }
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'getChild':
-                deferred.reject(new Error('getChild not supported!'));
-                break;
-            case 'isTypeOf':
-            case 'isInstanceOf':
-                Q.all([
-                    getNode(req.args[0]),
-                    typeof req.args[1] === 'string' ? Q(req.args[1]) : getNode(req.args[1]),
-                ])
-                    .then((nodes) => {
-                        deferred.resolve(core[req.name](nodes[0], nodes[1]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'isValidChildOf':
-            case 'isValidNewParent':
-                Q.all([
-                    getNode(req.args[0]),
-                    getNode(req.args[1]),
-                ])
-                    .then((nodes) => {
-                        deferred.resolve(core[req.name](nodes[0], nodes[1]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'isValidNewBase':
-            case 'setBase':
-                Q.all([
-                    getNode(req.args[0]),
-                    req.args[1] ? getNode(req.args[1]) : Q(null),
-                ])
-                    .then((nodes) => {
-                        deferred.resolve(core[req.name](nodes[0], nodes[1]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'isValidNewChild':
-                Q.all([
-                    req.args[0] ? getNode(req.args[0]) : Q(null),
-                    req.args[1] ? getNode(req.args[1]) : Q(null),
-                ])
-                    .then((nodes) => {
-                        deferred.resolve(core[req.name](nodes[0], nodes[1]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'isValidAspectMemberOf':
-            case 'isValidTargetOf':
-                Q.all([
-                    getNode(req.args[0]),
-                    getNode(req.args[1]),
-                ])
-                    .then((nodes) => {
-                        deferred.resolve(core[req.name](nodes[0], nodes[1], req.args[2]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'moveAspectMetaTarget':
-            case 'movePointerMetaTarget':
-            case 'setChildMeta':
-                Q.all([
-                    getNode(req.args[0]),
-                    getNode(req.args[1]),
-                ])
-                    .then((nodes) => {
-                        deferred.resolve(core[req.name](nodes[0], nodes[1], req.args[2], req.args[3]));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'loadByPath':
-            case 'loadChild':
-            case 'loadPointer':
-                getNode(req.args[0])
-                    .then((node) => {
-                        return core[req.name](node, req.args[1]);
-                    })
-                    .then((resNode) => {
-                        if (resNode) {
-                            deferred.resolve(getNodeDataWrapper(resNode, req.args[0]));
-                        } else {
-                            // Important difference between null and undefined!
-                            deferred.resolve(resNode);
-                        }
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'loadChildren':
-            case 'loadInstances':
-            case 'loadOwnChildren':
-            case 'loadOwnSubTree':
-            case 'loadSubTree':
-                getNode(req.args[0])
-                    .then((node) => {
-                        return core[req.name](node);
-                    })
-                    .then((resNodes) => {
-                        deferred.resolve(resNodes.map(resNode => getNodeDataWrapper(resNode, req.args[0])));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'loadCollection':
-            case 'loadMembers':
-            case 'loadOwnMembers':
-                getNode(req.args[0])
-                    .then((node) => {
-                        return core[req.name](node, req.args[1]);
-                    })
-                    .then((resNodes) => {
-                        deferred.resolve(resNodes.map(resNode => getNodeDataWrapper(resNode, req.args[0])));
-                    })
-                    .catch(deferred.reject);
-                break;
+                            }), req.args[0].parent || req.args[0].base);
+                    });
             case 'getCommonBase':
             case 'getCommonParent':
-                try {
-                    Q.all(req.args[0].map(nodeDataWrapper => getNode(nodeDataWrapper)))
-                        .then((nodes) => {
-                            const resNode = core[req.name].apply(core, nodes);
-                            if (resNode) {
-                                deferred.resolve(getNodeDataWrapper(resNode, req.args[0][0]));
-                            } else {
-                                deferred.resolve(null);
-                            }
-                        });
-                } catch (e) {
-                    deferred.reject(e);
-                }
-                break;
-            case 'getBaseTypes':
-                getNode(req.args[0])
-                    .then((node) => {
-                        deferred.resolve(core[req.name](node)
-                            .map(resNode => getNodeDataWrapper(resNode, req.args[0])
-                            ));
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'getLibraryMetaNodes':
-                getNode(req.args[0])
-                    .then((node) => {
-                        deferred.resolve(core[req.name](node, req.args[1], req.args[2])
-                            .map(resNode => getNodeDataWrapper(resNode, req.args[0])
-                            ));
-                    })
-                    .catch(deferred.reject);
-                break;
+                return Q.all(req.args[0].map(nodeDataWrapper => getNode(nodeDataWrapper)))
+                    .then((nodes) => {
+                        const resNode = core[req.name].apply(core, nodes);
+
+                        return resNode ? getNodeDataWrapper(resNode, req.args[0][0]) : null;
+                    });
             case 'getValidChildrenMetaNodes':
-                Q.all([
+                return Q.all([
                     getNode(req.args[0].node),
                     Q.all((req.args[0].children || []).map(nodeDataWrapper => getNode(nodeDataWrapper))),
                 ])
                     .then((nodes) => {
-                        return deferred.resolve(core.getValidChildrenMetaNodes(
+                        return core.getValidChildrenMetaNodes(
                             {
                                 node: nodes[0],
                                 children: nodes[1],
                                 sensitive: !!req.args[0].sensitive,
                                 multiplicity: !!req.args[0].multiplicity,
                                 aspect: req.args[0].aspect,
-                            }).map(validNode => getNodeDataWrapper(validNode, req.args[0].node))
-                        );
-                    })
-                    .catch(deferred.reject);
-                break;
+                            }).map(validNode => getNodeDataWrapper(validNode, req.args[0].node));
+                    });
             case 'getValidSetElementsMetaNodes':
-                Q.all([
+                return Q.all([
                     getNode(req.args[0].node),
                     Q.all((req.args[0].members || []).map(nodeDataWrapper => getNode(nodeDataWrapper))),
                 ])
                     .then((nodes) => {
-                        return deferred.resolve(core.getValidSetElementsMetaNodes(
+                        return core.getValidSetElementsMetaNodes(
                             {
                                 node: nodes[0],
                                 members: nodes[1],
                                 name: req.args[0].name,
                                 sensitive: !!req.args[0].sensitive,
                                 multiplicity: !!req.args[0].multiplicity,
-                            }).map(validNode => getNodeDataWrapper(validNode, req.args[0].node))
-                        );
-                    })
-                    .catch(deferred.reject);
-                break;
-            case 'getAspectDefinitionOwner':
-            case 'getAttributeDefinitionOwner':
-                getNode(req.args[0])
-                    .then((node) => {
-                        deferred.resolve(getNodeDataWrapper(core[req.name](node, req.args[1]), req.args[0]));
-                    })
-                    .catch(deferred.reject);
-                break;
+                            }).map(validNode => getNodeDataWrapper(validNode, req.args[0].node));
+                    });
+            case 'generateTreeDiff':
+            case 'getChild':
+                return Q.reject(new Error(`${req.name} not supported!`));
             case 'CONSTANTS':
-                deferred.resolve(core.CONSTANTS);
-                break;
+                return Q(core.CONSTANTS);
+            case 'describeNodes':
+                return describeNodes(req.args[0], getDescribeFields(req.args[1]));
+            case 'getAttributes':
+                return getColumns(req.args[0], req.args[1], 'getAttribute');
+            case 'getRegistries':
+                return getColumns(req.args[0], req.args[1], 'getRegistry');
+            case 'createNodes':
+                return createNodes(req.args[0]);
+            case 'setAttributes':
+            case 'setRegistries': {
+                const setValue = req.name === 'setAttributes' ? 'setAttribute' : 'setRegistry';
+                return applyChanges(req.args[0], change => [change[0]],
+                    (change, nodes) => core[setValue](nodes[0], change[1], change[2]));
+            }
+            case 'setPointers':
+                return applyChanges(req.args[0], change => change[2] ? [change[0], change[2]] : [change[0]],
+                    (change, nodes) => core.setPointer(nodes[0], change[1], nodes[1] || null));
+            case 'deleteNodes': {
+                const deletedAlong = getDeletedAlong(req.args[0]);
+                return applyChanges(req.args[0], nodeWrapper => [nodeWrapper], (nodeWrapper, nodes) => {
+                    if (!deletedAlong.has(nodeWrapper)) {
+                        core.deleteNode(nodes[0]);
+                    }
+                });
+            }
+            case 'prefetch':
+                return getNode(req.args[0])
+                    .then(node => startPrefetch(node, req.args[1], req.args[2] === true));
+            case 'prefetchStatus':
+                if (prefetches.hasOwnProperty(req.args[0])) {
+                    const status = prefetches[req.args[0]];
+                    if (status.done) {
+                        delete prefetches[req.args[0]];
+                    }
+
+                    return Q(status);
+                }
+
+                return Q.reject(new Error(`No prefetch with id [${req.args[0]}]!`));
             default:
                 throw new Error(`Unexpected request name ${req.name} of type [${req.type}]`);
         }
-
-        return deferred.promise;
     }
 
     function handleProjectRequest(req) {
@@ -734,7 +1142,7 @@ function CoreZMQ(project, core, mainLogger, opts) {
         }
     }
 
-    function handlePluginRequest(req) {
+    function handlePluginRequest(req, ctx) {
         switch (req.name) {
             case 'getCurrentConfig':
                 try {
@@ -770,7 +1178,8 @@ function CoreZMQ(project, core, mainLogger, opts) {
                 try {
                     return plugin[req.name](req.args[0], req.args[1], null)
                     .then(bufferContent => {
-                        return Q(bufferContent.toString());
+                        // Clients that negotiated a codec receive the content as a separate frame.
+                        return Q(ctx.codec ? attach(bufferContent, ctx) : bufferContent.toString('base64'));
                     })
                     .catch(Q.reject);
                 } catch (e) {
@@ -781,7 +1190,7 @@ function CoreZMQ(project, core, mainLogger, opts) {
                     const is_bytes = req.args[2];
                     let data;
                     if (is_bytes) {
-                        data = Buffer.from(req.args[1])
+                        data = toBuffer(req.args[1], ctx);
                     }else{
                         data = req.args[1]
                     }
@@ -794,7 +1203,7 @@ function CoreZMQ(project, core, mainLogger, opts) {
                     const files = {};
                     for (const [key, value] of Object.entries(req.args[1])) {
                         if (value.binary) {
-                            files[key] = Buffer.from(value.content);
+                            files[key] = toBuffer(value.content, ctx);
                         } else {
                             files[key] = value.content;
                         }
@@ -831,56 +1240,754 @@ function CoreZMQ(project, core, mainLogger, opts) {
         }
     }
 
+    /**
+     * Resolves the forward references, {$ref: <index>}, within the arguments of a batched call
+     * to the results of the earlier calls in the same batch.
+     * @param {*} value
+     * @param {object[]} results - The results, {err, res}, of the so far handled calls.
+     * @returns {*}
+     */
+    function resolveBatchRefs(value, results) {
+        if (value instanceof Array) {
+            return value.map(item => resolveBatchRefs(item, results));
+        } else if (value && typeof value === 'object') {
+            if (typeof value.$ref === 'number') {
+                const refResult = results[value.$ref];
+                if (!refResult) {
+                    throw new Error(`Batch reference [${value.$ref}] does not point to an earlier call!`);
+                } else if (refResult.err) {
+                    throw new Error(`Referenced batch call [${value.$ref}] failed: ${refResult.err.message}`);
+                }
+
+                return refResult.res;
+            }
+
+            const result = {};
+            Object.keys(value)
+                .forEach((key) => {
+                    result[key] = resolveBatchRefs(value[key], results);
+                });
+
+            return result;
+        }
+
+        return value;
+    }
+
+    /**
+     * Handles the calls of a batch one after another (in order) and collects all results and errors.
+     * A failing call does not abort the batch, but any later call referencing its result will fail too.
+     * @param {object} req
+     * @param {object[]} req.args - [calls], where each call is a regular request (with optional refs flag).
+     * @param {object} ctx - Context of the request message.
+     * @returns {external:Promise}
+     */
+    function handleBatchRequest(req, ctx) {
+        const calls = req.args[0] || [];
+        const results = [];
+
+        return calls
+            .reduce((prevPromise, call) => {
+                return prevPromise
+                    .then(() => {
+                        if (call.type === 'batch') {
+                            throw new Error('Batches cannot be nested!');
+                        }
+
+                        if (call.refs) {
+                            call.args = resolveBatchRefs(call.args, results);
+                        }
+
+                        return handleRequest(call, ctx);
+                    })
+                    .then((res) => {
+                        results.push({err: null, res});
+                    })
+                    .catch((err) => {
+                        results.push({err: getErrorData(err, call), res: null});
+                    });
+            }, Q())
+            .then(() => results);
+    }
+
+    /**
+     * Produces the nodes of the sub-tree breadth-first, loading the children of (at most) chunkSize nodes at a time.
+     * @param {object} node
+     * @param {boolean} own - Only follow own children (loadOwnSubTree).
+     * @param {number} chunkSize
+     * @returns {function} Producer for a ChunkStream.
+     */
+    function getSubTreeProducer(node, own, chunkSize) {
+        const queue = [node];
+
+        return () => {
+            if (queue.length === 0) {
+                return Q(null);
+            }
+
+            const chunk = queue.splice(0, chunkSize);
+
+            return Q.all(chunk.map(chunkNode => own ? core.loadOwnChildren(chunkNode) : core.loadChildren(chunkNode)))
+                .then((childrenLists) => {
+                    childrenLists.forEach((children) => {
+                        Array.prototype.push.apply(queue, children);
+                    });
+
+                    return chunk;
+                });
+        };
+    }
+
+    /**
+     * Produces the nodes of the sub-tree in breadth-first or depth-first (pre-)order. The node itself is always
+     * produced, the sub-trees of pruned nodes are skipped.
+     * @param {object} node
+     * @param {object} options
+     * @param {string} [options.order='bfs'] - 'bfs' or 'dfs'.
+     * @param {number} [options.maxDepth] - Depth of the deepest nodes produced (the node is at depth 0).
+     * @param {string[]} [options.prunePaths] - Nodes at or below these paths are pruned.
+     * @param {boolean} [options.includeLibraries=true] - If false library roots are pruned.
+     * @param {object[]} pruneMetaNodes - Instances of these meta nodes are pruned.
+     * @param {number} chunkSize
+     * @returns {function} Producer for a ChunkStream.
+     */
+    function getTraverseProducer(node, options, pruneMetaNodes, chunkSize) {
+        const maxDepth = typeof options.maxDepth === 'number' ? options.maxDepth : Infinity;
+        const prunePaths = options.prunePaths || [];
+        const pending = [{node, depth: 0}];
+
+        const isPruned = (child) => {
+            const path = core.getPath(child);
+
+            return (options.includeLibraries === false && core.isLibraryRoot(child)) ||
+                prunePaths.some(prunePath => path === prunePath || path.startsWith(`${prunePath}/`)) ||
+                pruneMetaNodes.some(metaNode => core.isTypeOf(child, metaNode));
+        };
+
+        const loadChildren = (entry) => {
+            if (entry.depth >= maxDepth) {
+                return Q([]);
+            }
+
+            return core.loadChildren(entry.node)
+                .then(children => children
+                    .filter(child => !isPruned(child))
+                    .map(child => ({node: child, depth: entry.depth + 1})));
+        };
+
+        if (options.order === 'dfs') {
+            return () => {
+                const chunk = [];
+                const visitNext = () => {
+                    if (pending.length === 0 || chunk.length >= chunkSize) {
+                        return Q(chunk.length > 0 ? chunk : null);
+                    }
+
+                    const entry = pending.pop();
+                    chunk.push(entry.node);
+
+                    return loadChildren(entry)
+                        .then((children) => {
+                            for (let i = children.length - 1; i >= 0; i -= 1) {
+                                pending.push(children[i]);
+                            }
+
+                            return visitNext();
+                        });
+                };
+
+                return visitNext();
+            };
+        }
+
+        return () => {
+            if (pending.length === 0) {
+                return Q(null);
+            }
+
+            const chunk = pending.splice(0, chunkSize);
+
+            return Q.all(chunk.map(loadChildren))
+                .then((childrenLists) => {
+                    childrenLists.forEach((children) => {
+                        Array.prototype.push.apply(pending, children);
+                    });
+
+                    return chunk.map(entry => entry.node);
+                });
+        };
+    }
+
+    /**
+     * Describes the nodes chunk by chunk, the chunks hold records rather than nodes.
+     * @param {object[]} nodeWrappers
+     * @param {object} fields - See getDescribeFields.
+     * @param {number} chunkSize
+     * @returns {function} Producer for a ChunkStream.
+     */
+    function getDescribeProducer(nodeWrappers, fields, chunkSize) {
+        let index = 0;
+
+        return () => {
+            if (index >= nodeWrappers.length) {
+                return Q(null);
+            }
+
+            index += chunkSize;
+            return describeNodes(nodeWrappers.slice(index - chunkSize, index), fields);
+        };
+    }
+
+    /**
+     * Slices the nodes resolved by getNodes into chunks.
+     * @param {function} getNodes - Returns a promise resolving with all nodes.
+     * @param {number} chunkSize
+     * @returns {function} Producer for a ChunkStream.
+     */
+    function getListProducer(getNodes, chunkSize) {
+        let nodes = null;
+        let index = 0;
+
+        return () => {
+            return (nodes ? Q(nodes) : Q(getNodes()))
+                .then((nodes_) => {
+                    nodes = nodes_;
+                    if (index >= nodes.length) {
+                        return null;
+                    }
+
+                    index += chunkSize;
+                    return nodes.slice(index - chunkSize, index);
+                });
+        };
+    }
+
+    function closeStreams(ids) {
+        const idleTime = Date.now() - (opts.streamIdleTimeout || 60000);
+
+        Object.keys(streams)
+            .forEach((id) => {
+                if (streams[id].lastAccess < idleTime) {
+                    logger.warn('Closing idle stream', id);
+                    delete streams[id];
+                }
+            });
+
+        (ids || []).forEach((id) => {
+            delete streams[id];
+        });
+    }
+
+    /**
+     * The chunks are produced in the background between the pulls, outside of the request queue, so a stream is not
+     * isolated from mutations of its root (holding the root for the lifetime of the stream would block the client's
+     * own mutations between pulls).
+     * @param {function} produce - Producer of the chunks.
+     * @param {object} nodeWrapper - Wrapper of the node the stream was opened at (its rootId is given to the nodes).
+     * @param {number} window
+     * @param {boolean} records - The chunks hold records (rather than nodes) sent as they are.
+     * @returns {external:Promise} Resolves with the first chunk.
+     */
+    function openStream(produce, nodeWrapper, window, records) {
+        streamCounter += 1;
+        const id = String(streamCounter);
+        streams[id] = new ChunkStream(produce, window);
+        streams[id].nodeWrapper = nodeWrapper;
+        streams[id].records = records;
+
+        return pullStream(id);
+    }
+
+    function pullStream(id, window) {
+        const stream = streams[id];
+
+        if (!stream) {
+            return Q.reject(new Error(`No open stream with id [${id}]!`));
+        }
+
+        return stream.next(window)
+            .then((res) => {
+                if (res.done) {
+                    delete streams[id];
+                }
+
+                return {
+                    id,
+                    chunk: stream.records ? res.chunk :
+                        res.chunk.map(node => getNodeDataWrapper(node, stream.nodeWrapper)),
+                    done: res.done,
+                };
+            })
+            .catch((err) => {
+                delete streams[id];
+                throw err;
+            });
+    }
+
+    /**
+     * @param {object} nodeWrapper - The node to traverse from.
+     * @param {object} options - See getTraverseProducer.
+     * @param {object[]} [options.pruneMetaTypes] - Wrappers of the meta nodes whose instances are pruned.
+     * @param {object} [options.fields] - Send records with these fields (see getDescribeFields) rather than nodes.
+     * @param {number} chunkSize
+     * @param {number} window
+     * @returns {external:Promise} Resolves with the first chunk.
+     */
+    function openTraverseStream(nodeWrapper, options, chunkSize, window) {
+        const fields = options.fields ? getDescribeFields(options.fields) : null;
+
+        if (options.order && options.order !== 'bfs' && options.order !== 'dfs') {
+            return Q.reject(new Error(`Unknown traversal order [${options.order}], use bfs or dfs`));
+        }
+
+        return Q.all([getNode(nodeWrapper), Q.all((options.pruneMetaTypes || []).map(getNode))])
+            .then((nodes) => {
+                let produce = getTraverseProducer(nodes[0], options, nodes[1].filter(metaNode => metaNode), chunkSize);
+
+                if (fields) {
+                    const produceNodes = produce;
+                    produce = () => produceNodes()
+                        .then(chunk => chunk && chunk.map(node => describeNode(node, fields, nodeWrapper)));
+                }
+
+                return openStream(produce, nodeWrapper, window, fields !== null);
+            });
+    }
+
+    /**
+     * Streams large results in chunks, the client opens a stream and pulls one chunk per request.
+     * @param {object} req
+     * @param {string} req.name - 'open', 'next' or 'close'.
+     * @param {Array} req.args - [methodName, args, chunkSize, window] for open, [id, window] for next and [id] for
+     * close.
+     * @param {string[]} [req.close] - Ids of streams abandoned by the client.
+     * @returns {external:Promise}
+     */
+    function handleStreamRequest(req) {
+        switch (req.name) {
+            case 'open':
+                closeStreams(req.close);
+                if (req.args[0] === 'describeNodes') {
+                    return openStream(getDescribeProducer(req.args[1][0], getDescribeFields(req.args[1][1]),
+                        Math.max(req.args[2] || 1000, 1)), req.args[1][0][0], req.args[3], true);
+                }
+
+                if (req.args[0] === 'traverse') {
+                    return openTraverseStream(req.args[1][0], req.args[1][1] || {}, Math.max(req.args[2] || 1000, 1),
+                        req.args[3]);
+                }
+
+                return getNode(req.args[1][0])
+                    .then((node) => {
+                        const chunkSize = Math.max(req.args[2] || 1000, 1);
+                        let produce;
+
+                        switch (req.args[0]) {
+                            case 'loadSubTree':
+                            case 'loadOwnSubTree':
+                                produce = getSubTreeProducer(node, req.args[0] === 'loadOwnSubTree', chunkSize);
+                                break;
+                            case 'loadInstances':
+                                produce = getListProducer(() => core.loadInstances(node), chunkSize);
+                                break;
+                            case 'loadCollection':
+                                produce = getListProducer(() => core.loadCollection(node, req.args[1][1]), chunkSize);
+                                break;
+                            default:
+                                throw new Error(`Cannot stream [${req.args[0]}]`);
+                        }
+
+                        return openStream(produce, req.args[1][0], req.args[3], false);
+                    });
+            case 'next':
+                return pullStream(req.args[0], req.args[1]);
+            case 'close':
+                closeStreams([req.args[0]]);
+                return Q();
+            default:
+                return Q.reject(new Error(`Unexpected request name ${req.name} of type [${req.type}]`));
+        }
+    }
+
+    function closeProjectSession(projectId) {
+        const session = projectSessions[projectId];
+
+        if (session) {
+            delete projectSessions[projectId];
+            logger.debug('Closing project', projectId);
+            if (typeof session.close === 'function') {
+                Q(session.close())
+                    .catch(err => logger.warn('Failed to close project', projectId, err));
+            }
+        }
+    }
+
+    function closeIdleProjectSessions() {
+        const idleTime = Date.now() - (opts.projectIdleTimeout || 600000);
+
+        Object.keys(projectSessions)
+            .forEach((projectId) => {
+                if (projectSessions[projectId].lastAccess < idleTime) {
+                    closeProjectSession(projectId);
+                }
+            });
+    }
+
+    /**
+     * Returns the CoreZMQ handling the requests at the project, opening the project if needed. Each one has its own
+     * roots, node cache and streams.
+     * @param {string} projectId
+     * @returns {external:Promise}
+     */
+    function getProjectSession(projectId) {
+        let session = projectSessions[projectId];
+
+        if (!session) {
+            if (typeof opts.openProject !== 'function') {
+                return Q.reject(new Error('Server was not started with support for opening other projects!'));
+            }
+
+            logger.debug('Opening project', projectId);
+            session = projectSessions[projectId] = {
+                lastAccess: 0,
+                close: null,
+                promise: Q(opts.openProject(projectId))
+                    .then((opened) => {
+                        const otherIds = Object.keys(projectSessions).filter(id => id !== projectId);
+                        if (otherIds.length >= (opts.maxProjects || 16)) {
+                            closeProjectSession(otherIds.reduce((lru, id) =>
+                                projectSessions[id].lastAccess < projectSessions[lru].lastAccess ? id : lru));
+                        }
+
+                        session.close = opened.close;
+                        return new CoreZMQ(opened.project, opened.core, mainLogger, Object.assign({}, opts, {
+                            openProject: null,
+                            plugin: null,
+                        }));
+                    })
+                    .catch((err) => {
+                        if (projectSessions[projectId] === session) {
+                            delete projectSessions[projectId];
+                        }
+
+                        throw err;
+                    }),
+            };
+        }
+
+        session.lastAccess = Date.now();
+        return session.promise;
+    }
+
+    /**
+     * @param {string} projectName
+     * @param {string} [owner] - Defaults to the user of the server.
+     * @returns {external:Promise} Resolves with the projectId to put in the requests at the project.
+     */
+    function openProjectSession(projectName, owner) {
+        const projectId = (owner || project.getUserId()) + PROJECT_ID_SEP + projectName;
+
+        if (projectId === project.projectId) {
+            return Q(projectId);
+        }
+
+        return getProjectSession(projectId).then(() => projectId);
+    }
+
+    /**
+     * @param {object} req
+     * @returns {boolean} True if the request modifies a root or the project, i.e. is rejected in read-only mode.
+     */
+    function isMutatingRequest(req) {
+        if (req.type === 'batch') {
+            return (req.args[0] || []).some(isMutatingRequest);
+        } else if (req.type === 'core' && coreDispatch.hasOwnProperty(req.name)) {
+            return coreDispatch[req.name].mutates;
+        }
+
+        return MUTATING_REQUESTS.hasOwnProperty(req.type) && MUTATING_REQUESTS[req.type].hasOwnProperty(req.name);
+    }
+
+    /**
+     * Determines the roots accessed by a request and whether it modifies them, which orders the requests handled
+     * concurrently by a router socket.
+     * @param {object} req
+     * @returns {{keys: string[], exclusive: boolean}} The keys are the rootIds (prefixed by the projectId if given).
+     */
+    function getRequestAccess(req) {
+        const access = {keys: [], exclusive: false};
+        const prefix = req.projectId ? `${req.projectId}#` : '';
+
+        const addRoot = (nodeWrapper) => {
+            if (nodeWrapper && typeof nodeWrapper.rootId === 'string' &&
+                access.keys.indexOf(prefix + nodeWrapper.rootId) === -1) {
+                access.keys.push(prefix + nodeWrapper.rootId);
+            }
+        };
+
+        const collect = (call) => {
+            const args = call.args || [];
+
+            if (call.unloadRoots && call.unloadRoots.length > 0) {
+                call.unloadRoots.forEach(rootId => addRoot({rootId}));
+                access.exclusive = true;
+            }
+
+            if (call.type === 'batch') {
+                (args[0] || []).forEach(collect);
+                return;
+            } else if (call.type === 'core' && coreDispatch.hasOwnProperty(call.name)) {
+                const spec = coreDispatch[call.name];
+                spec.args.forEach((kind, i) => {
+                    if (kind === 'nodes') {
+                        (args[i] || []).forEach(addRoot);
+                    } else if (kind !== null) {
+                        addRoot(args[i]);
+                    }
+                });
+
+                access.exclusive = access.exclusive || spec.mutates;
+                return;
+            }
+
+            switch (call.name) {
+                case 'loadRoot':
+                    addRoot({rootId: args[0]});
+                    break;
+                case 'createNode':
+                    addRoot(args[0] && args[0].parent);
+                    addRoot(args[0] && args[0].base);
+                    break;
+                case 'createNodes':
+                    (args[0] || []).forEach((spec) => {
+                        addRoot(spec.parent);
+                        addRoot(spec.base);
+                    });
+                    break;
+                case 'getCommonBase':
+                case 'getCommonParent':
+                    (args[0] || []).forEach(addRoot);
+                    break;
+                case 'getValidChildrenMetaNodes':
+                case 'getValidSetElementsMetaNodes':
+                    addRoot(args[0] && args[0].node);
+                    break;
+                case 'describeNodes':
+                case 'getAttributes':
+                case 'getRegistries':
+                case 'deleteNodes':
+                    (args[0] || []).forEach(addRoot);
+                    break;
+                case 'setAttributes':
+                case 'setRegistries':
+                case 'setPointers':
+                    (args[0] || []).forEach((change) => {
+                        addRoot(change[0]);
+                        if (call.name === 'setPointers') {
+                            addRoot(change[2]);
+                        }
+                    });
+                    break;
+                case 'open':
+                    addRoot(args[1] && (Array.isArray(args[1][0]) ? args[1][0][0] : args[1][0]));
+                    break;
+                case 'next':
+                    addRoot(!req.projectId && streams.hasOwnProperty(args[0]) && streams[args[0]].nodeWrapper);
+                    break;
+                default:
+                    addRoot(args[0]);
+                    break;
+            }
+
+            access.exclusive = access.exclusive || EXCLUSIVE_REQUESTS.hasOwnProperty(call.name);
+        };
+
+        collect(req);
+
+        return access;
+    }
+
+    /**
+     * Dispatches the request to the handler of its type.
+     * @param {object} req
+     * @param {string} req.type
+     * @param {string} req.name
+     * @param {Array} req.args
+     * @param {string[]} [req.unloadRoots] - Roots released by the client, these are unloaded before the request is
+     * handled.
+     * @param {object} ctx - Context of the request message.
+     * @param {object|null} ctx.codec - The codec the request was encoded with (null for plain json).
+     * @param {object|null} ctx.compression - Compression the client accepts for the reply body.
+     * @param {boolean} ctx.compactNodes - The client accepts compact node lists in the reply.
+     * @param {Buffer[]|null} ctx.envelope - The routing frames to prepend to the reply (router sockets).
+     * @param {Buffer[]} ctx.attachments - Binary frames sent along with the request.
+     * @param {Buffer[]} ctx.replyAttachments - Binary frames to send along with the reply.
+     * @returns {external:Promise}
+     */
+    function handleRequest(req, ctx) {
+        let promise;
+
+        if (req.projectId && opts.openProject && req.projectId !== project.projectId) {
+            return getProjectSession(req.projectId)
+                .then(session => session.handleRequest(req, ctx));
+        }
+
+        try {
+            if (opts.readOnly && isMutatingRequest(req)) {
+                throw new Error(`Server is read-only, [${req.type}.${req.name}] is not allowed!`);
+            }
+
+            if (req.unloadRoots) {
+                req.unloadRoots.forEach(unloadRoot);
+            }
+
+            switch (req.type) {
+                case 'util':
+                    promise = handleUtilRequest(req);
+                    break;
+                case 'core':
+                    promise = handleCoreRequest(req);
+                    if (NODE_CACHE_INVALIDATIONS.hasOwnProperty(req.name)) {
+                        promise = promise.then((res) => {
+                            invalidateNodeCache(req);
+                            return res;
+                        }, (err) => {
+                            invalidateNodeCache(req);
+                            throw err;
+                        });
+                    }
+                    break;
+                case 'project':
+                    promise = handleProjectRequest(req);
+                    break;
+                case 'plugin':
+                    if (plugin) {
+                        promise = handlePluginRequest(req, ctx);
+                    } else {
+                        promise = Q.reject(new Error(`Corezmq wasn't initiated from a plugin - plugin requests.`));
+                    }
+                    break;
+                case 'batch':
+                    promise = handleBatchRequest(req, ctx);
+                    break;
+                case 'stream':
+                    promise = handleStreamRequest(req);
+                    break;
+                default:
+                    promise = Q.reject(new Error(`Unexpected request type [${req.type}]`));
+                    break;
+            }
+        } catch (e) {
+            promise = Q.reject(e);
+        }
+
+        return promise;
+    }
+
+    /**
+     * Handles a decoded request (as received from a client) without any socket involved, e.g. for benchmarks.
+     * @param {object} req
+     * @param {object} [ctx] - Context of the request message (see handleRequest).
+     * @returns {external:Promise}
+     */
+    this.handleRequest = (req, ctx) => {
+        return handleRequest(req, ctx || {
+            codec: null,
+            compression: null,
+            compactNodes: false,
+            envelope: null,
+            attachments: [],
+            replyAttachments: [],
+        });
+    };
+
+    /**
+     * Loads the root and its tree (down to the given depth) before any client asks for it, the root is kept loaded
+     * as if loaded by a client.
+     * @param {string} rootHash
+     * @param {number|null} [depth] - Number of levels below the root to load (null loads the entire tree).
+     * @returns {external:Promise} Resolves with the number of loaded nodes.
+     */
+    this.preload = (rootHash, depth) => {
+        const status = {loaded: 1};
+        const loadedRoot = rootCache.get(rootHash);
+
+        return (loadedRoot ? Q(loadedRoot) : core.loadRoot(rootHash))
+            .then((rootNode) => {
+                if (!loadedRoot) {
+                    addRoot(rootHash, rootNode);
+                }
+
+                return loadTree(rootNode, typeof depth === 'number' ? depth : null, false, status);
+            })
+            .then(() => status.loaded);
+    };
+
     /**
      *
      * @param {function} [callback]
      * @param {null|Error} callback.err
-     * @param {number} callback.port
+     * @param {number|string} callback.port - The port listened at or the address if one was given (or ipc used).
      * @returns {external:Promise}
      */
     this.startServer = (callback) => {
-        responder.on('message', (rawReq) => {
+        responder = zmq.socket(socketType);
+        if (socketType === 'router') {
+            requestQueue = new RequestQueue(opts.maxInFlight);
+        }
+        if (opts.openProject) {
+            projectSweepTimer = setInterval(closeIdleProjectSessions, 60000);
+            projectSweepTimer.unref();
+        }
+
+        responder.on('message', (...frames) => {
+            const ctx = {
+                codec: null,
+                compression: null,
+                compactNodes: false,
+                envelope: null,
+                attachments: [],
+                replyAttachments: [],
+            };
             let req;
 
+            if (socketType === 'router') {
+                // [identity, '', ...] from REQ and [identity, requestId, ...] from DEALER clients.
+                ctx.envelope = frames.slice(0, 2);
+                frames = frames.slice(2);
+            }
+
             try {
-                const reqStr = rawReq.toString();
-                logger.debug('req:', reqStr);
-                req = JSON.parse(reqStr);
+                const decoded = codecs.decodeMessage(frames);
+                ctx.codec = decoded.codec;
+                ctx.compression = decoded.compression;
+                ctx.compactNodes = decoded.compactNodes;
+                ctx.attachments = decoded.attachments;
+                req = decoded.payload;
+                if (debugEnabled) {
+                    logger.debug('req:', req);
+                }
             } catch (e) {
-                sendError(new Error(`Failed to parse request to json: ${rawReq.toString()}`),
-                    'Unable to parse request.');
+                sendError(new Error(`Failed to parse request: ${e.message}`), 'Unable to parse request.', ctx);
                 return;
             }
 
             let promise;
-
             try {
-                switch (req.type) {
-                    case 'util':
-                        promise = handleUtilRequest(req);
-                        break;
-                    case 'core':
-                        promise = handleCoreRequest(req);
-                        break;
-                    case 'project':
-                        promise = handleProjectRequest(req);
-                        break;
-                    case 'plugin':
-                        if (plugin) {
-                            promise = handlePluginRequest(req);
-                        } else {
-                            promise = Q.reject(new Error(`Corezmq wasn't initiated from a plugin - plugin requests.`));
-                        }
-                        break;
-                    default:
-                        promise = Q.reject(new Error(`Unexpected request type [${req.type}]`));
-                        break;
+                if (requestQueue) {
+                    const access = getRequestAccess(req);
+                    promise = requestQueue.schedule(access.keys, access.exclusive, () => handleRequest(req, ctx));
+                } else {
+                    promise = handleRequest(req, ctx);
                 }
             } catch (e) {
+                // A malformed request (e.g. null or a string in place of nodes) must not take down the server.
                 promise = Q.reject(e);
             }
 
-            promise.then(sendResult).catch(err => sendError(err, req));
+            promise
+                .then(res => sendResult(res, ctx))
+                .catch(err => sendError(err, req, ctx));
         });
         const maxAttempts = initialPort + portAttempts;
 
@@ -910,6 +2017,15 @@ function CoreZMQ(project, core, mainLogger, opts) {
             return deferred.promise;
         }
 
+        if (!address && initialPort === 0) {
+            return Q.ninvoke(responder, 'bind', 'tcp://127.0.0.1:*')
+                .then(() => {
+                    const endpoint = responder.getsockopt(zmq.ZMQ_LAST_ENDPOINT).toString();
+                    return parseInt(endpoint.substring(endpoint.lastIndexOf(':') + 1), 10);
+                })
+                .nodeify(callback);
+        }
+
         return bindToPortRec(initialPort).nodeify(callback);
     };
 
@@ -919,7 +2035,17 @@ function CoreZMQ(project, core, mainLogger, opts) {
      * @returns {Promise}
      */
     this.stopServer = (callback) => {
-        responder.close();
+        if (responder) {
+            responder.close();
+        }
+
+        clearInterval(projectSweepTimer);
+        Object.keys(projectSessions).forEach(closeProjectSession);
+        if (ipcPath) {
+            // zmq normally removes the socket file on close, this cleans up after an unclean close.
+            fs.unlink(ipcPath, () => {});
+        }
+
         return Q().nodeify(callback);
     };
 }
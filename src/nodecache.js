@@ -0,0 +1,103 @@
+/* eslint-env node */
+/**
+ * Per-root LRU cache from node path to the node loaded from the core, which saves walking the containment
+ * path from the root (core.loadByPath) on every request.
+ */
+
+/**
+ * @param {number} [maxSize=10000] - The maximum number of cached nodes per root.
+ * @constructor
+ */
+function NodeCache(maxSize) {
+    this.maxSize = typeof maxSize === 'number' ? maxSize : 10000;
+    this.roots = {};
+    this.hits = 0;
+    this.misses = 0;
+    this.evictions = 0;
+    this.invalidations = 0;
+}
+
+/**
+ * @param {string} rootId
+ * @param {string} nodePath
+ * @returns {object|undefined} The cached node.
+ */
+NodeCache.prototype.get = function (rootId, nodePath) {
+    const nodes = this.roots[rootId];
+    const node = nodes && nodes.get(nodePath);
+
+    if (node) {
+        this.hits += 1;
+        // Move to the end of the insertion order, i.e. mark as most recently used.
+        nodes.delete(nodePath);
+        nodes.set(nodePath, node);
+    } else {
+        this.misses += 1;
+    }
+
+    return node;
+};
+
+NodeCache.prototype.set = function (rootId, nodePath, node) {
+    if (this.maxSize <= 0) {
+        return;
+    }
+
+    let nodes = this.roots[rootId];
+    if (!nodes) {
+        nodes = this.roots[rootId] = new Map();
+    }
+
+    nodes.set(nodePath, node);
+    if (nodes.size > this.maxSize) {
+        nodes.delete(nodes.keys().next().value);
+        this.evictions += 1;
+    }
+};
+
+/**
+ * Removes the node at the path and all cached nodes below it.
+ * @param {string} rootId
+ * @param {string} nodePath
+ */
+NodeCache.prototype.invalidate = function (rootId, nodePath) {
+    const nodes = this.roots[rootId];
+
+    if (!nodes) {
+        return;
+    }
+
+    const prefix = nodePath + '/';
+    for (const key of Array.from(nodes.keys())) {
+        if (key === nodePath || key.startsWith(prefix)) {
+            nodes.delete(key);
+            this.invalidations += 1;
+        }
+    }
+};
+
+/**
+ * Removes all cached nodes of the root.
+ * @param {string} rootId
+ */
+NodeCache.prototype.clear = function (rootId) {
+    if (this.roots[rootId]) {
+        this.invalidations += this.roots[rootId].size;
+        delete this.roots[rootId];
+    }
+};
+
+/**
+ * @returns {{hits: number, misses: number, evictions: number, invalidations: number, size: number}}
+ */
+NodeCache.prototype.getStats = function () {
+    return {
+        hits: this.hits,
+        misses: this.misses,
+        evictions: this.evictions,
+        invalidations: this.invalidations,
+        size: Object.keys(this.roots).reduce((sum, rootId) => sum + this.roots[rootId].size, 0),
+    };
+};
+
+module.exports = NodeCache;
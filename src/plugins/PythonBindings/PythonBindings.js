@@ -19,7 +19,8 @@ define([
 
     pluginMetadata = JSON.parse(pluginMetadata);
 
-    const START_PORT = 5555;
+    // Listen at a unique ipc:// address (or on windows an available tcp port) which is passed to the script.
+    const USE_IPC = process.platform !== 'win32';
     const COMMAND = 'python';
     const SCRIPT_FILE = 'src/plugins/PythonBindings/run_plugin.py';
 
@@ -113,10 +114,10 @@ define([
             return deferred.promise;
         };
 
-        const corezmq = new CoreZMQ(this.project, this.core, logger, {port: START_PORT, plugin: this});
+        const corezmq = new CoreZMQ(this.project, this.core, logger, {port: 0, ipc: USE_IPC, plugin: this});
         corezmq.startServer()
             .then((port) => {
-                logger.info(`zmq-server listening at port ${port}`);
+                logger.info(`zmq-server listening at ${port}`);
                 return callScript(COMMAND, SCRIPT_FILE, port);
             })
             .then(() => {
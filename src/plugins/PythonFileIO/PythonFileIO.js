@@ -24,7 +24,8 @@ define([
     pluginMetadata = JSON.parse(pluginMetadata);
     const path = require('path');
     // Modify these as needed..
-    const START_PORT = 5555;
+    // Listen at a unique ipc:// address (or on windows an available tcp port) which is passed to the script.
+    const USE_IPC = process.platform !== 'win32';
     const COMMAND = 'python';
     const SCRIPT_FILE = path.join(path.dirname(module.uri), 'run_plugin.py');
 
@@ -119,10 +120,10 @@ define([
             return deferred.promise;
         };
 
-        const corezmq = new CoreZMQ(this.project, this.core, this.logger, {port: START_PORT, plugin: this});
+        const corezmq = new CoreZMQ(this.project, this.core, this.logger, {port: 0, ipc: USE_IPC, plugin: this});
         corezmq.startServer()
             .then((port) => {
-                logger.info(`zmq-server listening at port ${port}`);
+                logger.info(`zmq-server listening at ${port}`);
                 return callScript(COMMAND, SCRIPT_FILE, port);
             })
             .then(() => {
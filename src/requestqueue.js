@@ -0,0 +1,128 @@
+/* eslint-env node */
+/**
+ * Schedules the requests handled concurrently by a router socket. Requests are started in the order they arrive,
+ * limited by the maximum number in flight, and each lists the keys (roots) it accesses. Any number of shared
+ * (read-only) requests at a key run at the same time, whereas an exclusive request (mutation) waits for all earlier
+ * requests at its keys and holds back all later ones, i.e. the requests at a root are ordered as if handled
+ * one at a time.
+ */
+
+const Q = require('q');
+
+/**
+ * @param {number} [maxInFlight=64] - The maximum number of requests handled at the same time.
+ * @constructor
+ */
+function RequestQueue(maxInFlight) {
+    this.maxInFlight = Math.max(maxInFlight || 64, 1);
+    this.inFlight = 0;
+    this.waiting = [];
+    // key -> {readers: number, writer: boolean} of the running requests.
+    this.running = new Map();
+}
+
+/**
+ * @param {string[]} keys - The keys accessed by the request.
+ * @param {boolean} exclusive - The request mutates the data at the keys.
+ * @param {function} run - Starts the request and returns a promise.
+ * @returns {external:Promise} Settled as the promise returned by run.
+ */
+RequestQueue.prototype.schedule = function (keys, exclusive, run) {
+    const deferred = Q.defer();
+
+    this.waiting.push({keys, exclusive, run, deferred});
+    this._startWaiting();
+
+    return deferred.promise;
+};
+
+RequestQueue.prototype._startWaiting = function () {
+    // Access of the requests still waiting in front of the one inspected, these cannot be overtaken at their keys.
+    const blocked = new Map();
+    const stillWaiting = [];
+
+    this.waiting.forEach((task) => {
+        if (this.inFlight < this.maxInFlight && this._isStartable(task, blocked)) {
+            this._start(task);
+        } else {
+            stillWaiting.push(task);
+            task.keys.forEach((key) => {
+                if (task.exclusive || !blocked.has(key)) {
+                    blocked.set(key, task.exclusive);
+                }
+            });
+        }
+    });
+
+    this.waiting = stillWaiting;
+};
+
+RequestQueue.prototype._isStartable = function (task, blocked) {
+    return task.keys.every((key) => {
+        const state = this.running.get(key);
+
+        if (blocked.has(key) && (task.exclusive || blocked.get(key))) {
+            return false;
+        } else if (!state) {
+            return true;
+        }
+
+        return !state.writer && (!task.exclusive || state.readers === 0);
+    });
+};
+
+RequestQueue.prototype._start = function (task) {
+    this.inFlight += 1;
+    task.keys.forEach((key) => {
+        let state = this.running.get(key);
+        if (!state) {
+            state = {readers: 0, writer: false};
+            this.running.set(key, state);
+        }
+
+        if (task.exclusive) {
+            state.writer = true;
+        } else {
+            state.readers += 1;
+        }
+    });
+
+    let promise;
+    try {
+        promise = Q(task.run());
+    } catch (e) {
+        promise = Q.reject(e);
+    }
+
+    promise
+        .finally(() => {
+            this.inFlight -= 1;
+            task.keys.forEach((key) => {
+                const state = this.running.get(key);
+                if (task.exclusive) {
+                    state.writer = false;
+                } else {
+                    state.readers -= 1;
+                }
+
+                if (!state.writer && state.readers === 0) {
+                    this.running.delete(key);
+                }
+            });
+
+            this._startWaiting();
+        })
+        .then(task.deferred.resolve, task.deferred.reject);
+};
+
+/**
+ * @returns {{inFlight: number, queued: number}}
+ */
+RequestQueue.prototype.getStats = function () {
+    return {
+        inFlight: this.inFlight,
+        queued: this.waiting.length,
+    };
+};
+
+module.exports = RequestQueue;
@@ -0,0 +1,111 @@
+/* eslint-env node */
+/**
+ * LRU cache of the results of read requests, used by a read-only CoreZMQ where the result of a call at a root can
+ * never change. The size of the cached results is bounded by a byte budget (estimated from their json length) and
+ * identical requests arriving while the result is computed share the computation.
+ */
+
+/**
+ * @param {number} [maxBytes=67108864] - The maximum (estimated) size of the cached results (0 disables the cache).
+ * @constructor
+ */
+function ResponseCache(maxBytes) {
+    this.maxBytes = typeof maxBytes === 'number' ? maxBytes : 64 * 1024 * 1024;
+    this.bytes = 0;
+    // key -> {value, size}
+    this.entries = new Map();
+    // key -> promise of the result being computed
+    this.pending = new Map();
+    this.hits = 0;
+    this.misses = 0;
+    this.joined = 0;
+    this.evictions = 0;
+}
+
+function estimateSize(key, value) {
+    const json = value === undefined ? '' : JSON.stringify(value);
+
+    return key.length + (json ? json.length : 0);
+}
+
+/**
+ * Returns the cached result, the one being computed or starts computing it.
+ * @param {string} key
+ * @param {function} compute - Returns the result or a promise of it.
+ * @returns {Promise}
+ */
+ResponseCache.prototype.get = function (key, compute) {
+    const entry = this.entries.get(key);
+
+    if (entry) {
+        this.hits += 1;
+        // Move to the end of the insertion order, i.e. mark as most recently used.
+        this.entries.delete(key);
+        this.entries.set(key, entry);
+        return Promise.resolve(entry.value);
+    } else if (this.pending.has(key)) {
+        this.joined += 1;
+        return this.pending.get(key);
+    }
+
+    this.misses += 1;
+
+    let promise;
+    try {
+        promise = Promise.resolve(compute());
+    } catch (e) {
+        return Promise.reject(e);
+    }
+
+    promise = promise
+        .then((value) => {
+            this.pending.delete(key);
+            this._add(key, value);
+            return value;
+        }, (err) => {
+            this.pending.delete(key);
+            throw err;
+        });
+
+    this.pending.set(key, promise);
+
+    return promise;
+};
+
+ResponseCache.prototype._add = function (key, value) {
+    const size = estimateSize(key, value);
+
+    if (size > this.maxBytes) {
+        return;
+    }
+
+    this.entries.set(key, {value, size});
+    this.bytes += size;
+
+    while (this.bytes > this.maxBytes) {
+        const oldestKey = this.entries.keys().next().value;
+        this.bytes -= this.entries.get(oldestKey).size;
+        this.entries.delete(oldestKey);
+        this.evictions += 1;
+    }
+};
+
+/**
+ * @returns {{size: number, bytes: number, hits: number, misses: number, joined: number, evictions: number,
+ * hitRate: number}} Joined counts requests served from a computation already in flight, the hit rate includes them.
+ */
+ResponseCache.prototype.getStats = function () {
+    const requests = this.hits + this.joined + this.misses;
+
+    return {
+        size: this.entries.size,
+        bytes: this.bytes,
+        hits: this.hits,
+        misses: this.misses,
+        joined: this.joined,
+        evictions: this.evictions,
+        hitRate: requests > 0 ? (this.hits + this.joined) / requests : 0,
+    };
+};
+
+module.exports = ResponseCache;
@@ -0,0 +1,169 @@
+/* eslint-env node */
+/**
+ * The roots loaded by the clients, keyed by their rootId (the hash they were loaded from). Roots not modified since
+ * they were loaded (clean) can be reloaded from their hash at any time, so when more than the maximum number of roots
+ * are loaded, or the heap used exceeds the budget, the least recently used clean roots are evicted. Modified (dirty)
+ * roots are only removed when unloaded by the client. The ids of evicted roots are remembered (to reload them) up to a
+ * maximum number, beyond it the earliest evicted are forgotten, i.e. are treated as unloaded.
+ */
+
+/**
+ * @param {number} [maxRoots=0] - The maximum number of loaded roots (0 for no limit).
+ * @param {number} [maxHeapUsed=0] - Heap used (bytes) above which clean roots are evicted at loads (0 for no limit).
+ * @param {number} [maxEvicted=10000] - The maximum number of evicted rootIds remembered for reloading.
+ * @constructor
+ */
+function RootCache(maxRoots, maxHeapUsed, maxEvicted) {
+    this.maxRoots = maxRoots || 0;
+    this.maxHeapUsed = maxHeapUsed || 0;
+    this.maxEvicted = typeof maxEvicted === 'number' ? maxEvicted : 10000;
+    // rootId -> {node, dirty, lastUsed}
+    this.roots = new Map();
+    // rootIds of the evicted roots, these are reloaded when accessed again.
+    this.evicted = new Set();
+    this.useCounter = 0;
+    this.evictions = 0;
+    this.reloads = 0;
+}
+
+/**
+ * @param {string} rootId
+ * @returns {object|undefined} The root node (undefined if not loaded or evicted).
+ */
+RootCache.prototype.get = function (rootId) {
+    const entry = this.roots.get(rootId);
+
+    if (entry) {
+        this.useCounter += 1;
+        entry.lastUsed = this.useCounter;
+        return entry.node;
+    }
+};
+
+/**
+ * @param {string} rootId
+ * @returns {boolean} True if the root was evicted and can be reloaded from its hash.
+ */
+RootCache.prototype.isEvicted = function (rootId) {
+    return this.evicted.has(rootId);
+};
+
+/**
+ * Adds a loaded (or reloaded) root and evicts roots beyond the budget.
+ * @param {string} rootId
+ * @param {object} node
+ * @returns {string[]} The rootIds of the evicted roots.
+ */
+RootCache.prototype.set = function (rootId, node) {
+    this.useCounter += 1;
+    if (this.evicted.delete(rootId)) {
+        this.reloads += 1;
+    }
+
+    this.roots.set(rootId, {node, dirty: false, lastUsed: this.useCounter});
+
+    const evictedIds = [];
+    const evictOne = () => {
+        let lru = null;
+        this.roots.forEach((entry, id) => {
+            if (!entry.dirty && id !== rootId && (lru === null || entry.lastUsed < this.roots.get(lru).lastUsed)) {
+                lru = id;
+            }
+        });
+
+        if (lru !== null) {
+            this.roots.delete(lru);
+            this._addEvicted(lru);
+            this.evictions += 1;
+            evictedIds.push(lru);
+        }
+
+        return lru !== null;
+    };
+
+    while (this.maxRoots > 0 && this.roots.size > this.maxRoots && evictOne()) {
+        // Evicting down to the maximum number of roots.
+    }
+
+    while (this.maxHeapUsed > 0 && this._getHeapUsed() > this.maxHeapUsed && evictOne()) {
+        // Evicting until under the budget or no clean roots remain.
+    }
+
+    return evictedIds;
+};
+
+/**
+ * Marks the root as modified, i.e. it cannot be evicted anymore.
+ * @param {string} rootId
+ * @param {object} node - The root node being modified, put back if it was evicted (or replaced by a reload) while
+ * the request was resolving its nodes.
+ * @returns {boolean} True if the node was put back.
+ */
+RootCache.prototype.markDirty = function (rootId, node) {
+    const entry = this.roots.get(rootId);
+
+    if (entry && entry.node === node) {
+        entry.dirty = true;
+        return false;
+    } else if (!entry && !this.evicted.has(rootId)) {
+        // Unloaded by the client.
+        return false;
+    }
+
+    this.useCounter += 1;
+    this.evicted.delete(rootId);
+    this.roots.set(rootId, {node, dirty: true, lastUsed: this.useCounter});
+
+    return true;
+};
+
+RootCache.prototype._addEvicted = function (rootId) {
+    this.evicted.add(rootId);
+
+    // A Set iterates in insertion order, i.e. the earliest evicted first.
+    for (const id of this.evicted) {
+        if (this.evicted.size <= this.maxEvicted) {
+            break;
+        }
+
+        this.evicted.delete(id);
+    }
+};
+
+/**
+ * The heap only shrinks once collected, so when the process exposes the collector (node --expose-gc) it is run before
+ * measuring, otherwise evicting roots does not lower the measure and all clean roots are evicted when over budget.
+ * @returns {number}
+ */
+RootCache.prototype._getHeapUsed = function () {
+    if (typeof global.gc === 'function') {
+        global.gc();
+    }
+
+    return process.memoryUsage().heapUsed;
+};
+
+RootCache.prototype.delete = function (rootId) {
+    this.roots.delete(rootId);
+    this.evicted.delete(rootId);
+};
+
+/**
+ * @returns {{size: number, dirty: number, evicted: number, evictions: number, reloads: number}}
+ */
+RootCache.prototype.getStats = function () {
+    let dirty = 0;
+    this.roots.forEach((entry) => {
+        dirty += entry.dirty ? 1 : 0;
+    });
+
+    return {
+        size: this.roots.size,
+        dirty,
+        evicted: this.evicted.size,
+        evictions: this.evictions,
+        reloads: this.reloads,
+    };
+};
+
+module.exports = RootCache;
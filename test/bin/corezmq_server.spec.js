@@ -5,9 +5,10 @@ describe.skip('corezmq-server', function () {
         corezmq_server = require('../../bin/corezmq_server'),
         cp = require('child_process'),
         gmeConfig = testFixture.getGmeConfig(),
-        //expect = testFixture.expect,
+        expect = testFixture.expect,
         logger = testFixture.logger.fork('PythonBindings'),
         projectName = 'PythonTestProject',
+        otherProjectName = 'PythonOtherTestProject',
         PYTHON_TEST_TOP_DIR = testFixture.path.join(process.cwd(), 'python', 'webgme_bindings'),
         PYTHON_TEST_START_DIR = testFixture.path.join(PYTHON_TEST_TOP_DIR, 'webgme_bindings');
 
@@ -61,10 +62,13 @@ describe.skip('corezmq-server', function () {
                     gmeConfig: gmeConfig
                 };
 
-                return testFixture.importProject(storage, importParam);
+                return testFixture.Q.all([
+                    testFixture.importProject(storage, importParam),
+                    testFixture.importProject(storage, Object.assign({}, importParam, {projectName: otherProjectName})),
+                ]);
             })
-            .then((importResult) => {
-                project = importResult.project;
+            .then((importResults) => {
+                project = importResults[0].project;
                 return storage.closeDatabase();
             })
             .then(() => {
@@ -113,4 +117,378 @@ describe.skip('corezmq-server', function () {
             })
             .nodeify(done);
     });
-});
\ No newline at end of file
+});
+describe('corezmq-server main', function () {
+    const testFixture = require('../globals'),
+        corezmq_server = require('../../bin/corezmq_server'),
+        zmq = require('zeromq/v5-compat'),
+        cp = require('child_process'),
+        Q = testFixture.Q,
+        gmeConfig = testFixture.getGmeConfig(),
+        expect = testFixture.expect,
+        logger = testFixture.logger.fork('corezmq-server-main'),
+        projectName = 'CoreZMQServerMainProject';
+
+    let gmeAuth,
+        storage,
+        rootHash,
+        server,
+        cliProcess,
+        sockets;
+
+    /**
+     * Starts the server from the command line and resolves with the port (or address) it listens at.
+     */
+    function startCli(args) {
+        const deferred = Q.defer();
+
+        cliProcess = cp.fork(testFixture.path.join(__dirname, '..', '..', 'bin', 'corezmq_server.js'),
+            [projectName].concat(args), {env: process.env, silent: true});
+        cliProcess.once('message', msg => deferred.resolve(msg.port));
+        cliProcess.once('exit', code => deferred.reject(new Error(`Server exited with code ${code}`)));
+
+        return deferred.promise;
+    }
+
+    /**
+     * Sends the request from a (new) REQ socket and resolves with the decoded reply.
+     */
+    function request(socket, payload) {
+        const deferred = Q.defer();
+        socket.once('message', msg => deferred.resolve(JSON.parse(msg.toString())));
+        socket.send(JSON.stringify(payload));
+
+        return deferred.promise;
+    }
+
+    function connect(port, type) {
+        const socket = zmq.socket(type || 'req');
+        socket.connect(typeof port === 'number' ? `tcp://127.0.0.1:${port}` : port);
+        sockets.push(socket);
+
+        return socket;
+    }
+
+    before(function (done) {
+        testFixture.clearDBAndGetGMEAuth(gmeConfig, projectName)
+            .then((gmeAuth_) => {
+                gmeAuth = gmeAuth_;
+                storage = testFixture.getMongoStorage(logger, gmeConfig, gmeAuth);
+                return storage.openDatabase();
+            })
+            .then(() => {
+                return testFixture.importProject(storage, {
+                    projectSeed: testFixture.path.join(testFixture.SEED_DIR, 'EmptyProject.webgmex'),
+                    projectName: projectName,
+                    branchName: 'master',
+                    logger: logger,
+                    gmeConfig: gmeConfig
+                });
+            })
+            .then((importResult) => {
+                return importResult.project.loadObject(importResult.commitHash);
+            })
+            .then((commitObject) => {
+                rootHash = commitObject.root;
+                return storage.closeDatabase();
+            })
+            .then(() => {
+                return gmeAuth.unload();
+            })
+            .nodeify(done);
+    });
+
+    beforeEach(function () {
+        sockets = [];
+    });
+
+    afterEach(function (done) {
+        sockets.forEach(socket => socket.close());
+        if (cliProcess) {
+            cliProcess.kill('SIGTERM');
+            cliProcess = null;
+        }
+
+        if (server) {
+            server.shutdown().finally(() => {
+                server = null;
+                done();
+            });
+        } else {
+            done();
+        }
+    });
+
+    it('should give the command line options as the parameters of main', function () {
+        const program = corezmq_server.createProgram(gmeConfig)
+            .parse(['node', 'corezmq_server.js', projectName, '-w', '2', '-p', '0', '--router', '--ipc'],
+                {from: 'node'});
+
+        expect(program.args).to.deep.equal([projectName]);
+        expect(program.opts()).to.include({workers: '2', port: '0', router: true, ipc: true});
+    });
+
+    it('should start the workers with the options of the broker', function () {
+        const parameters = {projectName, user: 'someUser', maxRoots: 5, readOnly: true, preload: ['master:2']};
+        const program = corezmq_server.createProgram(gmeConfig)
+            .parse(['node', 'corezmq_server.js'].concat(corezmq_server.getWorkerArgs(parameters)), {from: 'node'});
+
+        expect(program.args).to.deep.equal([projectName]);
+        expect(program.opts()).to.include({router: true, user: 'someUser', maxRoots: '5', readOnly: true});
+        expect(program.opts().preload).to.deep.equal(['master:2']);
+        if (process.platform === 'win32') {
+            expect(program.opts().port).to.equal('0');
+        } else {
+            expect(program.opts().ipc).to.equal(true);
+        }
+    });
+
+    it('should bind to an available port when port is 0', function (done) {
+        corezmq_server({projectName, gmeConfig, logger, port: 0})
+            .then((server_) => {
+                server = server_;
+                expect(typeof server.port).to.equal('number');
+                expect(server.port).to.be.greaterThan(0);
+            })
+            .nodeify(done);
+    });
+
+    it('should listen at a unique ipc address', function (done) {
+        if (process.platform === 'win32') {
+            this.skip();
+        }
+
+        corezmq_server({projectName, gmeConfig, logger, ipc: true})
+            .then((server_) => {
+                server = server_;
+                expect(server.port).to.match(/^ipc:\/\/.*\.ipc$/);
+                expect(testFixture.fs.existsSync(server.port.substring('ipc://'.length))).to.equal(true);
+            })
+            .nodeify(done);
+    });
+
+    it('should reject mutations and serve reads when read-only', function (done) {
+        const rootNode = {rootId: rootHash, nodePath: ''};
+        let socket;
+
+        corezmq_server({projectName, gmeConfig, logger, port: 0, readOnly: true, responseCacheSize: 1})
+            .then((server_) => {
+                server = server_;
+                socket = connect(server.port);
+                return request(socket, {type: 'core', name: 'loadRoot', args: [rootHash]});
+            })
+            .then((res) => {
+                expect(res.err).to.equal(undefined);
+                return request(socket, {type: 'project', name: 'createBranch', args: ['newBranch', '#hash']});
+            })
+            .then((res) => {
+                expect(res.err.message).to.contain('read-only');
+                return request(socket, {type: 'core', name: 'setAttributes', args: [[[rootNode, 'name', 'x']]]});
+            })
+            .then((res) => {
+                expect(res.err.message).to.contain('read-only');
+                return request(socket, {type: 'util', name: 'save', args: [rootNode, 'master']});
+            })
+            .then((res) => {
+                expect(res.err.message).to.contain('read-only');
+                return request(socket, {type: 'core', name: 'getAttribute', args: [rootNode, 'name']});
+            })
+            .then((res) => {
+                expect(res.res).to.equal('ROOT');
+                return request(socket, {type: 'util', name: 'getServerStats', args: []});
+            })
+            .then((res) => {
+                expect(res.res.responseCache).to.include({size: 1, misses: 1});
+            })
+            .nodeify(done);
+    });
+
+    it('should preload the given branches and size the storage cache', function (done) {
+        const config = testFixture.getGmeConfig();
+
+        corezmq_server({projectName, gmeConfig: config, logger, port: 0, preload: ['master:1'], cacheSize: '3000'})
+            .then((server_) => {
+                server = server_;
+                expect(config.storage.cache).to.equal(3000);
+                expect(config.storage.clientCacheSize).to.equal(3000);
+                return corezmq_server({projectName, gmeConfig, logger, port: 0, preload: ['noSuchBranch']});
+            })
+            .then(() => {
+                throw new Error('Should have failed!');
+            })
+            .catch((err) => {
+                expect(err.message).to.include('No branch or tag [noSuchBranch] to preload!');
+            })
+            .nodeify(done);
+    });
+
+    it('should bind to an available port given -p 0', function (done) {
+        this.timeout(20000);
+
+        startCli(['-p', '0'])
+            .then((port) => {
+                expect(typeof port).to.equal('number');
+                expect(port).to.not.equal(5555);
+                return request(connect(port), {type: 'util', name: 'gmeConfig', args: []});
+            })
+            .then((res) => {
+                expect(res.err).to.equal(null);
+            })
+            .nodeify(done);
+    });
+
+    it('should listen at a unique ipc address given --ipc', function (done) {
+        if (process.platform === 'win32') {
+            this.skip();
+        }
+
+        this.timeout(20000);
+
+        startCli(['--ipc'])
+            .then((address) => {
+                expect(address).to.match(/^ipc:\/\/.*\.ipc$/);
+                return request(connect(address), {type: 'util', name: 'gmeConfig', args: []});
+            })
+            .then((res) => {
+                expect(res.err).to.equal(null);
+            })
+            .nodeify(done);
+    });
+
+    it('should listen with a router socket given --router', function (done) {
+        this.timeout(20000);
+        const replies = [];
+
+        startCli(['--router', '-p', '0'])
+            .then((port) => {
+                const deferred = Q.defer();
+                const client = connect(port, 'dealer');
+
+                client.on('message', (requestId, msg) => {
+                    replies.push({id: requestId.toString(), res: JSON.parse(msg.toString())});
+                    if (replies.length === 2) {
+                        deferred.resolve();
+                    }
+                });
+
+                // The root is read from the database whereas the config is at hand, so the second request completes
+                // first - a REP socket would handle (and reply to) them one at a time.
+                client.send(['1', JSON.stringify({type: 'core', name: 'loadRoot', args: [rootHash]})]);
+                client.send(['2', JSON.stringify({type: 'util', name: 'gmeConfig', args: []})]);
+
+                return deferred.promise;
+            })
+            .then(() => {
+                expect(replies.map(reply => reply.id)).to.deep.equal(['2', '1']);
+                expect(replies[1].res.err).to.equal(null);
+                expect(replies[1].res.res).to.deep.equal({rootId: rootHash, nodePath: ''});
+            })
+            .nodeify(done);
+    });
+
+    it('should route the requests of two clients through the workers', function (done) {
+        this.timeout(20000);
+
+        corezmq_server({projectName, gmeConfig, logger, port: 0, workers: 2})
+            .then((server_) => {
+                server = server_;
+                const clients = [connect(server.port), connect(server.port)];
+
+                // The root is only loaded at the worker of the client, so the second request fails unless routed
+                // to the same worker.
+                return Q.all(clients.map((client) => {
+                    return request(client, {type: 'core', name: 'loadRoot', args: [rootHash]})
+                        .then((res) => {
+                            expect(res.err).to.equal(null);
+                            return request(client, {type: 'core', name: 'getAttribute', args: [res.res, 'name']});
+                        });
+                }));
+            })
+            .then((results) => {
+                results.forEach((res) => {
+                    expect(res.err).to.equal(null);
+                    expect(res.res).to.equal('ROOT');
+                });
+
+                // One session per worker.
+                expect(server.broker.getStats().map(stats => stats.sessions)).to.deep.equal([1, 1]);
+            })
+            .nodeify(done);
+    });
+
+    it('should shut down the other workers when a worker exits', function (done) {
+        this.timeout(20000);
+
+        corezmq_server({projectName, gmeConfig, logger, port: 0, workers: 2})
+            .then((server_) => {
+                const deferred = Q.defer();
+                const workers = server_.workers;
+
+                workers[1].once('exit', () => deferred.resolve(workers));
+                workers[0].kill('SIGKILL');
+
+                return deferred.promise;
+            })
+            .then((workers) => {
+                expect(workers[0].signalCode).to.equal('SIGKILL');
+                expect(workers[1].exitCode !== null || workers[1].signalCode !== null).to.equal(true);
+            })
+            .nodeify(done);
+    });
+});
+
+describe('corezmq-server command line', function () {
+    const testFixture = require('../globals'),
+        corezmq_server = require('../../bin/corezmq_server'),
+        gmeConfig = testFixture.getGmeConfig(),
+        expect = testFixture.expect;
+
+    /**
+     * The options of the CoreZMQ server started with the command line arguments.
+     */
+    function getServerOptions(args) {
+        const program = corezmq_server.createProgram(gmeConfig)
+            .parse(['node', 'corezmq_server.js', 'SomeProject'].concat(args), {from: 'node'});
+
+        return corezmq_server.getServerOptions(program.opts());
+    }
+
+    it('should prefetch loaded roots given --prefetch', function () {
+        expect(getServerOptions([]).prefetchOnLoadRoot).to.equal(false);
+        expect(getServerOptions(['--prefetch']).prefetchOnLoadRoot).to.equal(true);
+        expect(getServerOptions(['--prefetch', '3']).prefetchOnLoadRoot).to.equal(3);
+    });
+
+    it('should limit the open projects given --maxProjects', function () {
+        expect(getServerOptions([]).maxProjects).to.equal(undefined);
+        expect(getServerOptions(['--maxProjects', '4']).maxProjects).to.equal(4);
+    });
+
+    it('should limit the requests in flight given --maxInFlight', function () {
+        expect(getServerOptions(['--router']).maxInFlight).to.equal(undefined);
+        expect(getServerOptions(['--router', '--maxInFlight', '8'])).to.include({socketType: 'router', maxInFlight: 8});
+    });
+
+    it('should bound the loaded roots given --maxRoots and --maxHeapUsed', function () {
+        expect(getServerOptions([])).to.include({maxRoots: undefined, maxHeapUsed: undefined});
+        expect(getServerOptions(['--maxRoots', '50', '--maxHeapUsed', '512']))
+            .to.include({maxRoots: 50, maxHeapUsed: 512 * 1024 * 1024});
+    });
+
+    it('should reject mutations and size the cached results given --read-only and --responseCacheSize', function () {
+        expect(getServerOptions([])).to.include({readOnly: false, responseCacheSize: undefined});
+        expect(getServerOptions(['--read-only', '--responseCacheSize', '16']))
+            .to.include({readOnly: true, responseCacheSize: 16 * 1024 * 1024});
+    });
+
+    it('should give the branches to preload and the cache size given --preload and --cacheSize', function () {
+        const parse = args => corezmq_server.createProgram(gmeConfig)
+            .parse(['node', 'corezmq_server.js', 'SomeProject'].concat(args), {from: 'node'}).opts();
+
+        const opts = parse(['--preload', 'master', '--preload', 'v1.0:3', '--cacheSize', '3000']);
+
+        expect(parse([]).preload).to.deep.equal([]);
+        expect(opts.preload).to.deep.equal(['master', 'v1.0:3']);
+        expect(opts.cacheSize).to.equal('3000');
+    });
+});
@@ -0,0 +1,125 @@
+/* eslint-env mocha, node */
+
+describe('Broker', function () {
+    const testFixture = require('./globals'),
+        zmq = require('zeromq/v5-compat'),
+        Broker = require('../src/broker'),
+        Q = testFixture.Q,
+        expect = testFixture.expect,
+        logger = testFixture.logger.fork('Broker');
+
+    let broker,
+        workers,
+        sockets;
+
+    /**
+     * A worker replying with its name, requests with the body 'hold' are never replied to (stay in flight).
+     */
+    function startWorker(name) {
+        const socket = zmq.socket('router');
+
+        socket.on('message', (identity, token, ...message) => {
+            if (message[message.length - 1].toString() !== 'hold') {
+                socket.send([identity, token, name]);
+            }
+        });
+
+        sockets.push(socket);
+
+        return Q.ninvoke(socket, 'bind', 'tcp://127.0.0.1:*')
+            .then(() => socket.getsockopt(zmq.ZMQ_LAST_ENDPOINT).toString());
+    }
+
+    function connect(address) {
+        const socket = zmq.socket('req');
+        socket.connect(address);
+        sockets.push(socket);
+
+        return socket;
+    }
+
+    function request(socket, header, body) {
+        const deferred = Q.defer();
+        socket.once('message', msg => deferred.resolve(msg.toString()));
+        socket.send(header ? [header, body || '{}'] : [body || '{}']);
+
+        return deferred.promise;
+    }
+
+    beforeEach(function (done) {
+        sockets = [];
+        broker = new Broker(logger);
+        Q.all([startWorker('w0'), startWorker('w1')])
+            .then((workerAddresses) => {
+                workers = workerAddresses;
+                return broker.start('tcp://127.0.0.1:*', workers);
+            })
+            .then((address) => {
+                broker.address = address;
+            })
+            .nodeify(done);
+    });
+
+    afterEach(function (done) {
+        sockets.forEach(socket => socket.close());
+        broker.stop().nodeify(done);
+    });
+
+    it('should route the requests of a session key to the same worker', function (done) {
+        const first = connect(broker.address);
+        const second = connect(broker.address);
+        const sameKey = connect(broker.address);
+
+        request(first, 'json;k=a')
+            .then((worker) => {
+                expect(worker).to.equal('w0');
+                return request(second, 'json;k=b');
+            })
+            .then((worker) => {
+                // New sessions go to the worker with the fewest sessions.
+                expect(worker).to.equal('w1');
+                return Q.all([request(first, 'json;k=a'), request(sameKey, 'json;k=a'), request(second, 'json;k=b')]);
+            })
+            .then((routed) => {
+                expect(routed).to.deep.equal(['w0', 'w0', 'w1']);
+                expect(broker.getStats().map(stats => stats.sessions)).to.deep.equal([1, 1]);
+            })
+            .nodeify(done);
+    });
+
+    it('should key sessions without a key by the connection', function (done) {
+        const first = connect(broker.address);
+        const second = connect(broker.address);
+
+        request(first, null)
+            .then(() => request(second, null))
+            .then(() => Q.all([request(first, null), request(second, null)]))
+            .then((routed) => {
+                expect(routed).to.deep.equal(['w0', 'w1']);
+            })
+            .nodeify(done);
+    });
+
+    it('should route stateless requests to the worker with the fewest requests in flight', function (done) {
+        const holding = connect(broker.address);
+        const stateless = connect(broker.address);
+
+        // Both workers are without sessions, so the held request goes to the first one.
+        holding.send(['json;k=held', 'hold']);
+
+        Q.delay(100)
+            .then(() => {
+                expect(broker.getStats().map(stats => stats.inFlight)).to.deep.equal([1, 0]);
+                return request(stateless, 'json;k=held;s=1');
+            })
+            .then((worker) => {
+                expect(worker).to.equal('w1');
+                return request(stateless, 'json;s=1');
+            })
+            .then((worker) => {
+                expect(worker).to.equal('w1');
+                expect(broker.getStats().map(stats => stats.sessions)).to.deep.equal([1, 0]);
+            })
+            .nodeify(done);
+    });
+});
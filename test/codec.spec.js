@@ -0,0 +1,25 @@
+/* eslint-env mocha, node */
+
+describe('codec', function () {
+    const testFixture = require('./globals'),
+        codecs = require('../src/codec'),
+        compressions = require('../src/compression'),
+        expect = testFixture.expect;
+
+    const zlib = compressions.getCompression('zlib');
+    const payload = {res: 'small'};
+
+    it('should compress bodies from the default threshold', function () {
+        const large = {res: 'x'.repeat(compressions.DEFAULT_THRESHOLD)};
+
+        expect(codecs.encodeMessage(payload, codecs.CODECS.json, [], zlib)[0]).to.equal('json');
+        expect(codecs.encodeMessage(large, codecs.CODECS.json, [], zlib)[0]).to.equal('json;c=zlib');
+    });
+
+    it('should compress every body given the threshold 0', function () {
+        const frames = codecs.encodeMessage(payload, codecs.CODECS.json, [], zlib, 0);
+
+        expect(frames[0]).to.equal('json;c=zlib');
+        expect(JSON.parse(zlib.decompress(frames[1]).toString())).to.deep.equal(payload);
+    });
+});
@@ -0,0 +1,331 @@
+/* eslint-env mocha, node */
+
+describe('CoreZMQ read-only', function () {
+    const testFixture = require('./globals'),
+        CoreZMQ = require('../src/corezmq'),
+        Q = testFixture.Q,
+        expect = testFixture.expect,
+        logger = testFixture.logger.fork('CoreZMQ');
+
+    const node = {rootId: '#root', nodePath: '/1'};
+    let calls,
+        server;
+
+    function request(type, name, args) {
+        return server.handleRequest({type, name, args});
+    }
+
+    function expectRejected(type, name, args) {
+        return request(type, name, args)
+            .then(() => {
+                throw new Error(`[${type}.${name}] should have been rejected!`);
+            }, (err) => {
+                expect(err.message).to.contain('read-only');
+            });
+    }
+
+    beforeEach(function (done) {
+        const record = name => function () {
+            calls.push(name);
+        };
+
+        calls = [];
+        // Loads nodes and reads attributes, every other call is recorded and must not be reached.
+        const core = {
+            loadRoot: hash => Q({hash}),
+            loadByPath: (root, path) => Q({root, path}),
+            getRoot: n => n.root,
+            getPath: n => n.path || '',
+            getAttribute: (n, name) => {
+                calls.push('getAttribute');
+                return `${n.path}.${name}`;
+            },
+            setAttribute: record('setAttribute'),
+            persist: record('persist'),
+        };
+        const project = {projectId: 'guest+ReadOnly'};
+
+        ['createBranch', 'createTag', 'deleteBranch', 'deleteTag', 'setBranchHash', 'makeCommit']
+            .forEach((name) => {
+                project[name] = record(name);
+            });
+
+        server = new CoreZMQ(project, core, logger, {readOnly: true});
+        request('core', 'loadRoot', ['#root']).nodeify(done);
+    });
+
+    it('should reject saving, commits and branch and tag changes', function (done) {
+        Q.all([
+            expectRejected('util', 'save', [{rootId: '#root', nodePath: ''}, 'master']),
+            expectRejected('project', 'makeCommit', ['master', ['#parent'], '#root', {}, 'msg']),
+            expectRejected('project', 'createBranch', ['newBranch', '#commit']),
+            expectRejected('project', 'deleteBranch', ['master', '#commit']),
+            expectRejected('project', 'setBranchHash', ['master', '#newCommit', '#commit']),
+            expectRejected('project', 'createTag', ['v1', '#commit']),
+            expectRejected('project', 'deleteTag', ['v1']),
+        ])
+            .then(() => {
+                expect(calls).to.deep.equal([]);
+            })
+            .nodeify(done);
+    });
+
+    it('should reject modifying the nodes, also within a batch', function (done) {
+        Q.all([
+            expectRejected('core', 'setAttributes', [[[node, 'name', 'newName']]]),
+            expectRejected('core', 'setAttribute', [node, 'name', 'newName']),
+            expectRejected('batch', 'batch', [[
+                {type: 'core', name: 'getAttribute', args: [node, 'name']},
+                {type: 'core', name: 'setAttribute', args: [node, 'name', 'newName']},
+            ]]),
+        ])
+            .then(() => {
+                expect(calls).to.deep.equal([]);
+            })
+            .nodeify(done);
+    });
+
+    it('should cache the results of the core functions', function (done) {
+        Q.all([
+            request('core', 'getAttribute', [node, 'name']),
+            request('core', 'getAttribute', [node, 'name']),
+        ])
+            .then((results) => {
+                expect(results).to.deep.equal(['/1.name', '/1.name']);
+                return request('core', 'getAttribute', [node, 'name']);
+            })
+            .then((result) => {
+                expect(result).to.equal('/1.name');
+                expect(calls).to.deep.equal(['getAttribute']);
+                return request('util', 'getServerStats', []);
+            })
+            .then((stats) => {
+                expect(stats.responseCache).to.include({size: 1, hits: 1, misses: 1, joined: 1});
+            })
+            .nodeify(done);
+    });
+});
+
+describe('CoreZMQ deleteNodes', function () {
+    const testFixture = require('./globals'),
+        CoreZMQ = require('../src/corezmq'),
+        expect = testFixture.expect,
+        logger = testFixture.logger.fork('CoreZMQ');
+
+    const nodeAt = nodePath => ({rootId: '#root', nodePath});
+    let deleted,
+        server;
+
+    beforeEach(function (done) {
+        const Q = testFixture.Q;
+        const core = {
+            loadRoot: hash => Q({hash}),
+            loadByPath: (root, path) => Q({root, path}),
+            getRoot: n => n.root,
+            getPath: n => n.path || '',
+            deleteNode: (n) => {
+                deleted.push(n.path);
+            },
+        };
+
+        deleted = [];
+        server = new CoreZMQ({projectId: 'guest+DeleteNodes'}, core, logger);
+        server.handleRequest({type: 'core', name: 'loadRoot', args: ['#root']}).nodeify(done);
+    });
+
+    it('should delete the nodes in the sub-tree of another node along with it', function (done) {
+        const nodes = [nodeAt('/1/2'), nodeAt('/1'), nodeAt('/3'), nodeAt('/1/2/4'), nodeAt('/3'), nodeAt('/13')];
+
+        server.handleRequest({type: 'core', name: 'deleteNodes', args: [nodes]})
+            .then((errors) => {
+                expect(errors).to.deep.equal([null, null, null, null, null, null]);
+                expect(deleted).to.deep.equal(['/1', '/3', '/13']);
+            })
+            .nodeify(done);
+    });
+});
+
+describe('CoreZMQ node cache', function () {
+    const testFixture = require('./globals'),
+        CoreZMQ = require('../src/corezmq'),
+        Q = testFixture.Q,
+        expect = testFixture.expect,
+        logger = testFixture.logger.fork('CoreZMQ');
+
+    const node = {rootId: '#root', nodePath: '/1'};
+    let loads,
+        server;
+
+    function request(type, name, args) {
+        return Q(server.handleRequest({type, name, args}));
+    }
+
+    function getNodeCacheStats() {
+        return request('util', 'getServerStats', []).then(stats => stats.nodeCache);
+    }
+
+    beforeEach(function (done) {
+        const core = {
+            loadRoot: hash => Q({hash}),
+            loadByPath: (root, path) => {
+                loads += 1;
+                return Q({root, path});
+            },
+            getRoot: n => n.root,
+            getPath: n => n.path || '',
+            getAttribute: (n, name) => `${n.path}.${name}`,
+        };
+
+        loads = 0;
+        server = new CoreZMQ({projectId: 'guest+NodeCache'}, core, logger, {maxRoots: 1});
+        request('core', 'loadRoot', ['#root']).nodeify(done);
+    });
+
+    it('should count a node not cached as a single miss', function (done) {
+        request('core', 'getAttribute', [node, 'name'])
+            .then(getNodeCacheStats)
+            .then((stats) => {
+                expect(stats).to.include({hits: 0, misses: 1});
+                return request('core', 'getAttribute', [node, 'name']);
+            })
+            .then(getNodeCacheStats)
+            .then((stats) => {
+                expect(stats).to.include({hits: 1, misses: 1});
+                expect(loads).to.equal(1);
+            })
+            .nodeify(done);
+    });
+
+    it('should load the nodes of an evicted root from the reloaded root', function (done) {
+        request('core', 'getAttribute', [node, 'name'])
+            .then(() => request('core', 'loadRoot', ['#other']))
+            .then(() => request('core', 'getAttribute', [node, 'name']))
+            .then((result) => {
+                expect(result).to.equal('/1.name');
+                expect(loads).to.equal(2);
+                return getNodeCacheStats();
+            })
+            .then((stats) => {
+                expect(stats).to.include({hits: 0, misses: 1});
+            })
+            .nodeify(done);
+    });
+});
+
+describe('CoreZMQ router socket', function () {
+    const testFixture = require('./globals'),
+        CoreZMQ = require('../src/corezmq'),
+        zmq = require('zeromq/v5-compat'),
+        Q = testFixture.Q,
+        expect = testFixture.expect,
+        logger = testFixture.logger.fork('CoreZMQ');
+
+    let server,
+        socket;
+
+    function request(payload) {
+        const deferred = Q.defer();
+        socket.once('message', msg => deferred.resolve(JSON.parse(msg.toString())));
+        socket.send(JSON.stringify(payload));
+
+        return deferred.promise;
+    }
+
+    beforeEach(function (done) {
+        const core = {
+            loadRoot: hash => Q({hash}),
+            getRoot: n => n,
+            getPath: () => '',
+        };
+
+        server = new CoreZMQ({projectId: 'guest+Router'}, core, logger, {socketType: 'router', port: 0});
+        server.startServer()
+            .then((port) => {
+                socket = zmq.socket('req');
+                socket.connect(`tcp://127.0.0.1:${port}`);
+            })
+            .nodeify(done);
+    });
+
+    afterEach(function () {
+        socket.close();
+        server.stopServer();
+    });
+
+    it('should reply with an error to malformed requests and keep serving', function (done) {
+        request(null)
+            .then((res) => {
+                expect(res.err).to.not.equal(null);
+                return request({type: 'core', name: 'createNodes', args: [[null]]});
+            })
+            .then((res) => {
+                expect(res.err).to.not.equal(null);
+                return request({type: 'core', name: 'deleteNodes', args: ['/1']});
+            })
+            .then((res) => {
+                expect(res.err).to.not.equal(null);
+                return request({type: 'core', name: 'loadRoot', args: ['#root']});
+            })
+            .then((res) => {
+                expect(res.err).to.equal(null);
+                expect(res.res).to.deep.equal({rootId: '#root', nodePath: ''});
+            })
+            .nodeify(done);
+    });
+});
+
+describe('CoreZMQ createNodes', function () {
+    const testFixture = require('./globals'),
+        CoreZMQ = require('../src/corezmq'),
+        Q = testFixture.Q,
+        expect = testFixture.expect,
+        logger = testFixture.logger.fork('CoreZMQ');
+
+    let loaded,
+        server;
+
+    beforeEach(function (done) {
+        const root = {path: ''};
+        let counter = 0;
+        const core = {
+            loadRoot: () => Q(root),
+            loadByPath: (rootNode, path) => {
+                loaded.push(path);
+                return Q({path});
+            },
+            getRoot: () => root,
+            getPath: n => n.path,
+            createNode: (params) => {
+                counter += 1;
+                return {path: `${params.parent.path}/n${counter}`, base: params.base};
+            },
+            setPointer: (n, name, target) => {
+                n[name] = target.path;
+            },
+        };
+
+        loaded = [];
+        server = new CoreZMQ({projectId: 'guest+CreateNodes'}, core, logger);
+        server.handleRequest({type: 'core', name: 'loadRoot', args: ['#root']}).nodeify(done);
+    });
+
+    it('should load the nodes referenced by many specs once', function (done) {
+        const specs = [];
+
+        for (let i = 0; i < 100; i += 1) {
+            specs.push({
+                parent: {rootId: '#root', nodePath: '/p'},
+                base: {rootId: '#root', nodePath: '/fco'},
+                pointers: {ref: i > 0 ? i - 1 : {rootId: '#root', nodePath: '/p'}},
+            });
+        }
+
+        server.handleRequest({type: 'core', name: 'createNodes', args: [specs]})
+            .then((nodeWrappers) => {
+                expect(nodeWrappers.length).to.equal(100);
+                expect(nodeWrappers[99]).to.deep.equal({rootId: '#root', nodePath: '/p/n100'});
+                expect(loaded.sort()).to.deep.equal(['/fco', '/p']);
+            })
+            .nodeify(done);
+    });
+});
@@ -0,0 +1,82 @@
+/* eslint-env mocha, node */
+
+describe('ResponseCache', function () {
+    const testFixture = require('./globals'),
+        ResponseCache = require('../src/responsecache'),
+        Q = testFixture.Q,
+        expect = testFixture.expect;
+
+    // The estimated size of a cached result is the length of its key plus the length of its json.
+    const VALUE = '12345678';
+
+    it('should evict the least recently used results beyond the byte budget', function (done) {
+        const cache = new ResponseCache(3 * ('kX'.length + JSON.stringify(VALUE).length));
+        const computed = [];
+        const compute = key => () => {
+            computed.push(key);
+            return VALUE;
+        };
+
+        Q.all(['k1', 'k2', 'k3'].map(key => cache.get(key, compute(key))))
+            .then(() => cache.get('k1', compute('k1')))
+            .then(() => cache.get('k4', compute('k4')))
+            .then(() => {
+                expect(cache.getStats()).to.include({size: 3, bytes: cache.maxBytes, evictions: 1});
+                return cache.get('k2', compute('k2'));
+            })
+            .then(() => cache.get('k1', compute('k1')))
+            .then(() => {
+                // k2 was the least recently used at k4, then k3 at k2.
+                expect(computed).to.deep.equal(['k1', 'k2', 'k3', 'k4', 'k2']);
+                expect(cache.getStats()).to.include({hits: 2, misses: 5, joined: 0, evictions: 2});
+            })
+            .nodeify(done);
+    });
+
+    it('should not cache results larger than the budget or failures', function (done) {
+        const cache = new ResponseCache(10);
+
+        Q(cache.get('k1', () => 'a result longer than the budget'))
+            .then(() => cache.get('k2', () => {
+                throw new Error('Failed');
+            }))
+            .then(() => {
+                throw new Error('Should have failed!');
+            }, (err) => {
+                expect(err.message).to.equal('Failed');
+                return cache.get('k2', () => Q.reject(new Error('Failed async')));
+            })
+            .then(() => {
+                throw new Error('Should have failed!');
+            }, (err) => {
+                expect(err.message).to.equal('Failed async');
+                expect(cache.getStats()).to.include({size: 0, bytes: 0, misses: 3});
+            })
+            .nodeify(done);
+    });
+
+    it('should share the computation of identical requests in flight', function (done) {
+        const cache = new ResponseCache();
+        const deferred = Q.defer();
+        let computations = 0;
+        const compute = () => {
+            computations += 1;
+            return deferred.promise;
+        };
+
+        const pending = [cache.get('k', compute), cache.get('k', compute), cache.get('k', compute)];
+        deferred.resolve(VALUE);
+
+        Q.all(pending)
+            .then((results) => {
+                expect(results).to.deep.equal([VALUE, VALUE, VALUE]);
+                return cache.get('k', compute);
+            })
+            .then((result) => {
+                expect(result).to.equal(VALUE);
+                expect(computations).to.equal(1);
+                expect(cache.getStats()).to.include({size: 1, hits: 1, misses: 1, joined: 2, hitRate: 0.75});
+            })
+            .nodeify(done);
+    });
+});
@@ -0,0 +1,74 @@
+/* eslint-env mocha, node */
+
+describe('RootCache', function () {
+    const testFixture = require('./globals'),
+        RootCache = require('../src/rootcache'),
+        expect = testFixture.expect;
+
+    function load(cache, ids) {
+        return ids.map(id => cache.set(id, {id}));
+    }
+
+    it('should not limit the number of roots by default', function () {
+        const cache = new RootCache();
+        const ids = [];
+
+        for (let i = 0; i < 200; i += 1) {
+            ids.push('#' + i);
+        }
+
+        load(cache, ids);
+        expect(cache.getStats()).to.include({size: 200, evictions: 0});
+    });
+
+    it('should evict the least recently used clean root beyond maxRoots', function () {
+        const cache = new RootCache(2);
+
+        load(cache, ['#a', '#b']);
+        cache.get('#a');
+        expect(cache.set('#c', {id: '#c'})).to.deep.equal(['#b']);
+        expect(cache.isEvicted('#b')).to.equal(true);
+
+        cache.markDirty('#a', cache.get('#a'));
+        expect(cache.set('#d', {id: '#d'})).to.deep.equal(['#c']);
+        expect(cache.get('#a')).to.deep.equal({id: '#a'});
+
+        expect(cache.set('#b', {id: '#b'})).to.deep.equal(['#d']);
+        expect(cache.getStats()).to.include({size: 2, dirty: 1, evicted: 2, evictions: 3, reloads: 1});
+    });
+
+    it('should evict until under the heap budget or no clean roots remain', function () {
+        const cache = new RootCache(0, 100);
+        let heapUsed = 0;
+
+        cache._getHeapUsed = () => heapUsed;
+        load(cache, ['#a', '#b', '#c', '#d']);
+        cache.markDirty('#b', cache.get('#b'));
+
+        // Every eviction frees 10 bytes.
+        heapUsed = 115;
+        cache._getHeapUsed = () => {
+            heapUsed -= 10;
+            return heapUsed + 10;
+        };
+        expect(cache.set('#e', {id: '#e'})).to.deep.equal(['#a', '#c']);
+
+        heapUsed = 1000;
+        expect(cache.set('#f', {id: '#f'})).to.deep.equal(['#d', '#e']);
+        expect(cache.getStats()).to.include({size: 2, dirty: 1});
+    });
+
+    it('should forget the earliest evicted roots beyond maxEvicted', function () {
+        const cache = new RootCache(1, 0, 2);
+
+        load(cache, ['#a', '#b', '#c', '#d']);
+        expect(cache.isEvicted('#a')).to.equal(false);
+        expect(cache.isEvicted('#b')).to.equal(true);
+        expect(cache.isEvicted('#c')).to.equal(true);
+        expect(cache.getStats()).to.include({evicted: 2, evictions: 3});
+
+        cache.delete('#b');
+        cache.set('#c', {id: '#c'});
+        expect(cache.getStats()).to.include({size: 1, evicted: 1, reloads: 1});
+    });
+});